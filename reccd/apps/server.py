@@ -18,6 +18,13 @@ from reccd.variables.system import EXIT_FALSE
 
 class ServerConfig(Namespace):
     address: str
+    allow_pickle: bool
+    calibrate_placement: bool
+    sm_janitor_interval: float
+    sm_report_interval: float
+    codec_threads: Optional[int]
+    route_threads: Optional[int]
+    file_ref_dirs: Optional[List[str]]
     module: Optional[str]
     opts: Optional[List[str]]
 
@@ -100,4 +107,11 @@ def main(args: Namespace, printer: Callable[..., None] = print) -> int:
         bind_address=grpc_address,
         module_name=module_prefix + module_name,
         wait_connect=True,
+        allow_pickle=bool(config.allow_pickle),
+        calibrate_placement=bool(config.calibrate_placement),
+        sm_janitor_interval=float(config.sm_janitor_interval),
+        sm_report_interval=float(config.sm_report_interval),
+        codec_threads=config.codec_threads,
+        route_threads=config.route_threads,
+        file_ref_dirs=config.file_ref_dirs,
     )
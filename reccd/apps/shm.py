@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+from argparse import Namespace
+from typing import Callable
+
+from reccd.arguments import SHM_CMD_GC
+from reccd.logging.logging import reccd_logger as logger
+from reccd.memory.shared_memory_janitor import SharedMemoryJanitor
+from reccd.variables.system import EXIT_FALSE, EXIT_TRUE
+
+
+def gc_main(args: Namespace, printer: Callable[..., None] = print) -> int:
+    dry_run = args.dry_run
+    directory = args.directory
+    assert isinstance(dry_run, bool)
+    assert isinstance(directory, str)
+
+    janitor = SharedMemoryJanitor(directory)
+    if not janitor.is_supported():
+        printer(f"Not found shared memory directory: {directory}")
+        return EXIT_FALSE
+
+    orphans = janitor.sweep(dry_run=dry_run)
+    logger.debug(f"Orphaned segments (dry_run={dry_run}): {len(orphans)}")
+
+    for orphan in orphans:
+        printer(f"{orphan.name} (pid={orphan.pid},size={orphan.size})")
+    if not dry_run:
+        freed = sum(x.size for x in orphans)
+        printer(f"Unlinked {len(orphans)} segments ({freed} bytes)")
+    return EXIT_TRUE
+
+
+def main(args: Namespace, printer: Callable[..., None] = print) -> int:
+    shm_cmd = getattr(args, "shm_cmd", None)
+    if shm_cmd == SHM_CMD_GC:
+        return gc_main(args, printer=printer)
+
+    printer("The shm command does not exist")
+    return EXIT_FALSE
@@ -6,11 +6,21 @@ from typing import Final, List, Optional
 
 from reccd.logging.logging import SEVERITIES, SEVERITY_NAME_INFO
 from reccd.variables.module import MODULE_NAME_PREFIX
-from reccd.variables.rpc import DEFAULT_SERVER_ADDRESS
+from reccd.variables.rpc import (
+    DEFAULT_CODEC_THREADS,
+    DEFAULT_ROUTE_THREADS,
+    DEFAULT_SERVER_ADDRESS,
+    DEFAULT_SM_JANITOR_INTERVAL,
+    DEFAULT_SM_REPORT_INTERVAL,
+    SM_DIRECTORY,
+)
 
 CMD_CLIENT: Final[str] = "client"
 CMD_MODULES: Final[str] = "modules"
 CMD_SERVER: Final[str] = "server"
+CMD_SHM: Final[str] = "shm"
+
+SHM_CMD_GC: Final[str] = "gc"
 
 SKIP_MODULE: Final[str] = "-"
 
@@ -28,6 +38,9 @@ CLIENT_EPILOG: Final[str] = ""
 
 MODULES_HELP: Final[str] = "Prints a list of available modules"
 
+SHM_HELP: Final[str] = "Manage the shared memory segments of reccd"
+SHM_GC_HELP: Final[str] = "Unlink the segments whose owner process is dead"
+
 KV_SEPARATOR: Final[str] = "="
 
 DEFAULT_MODULE_PREFIX: Final[str] = MODULE_NAME_PREFIX
@@ -49,6 +62,13 @@ def version() -> str:
 def get_default_server_namespace() -> Namespace:
     return Namespace(
         address=DEFAULT_SERVER_ADDRESS,
+        allow_pickle=False,
+        calibrate_placement=False,
+        sm_janitor_interval=DEFAULT_SM_JANITOR_INTERVAL,
+        sm_report_interval=DEFAULT_SM_REPORT_INTERVAL,
+        codec_threads=None,
+        route_threads=None,
+        file_ref_dirs=None,
     )
 
 
@@ -80,6 +100,66 @@ def add_server_parser(subparsers) -> None:
         metavar="addr",
         help=f"gRPC bind address (default: '{default_address}')",
     )
+    parser.add_argument(
+        "--allow-pickle",
+        action="store_true",
+        default=None,
+        help="Accept the pickle coding from clients (trusted clients only)",
+    )
+    parser.add_argument(
+        "--calibrate-placement",
+        action="store_true",
+        default=None,
+        help="Measure the inline-vs-shared-memory threshold at startup",
+    )
+    parser.add_argument(
+        "--sm-janitor-interval",
+        default=None,
+        type=float,
+        metavar="sec",
+        help=(
+            "Seconds between the sweeps of orphaned shared memory, 0 to disable "
+            f"(default: {DEFAULT_SM_JANITOR_INTERVAL})"
+        ),
+    )
+    parser.add_argument(
+        "--sm-report-interval",
+        default=None,
+        type=float,
+        metavar="sec",
+        help=(
+            "Seconds between the reports of the shared memory mapped per session, "
+            f"0 to disable (default: {DEFAULT_SM_REPORT_INTERVAL})"
+        ),
+    )
+    parser.add_argument(
+        "--codec-threads",
+        default=None,
+        type=int,
+        metavar="num",
+        help=(
+            "Threads that encode and decode large payloads, 0 to disable "
+            f"(default: the number of CPUs, up to {DEFAULT_CODEC_THREADS})"
+        ),
+    )
+    parser.add_argument(
+        "--route-threads",
+        default=None,
+        type=int,
+        metavar="num",
+        help=(
+            "Threads that run synchronous routes, 0 to run them on the event loop "
+            f"(default: the number of CPUs plus 4, up to {DEFAULT_ROUTE_THREADS})"
+        ),
+    )
+    parser.add_argument(
+        "--file-ref-dir",
+        action="append",
+        default=None,
+        dest="file_ref_dirs",
+        metavar="dir",
+        help="Directory whose files clients may send by reference (repeatable)",
+    )
     parser.add_argument(
         "module",
         default=None,
@@ -197,6 +277,30 @@ def add_modules_parser(subparsers) -> None:
     assert isinstance(parser, ArgumentParser)
 
 
+def add_shm_parser(subparsers) -> None:
+    # noinspection SpellCheckingInspection
+    parser = subparsers.add_parser(name=CMD_SHM, help=SHM_HELP)
+    assert isinstance(parser, ArgumentParser)
+
+    shm_subparsers = parser.add_subparsers(dest="shm_cmd")
+    gc_parser = shm_subparsers.add_parser(name=SHM_CMD_GC, help=SHM_GC_HELP)
+    assert isinstance(gc_parser, ArgumentParser)
+
+    gc_parser.add_argument(
+        "--dry-run",
+        "-n",
+        action="store_true",
+        default=False,
+        help="Only print the orphaned segments",
+    )
+    gc_parser.add_argument(
+        "--directory",
+        metavar="dir",
+        default=SM_DIRECTORY,
+        help=f"Shared memory directory (default: '{SM_DIRECTORY}')",
+    )
+
+
 def default_argument_parser() -> ArgumentParser:
     parser = ArgumentParser(
         prog=PROG,
@@ -255,6 +359,7 @@ def default_argument_parser() -> ArgumentParser:
     add_server_parser(subparsers)
     add_client_parser(subparsers)
     add_modules_parser(subparsers)
+    add_shm_parser(subparsers)
     return parser
 
 
@@ -1,25 +1,59 @@
 # -*- coding: utf-8 -*-
 
-from asyncio import TimeoutError, wait_for
+import os
+from asyncio import TimeoutError, gather, wait_for
+from functools import partial
+from itertools import chain
+from multiprocessing.shared_memory import SharedMemory
 from pathlib import Path
-from typing import Any, Dict, Final, List, Optional, Tuple
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Final,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
 from uuid import uuid4
 
+from numpy import memmap
 from type_serialize import ByteCoding
 from type_serialize.variables import COMPRESS_LEVEL_BEST
 
 from reccd.chrono.datetime import tznow
+from reccd.daemon.packet_batch import BatchRequest, PacketBatcher
+from reccd.daemon.packet_stream import PacketStream
 from reccd.logging.logging import reccd_logger as logger
+from reccd.memory.memfd import MemfdSender, is_memfd_supported, memfd_address
+from reccd.memory.shared_memory_arena import SharedMemoryArena, SharedMemoryWriter
 from reccd.memory.shared_memory_queue import SharedMemoryQueue
+from reccd.memory.shared_memory_utils import create_shared_memory
 from reccd.memory.shared_memory_validator import (
     SharedMemoryTestInfo,
+    register_memfd,
     register_shared_memory,
 )
+from reccd.packet.chunk import ChunkAssembler, ChunkBuffers, iter_content_chunks
+from reccd.packet.codec_executor import DEFAULT_CODEC_EXECUTOR, CodecExecutor
+from reccd.packet.codec_policy import CodecPolicy
+from reccd.packet.content_inspector import contents_size, owned_sm_names
+from reccd.packet.file_ref import FileIdentity, file_identity, memmap_file_ref
 from reccd.packet.packer import Packer
+from reccd.packet.placement_policy import DEFAULT_PLACEMENT_POLICY, PlacementPolicy
 from reccd.packet.response import Response
 from reccd.packet.unpacker import content_unpack
 from reccd.proto.daemon.daemon_api_pb2 import (
+    FileAccessQ,
+    FileRef,
     PacketA,
+    PacketChunkQ,
     PacketQ,
     Pat,
     Pit,
@@ -28,16 +62,26 @@ from reccd.proto.daemon.daemon_api_pb2 import (
     RegisterQ,
 )
 from reccd.proto.daemon.daemon_api_pb2_grpc import DaemonApiStub
+from reccd.route.dynamic_resource import DynamicResource
+from reccd.route.route_index import RouteIndex
 from reccd.rpc.client import (
+    AioRpcError,
     Channel,
     ChannelCredentials,
+    StatusCode,
     insecure_channel,
     secure_channel,
     ssl_channel_credentials,
 )
+from reccd.uri.uds import is_uds_family
 from reccd.variables.rpc import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_CHUNK_THRESHOLD,
     DEFAULT_HEARTBEAT_TIMEOUT,
     DEFAULT_PICKLE_ENCODING,
+    DEFAULT_SM_ARENA_SIZE,
+    DEFAULT_SM_POOL_IDLE_TIMEOUT,
+    DEFAULT_SM_POOL_MAX_BYTES,
     M_CONNECT,
     M_DELETE,
     M_GET,
@@ -47,6 +91,7 @@ from reccd.variables.rpc import (
     M_POST,
     M_PUT,
     M_TRACE,
+    MAX_FILE_ACCESS_CACHE_SIZE,
     MAX_RECEIVE_MESSAGE_LENGTH,
     MAX_SEND_MESSAGE_LENGTH,
     OPTIONS_KEY_MAX_RECEIVE_MESSAGE_LENGTH,
@@ -98,6 +143,14 @@ class DaemonClient:
     _channel: Optional[Channel]
     _stub: Optional[DaemonApiStub]
     _credentials: Optional[ChannelCredentials]
+    _route_index: Optional[RouteIndex]
+    _route_ids: List[int]
+    _route_epoch: str
+    _stream: Optional[PacketStream]
+    _daemon_placement_policy: Optional[PlacementPolicy]
+    _arena: Optional[SharedMemoryArena]
+    _memfd: Optional[MemfdSender]
+    _file_access: Dict[FileIdentity, bool]
 
     def __init__(
         self,
@@ -108,6 +161,26 @@ class DaemonClient:
         max_send_message_length=MAX_SEND_MESSAGE_LENGTH,
         max_receive_message_length=MAX_RECEIVE_MESSAGE_LENGTH,
         verbose=0,
+        zero_copy=False,
+        negotiate_routes=True,
+        use_stream=False,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        chunk_threshold=DEFAULT_CHUNK_THRESHOLD,
+        chunk_answers=False,
+        codec_policy: Optional[CodecPolicy] = None,
+        coding=ByteCoding.MsgpackZlib,
+        placement_policy: Optional[PlacementPolicy] = None,
+        sm_pool_max_bytes=DEFAULT_SM_POOL_MAX_BYTES,
+        sm_pool_idle_timeout=DEFAULT_SM_POOL_IDLE_TIMEOUT,
+        use_arena=False,
+        arena_size=DEFAULT_SM_ARENA_SIZE,
+        daemon_sm=True,
+        use_memfd=False,
+        use_file_refs=True,
+        prefault=False,
+        huge_pages=False,
+        warm_up=True,
+        codec_executor: Optional[CodecExecutor] = None,
     ):
         self._session = uuid4().hex
         self._is_sm = False
@@ -116,17 +189,41 @@ class DaemonClient:
         self._options = dict()
         if timeout is not None:
             self._options[OPTIONS_KEY_TIMEOUT] = timeout
-        self._smq = SharedMemoryQueue()
+        self._smq = SharedMemoryQueue(
+            factory=self._create_shared_memory,
+            max_bytes=sm_pool_max_bytes,
+            idle_timeout=sm_pool_idle_timeout,
+            prefault=prefault,
+            huge_pages=huge_pages,
+        )
+        # Arguments of all requests are sub-allocated from a few segments.
+        if use_arena:
+            self._arena = SharedMemoryArena(
+                arena_size,
+                factory=self._create_shared_memory,
+                prefault=prefault,
+                huge_pages=huge_pages,
+            )
+        else:
+            self._arena = None
         self._encoding = DEFAULT_PICKLE_ENCODING
         self._compress_level = COMPRESS_LEVEL_BEST
-        self._coding = ByteCoding.MsgpackZlib
+        self._coding = coding
         self._min_sm_size = 0
         self._min_sm_byte = 0
+        self._daemon_sm = False
         self._max_send_message_length = max_send_message_length
         self._max_receive_message_length = max_receive_message_length
 
         self._channel = None
         self._stub = None
+        self._route_index = None
+        self._route_ids = list()
+        self._route_epoch = str()
+        self._stream = None
+        self._daemon_placement_policy = None
+        self._memfd = None
+        self._file_access = dict()
 
         if root_certificates_path:
             cert = Path(root_certificates_path).read_bytes()
@@ -136,6 +233,30 @@ class DaemonClient:
 
         self.disable_shared_memory = disable_shared_memory
         self.verbose = verbose
+        self.zero_copy = zero_copy
+        self.negotiate_routes = negotiate_routes
+        self.use_stream = use_stream
+        self.chunk_size = chunk_size
+        self.chunk_threshold = chunk_threshold
+        # Without shared memory, send every request over `PacketChunked`,
+        # so that the answer is chunked even if the request is small.
+        self.chunk_answers = chunk_answers
+        self.codec_policy = codec_policy if codec_policy else CodecPolicy()
+        # Large payloads are encoded and decoded on its threads.
+        self.codec_executor = codec_executor or DEFAULT_CODEC_EXECUTOR
+        # If None, the policy reported by the daemon at register time is used.
+        self.placement_policy = placement_policy
+        # Let the daemon allocate the answer segments, if it supports it,
+        # instead of renting `min_sm_size` segments for every request.
+        self.daemon_sm = daemon_sm
+        # On Linux with a UDS address, create anonymous memfd segments and pass
+        # their descriptors to the daemon, instead of named POSIX segments.
+        self.use_memfd = use_memfd
+        # Memory-mapped arguments are sent as references to their files,
+        # if the daemon can open them.
+        self.use_file_refs = use_file_refs
+        # Create the `min_sm_size` segments of the daemon at register time.
+        self.warm_up = warm_up
 
     def __repr__(self) -> str:
         return f"DaemonClient<{self._address}>"
@@ -147,6 +268,14 @@ class DaemonClient:
     def address(self) -> str:
         return self._address
 
+    @property
+    def shared_memory_pool(self) -> SharedMemoryQueue:
+        return self._smq
+
+    @property
+    def is_memfd(self) -> bool:
+        return self._memfd is not None
+
     @property
     def possible_shared_memory(self) -> bool:
         return self._is_sm
@@ -166,16 +295,28 @@ class DaemonClient:
             (OPTIONS_KEY_MAX_RECEIVE_MESSAGE_LENGTH, self._max_receive_message_length),
         ]
 
+    @property
+    def has_route_table(self) -> bool:
+        return self._route_index is not None
+
     def is_open(self) -> bool:
         return self._channel is not None
 
     async def _close(self) -> None:
         assert self._channel is not None
         assert self._stub is not None
+        await self.close_stream()
         await self._channel.close()
         self._channel = None
         self._stub = None
+        if self.verbose >= 1:
+            logger.debug(f"Shared memory pool: {self._smq.stats}")
         self._smq.clear()
+        if self._arena is not None:
+            if self.verbose >= 1:
+                logger.debug(f"Shared memory arena: {self._arena.stats}")
+            self._arena.clear()
+        self._close_memfd()
 
     async def open(self) -> None:
         if self._credentials:
@@ -202,6 +343,21 @@ class DaemonClient:
     async def close(self) -> None:
         await self._close()
 
+    def open_stream(self) -> PacketStream:
+        assert self._stub is not None
+        if self._stream is None:
+            self._stream = PacketStream(self._stub, self.timeout)
+        if not self._stream.is_open:
+            # The first packet, or the previous RPC has ended.
+            self._stream.open()
+        return self._stream
+
+    async def close_stream(self) -> None:
+        if self._stream is not None:
+            stream = self._stream
+            self._stream = None
+            await stream.close()
+
     async def heartbeat(self, delay: float = 0) -> bool:
         assert self._stub is not None
         response = await self._stub.Heartbeat(Pit(delay=delay), **self._options)
@@ -211,25 +367,55 @@ class DaemonClient:
     async def register(self, *args: str, **kwargs: str) -> int:
         assert self._stub is not None
 
-        with register_shared_memory(self.disable_shared_memory) as test:
-            assert isinstance(test, SharedMemoryTestInfo)
-            request = RegisterQ(
-                session=self._session,
-                args=args,
-                kwargs=kwargs,
-                test_sm_name=test.name,
-                test_sm_pass=test.data,
-            )
-            response = await self._stub.Register(request, **self._options)
+        sender = self._memfd if self._memfd is not None else self._connect_memfd()
+        try:
+            with register_shared_memory(self.disable_shared_memory) as test:
+                assert isinstance(test, SharedMemoryTestInfo)
+                with register_memfd(sender) as test_memfd:
+                    assert isinstance(test_memfd, SharedMemoryTestInfo)
+                    request = RegisterQ(
+                        session=self._session,
+                        args=args,
+                        kwargs=kwargs,
+                        test_sm_name=test.name,
+                        test_sm_pass=test.data,
+                        route_table=self.negotiate_routes,
+                        pid=os.getpid(),
+                        test_memfd_name=test_memfd.name,
+                        test_memfd_pass=test_memfd.data,
+                    )
+                    response = await self._stub.Register(request, **self._options)
+        except BaseException:
+            if sender is not None and sender is not self._memfd:
+                sender.close()
+            raise
 
         assert isinstance(response, RegisterA)
         self._is_sm = response.is_sm
+        self._daemon_sm = response.daemon_sm
+        self._update_route_table(response)
 
         if response.min_sm_size > self._min_sm_size:
             self._min_sm_size = response.min_sm_size
         if response.min_sm_byte > self._min_sm_byte:
             self._min_sm_byte = response.min_sm_byte
 
+        if sender is None:
+            pass
+        elif response.memfd_address:
+            self._open_memfd(sender)
+        elif sender is self._memfd:
+            self._close_memfd()
+        else:
+            sender.close()
+
+        if self.warm_up and self._is_sm and not self.disable_shared_memory:
+            self._warm_up()
+
+        if response.inline_threshold > 0:
+            threshold = response.inline_threshold
+            self._daemon_placement_policy = PlacementPolicy(threshold)
+
         if response.code == self.REGISTER_SUCCESS:
             pass
         elif response.code == self.REGISTER_NOT_FOUND:
@@ -238,7 +424,265 @@ class DaemonClient:
             logger.error(f"Unknown register code: {response.code}")
         return response.code
 
+    def _warm_up(self) -> None:
+        begin = tznow()
+        created = self._smq.warm_up(self._min_sm_size, self._min_sm_byte)
+        if self.verbose >= 1 and created:
+            elapsed = round((tznow() - begin).total_seconds(), 3)
+            logger.debug(f"Shared memory warm-up[segments={created}]: {elapsed}s")
+
+    def _connect_memfd(self) -> Optional[MemfdSender]:
+        """
+        Connect to the memfd side channel next to the UDS address of the daemon.
+        """
+        if not self.use_memfd or self.disable_shared_memory:
+            return None
+        if not is_memfd_supported():
+            return None
+        address = memfd_address(self._address)
+        if address is None:
+            return None
+
+        sender = MemfdSender(address)
+        try:
+            sender.open()
+        except OSError as e:
+            logger.warning(f"Failed to open the memfd side channel: {e}")
+            return None
+        return sender
+
+    def _open_memfd(self, sender: MemfdSender) -> None:
+        self._memfd = sender
+        self._smq.factory = self._create_memfd
+        if self._arena is not None:
+            self._arena.factory = self._create_memfd
+
+    def _close_memfd(self) -> None:
+        if self._memfd is None:
+            return
+        self._memfd.close()
+        self._memfd = None
+        self._smq.factory = self._create_shared_memory
+        if self._arena is not None:
+            self._arena.factory = self._create_shared_memory
+
+    def _create_shared_memory(self, size: int) -> SharedMemory:
+        return create_shared_memory(size, self._session)
+
+    def _create_memfd(self, size: int) -> SharedMemory:
+        assert self._memfd is not None
+        # The pools only use the interface that MemfdSegment shares.
+        return cast(SharedMemory, self._memfd.create(size))
+
+    @property
+    def use_daemon_sm(self) -> bool:
+        # The segments allocated by the daemon are named POSIX segments.
+        return self.daemon_sm and self._daemon_sm and self._memfd is None
+
+    def _pop_unlinked(self) -> List[str]:
+        unlinked = self._smq.pop_unlinked()
+        if self._arena is not None:
+            unlinked += self._arena.pop_unlinked()
+        return unlinked
+
+    @property
+    def effective_placement_policy(self) -> Optional[PlacementPolicy]:
+        if self.placement_policy is not None:
+            return self.placement_policy
+        return self._daemon_placement_policy
+
+    def _update_route_table(self, response: RegisterA) -> None:
+        if not response.routes:
+            # The daemon does not support route IDs, or has no routes.
+            self._route_index = None
+            self._route_ids = list()
+            self._route_epoch = str()
+            return
+
+        route_index = RouteIndex()
+        route_ids = list()
+        for route in response.routes:
+            route_index.add(route.method, DynamicResource(route.path))
+            route_ids.append(route.id)
+
+        self._route_index = route_index
+        self._route_ids = route_ids
+        self._route_epoch = response.route_epoch
+
+    def _packet_route(self, method: str, path: str) -> Dict[str, Any]:
+        """
+        Returns the `PacketQ` fields that tell the daemon which route to call.
+        """
+        # The daemon matches the route itself if the route ID is stale.
+        fields: Dict[str, Any] = dict(
+            method=method if method else str(),
+            path=path if path else str(),
+        )
+        if self._route_index is not None:
+            normalize_method = str(method).strip().upper()
+            normalize_path = str(path).strip()
+            found = self._route_index.find(normalize_method, normalize_path)
+            if found is not None:
+                index, match_info = found
+                fields["route_id"] = self._route_ids[index]
+                fields["match_info"] = match_info
+                fields["route_epoch"] = self._route_epoch
+        return fields
+
+    async def _unary_packet(self, packet: PacketQ) -> PacketA:
+        assert self._stub is not None
+        return await self._stub.Packet(packet, **self._options)
+
+    async def _chunked_packet(
+        self,
+        packet: PacketQ,
+        buffers: ChunkBuffers,
+    ) -> Tuple[PacketA, ChunkBuffers]:
+        assert self._stub is not None
+        chunk_size = self.chunk_size
+        packet.chunk_size = chunk_size
+
+        def _messages() -> Iterator[PacketChunkQ]:
+            yield PacketChunkQ(header=packet)
+            for chunk in iter_content_chunks(buffers, chunk_size):
+                yield PacketChunkQ(chunk=chunk)
+
+        header: Optional[PacketA] = None
+        assembler: Optional[ChunkAssembler] = None
+        call = self._stub.PacketChunked(_messages(), **self._options)
+        async for message in call:
+            if message.HasField("header"):
+                header = message.header
+                assembler = ChunkAssembler(header.args, header.kwargs)
+            else:
+                if assembler is None:
+                    raise ValueError("The packet header must come first")
+                assembler.write(message.chunk)
+
+        if header is None or assembler is None:
+            raise ValueError("No packet header")
+
+        assembler.validate()
+        return header, assembler.buffers
+
     async def request(self, method: str, path: str, *args, **kwargs) -> Response:
+        """
+        With `use_stream`, packets are pipelined over one `PacketStream` RPC
+        and a failed packet raises `PacketError`.
+
+        Without shared memory, a packet with contents larger than
+        `chunk_threshold`, or any packet with `chunk_answers`, is sent over
+        the `PacketChunked` RPC instead.
+        """
+        if self.use_stream:
+            send = self.open_stream().send
+        else:
+            send = self._unary_packet
+        return await self._request(send, method, path, args, kwargs)
+
+    async def batch(
+        self,
+        requests: Iterable[Sequence[Any]],
+        concurrent=True,
+    ) -> List[Union[Response, BaseException]]:
+        """
+        Sends all requests in one `PacketBatch` call.
+
+        Each request is a `BatchRequest` or a tuple of
+        `(method, path[, args[, kwargs]])`. A failed item is returned
+        as its exception (`PacketError` for errors in the daemon) in place
+        of the response, so one bad item does not fail the batch.
+        """
+        assert self._stub is not None
+        items = [BatchRequest(*r) for r in requests]
+        if not items:
+            return list()
+
+        batcher = PacketBatcher(self._stub, len(items), concurrent, self._options)
+
+        async def _item(index: int, item: BatchRequest) -> Response:
+            sent = False
+
+            async def _send(packet: PacketQ) -> PacketA:
+                nonlocal sent
+                sent = True
+                return await batcher.send(index, packet)
+
+            try:
+                return await self._request(
+                    _send,
+                    item.method,
+                    item.path,
+                    tuple(item.args),
+                    dict(item.kwargs),
+                    chunked=False,
+                )
+            except BaseException:
+                if not sent:
+                    batcher.discard(index)
+                raise
+
+        return await gather(
+            *[_item(i, item) for i, item in enumerate(items)],
+            return_exceptions=True,
+        )
+
+    async def _check_file_access(self, files: List[FileRef]) -> None:
+        assert self._stub is not None
+        try:
+            response = await self._stub.FileAccess(
+                FileAccessQ(files=files), **self._options
+            )
+            visible = list(response.visible)
+        except AioRpcError as e:
+            if e.code() != StatusCode.UNIMPLEMENTED:
+                raise
+            visible = list()
+
+        if len(self._file_access) + len(files) > MAX_FILE_ACCESS_CACHE_SIZE:
+            self._file_access.clear()
+        for i, ref in enumerate(files):
+            self._file_access[file_identity(ref)] = i < len(visible) and visible[i]
+
+    async def _file_refs(
+        self,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> Dict[int, FileRef]:
+        """
+        References to the files of the memory-mapped arguments, by the id of
+        the argument, that the daemon can open as they are seen here.
+        """
+        policy = self.effective_placement_policy or DEFAULT_PLACEMENT_POLICY
+        refs = dict()
+        for obj in chain(args, kwargs.values()):
+            if isinstance(obj, memmap) and policy.use_shared_memory(obj.nbytes):
+                ref = memmap_file_ref(obj)
+                if ref is not None:
+                    refs[id(obj)] = ref
+        if not refs:
+            return refs
+
+        unknown = dict()
+        for ref in refs.values():
+            identity = file_identity(ref)
+            if identity not in self._file_access:
+                unknown[identity] = ref
+        if unknown:
+            await self._check_file_access(list(unknown.values()))
+
+        # Files the daemon cannot see are sent through the normal path.
+        return {k: r for k, r in refs.items() if self._file_access[file_identity(r)]}
+
+    async def _request(
+        self,
+        send: Callable[[PacketQ], Awaitable[PacketA]],
+        method: str,
+        path: str,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+        chunked=True,
+    ) -> Response:
         assert self._stub is not None
 
         coding = self._coding
@@ -246,65 +690,119 @@ class DaemonClient:
         compress_level = self._compress_level
 
         use_sm = self.possible_shared_memory and not self.disable_shared_memory
-        smq: Optional[SharedMemoryQueue]
+        daemon_sm = use_sm and self.use_daemon_sm
+        smq: Optional[SharedMemoryWriter]
         if use_sm:
+            smq = self._arena if self._arena is not None else self._smq
+        else:
+            smq = None
+
+        if use_sm and not daemon_sm:
             min_sm_size = self._min_sm_size
             min_sm_byte = self._min_sm_byte
-            smq = self._smq
         else:
             min_sm_size = 0
             min_sm_byte = 0
-            smq = None
 
-        renter = self._smq.multi_rent(min_sm_size, min_sm_byte)
-        with renter as sms:
+        if chunked and not use_sm:
+            chunk_threshold = self.chunk_threshold
+        else:
+            chunk_threshold = 0
+
+        if self.use_file_refs:
+            file_refs = await self._file_refs(args, kwargs)
+        else:
+            file_refs = dict()
+
+        # In zero-copy mode, the rented segments are returned to the pool only
+        # when the lease of the response is released.
+        zero_copy = use_sm and self.zero_copy
+        lease = self._smq.multi_rent(min_sm_size, min_sm_byte)
+        try:
             packer = Packer(
                 coding=coding,
                 compress_level=compress_level,
                 args=args,
                 kwargs=kwargs,
                 smq=smq,
+                chunk_threshold=chunk_threshold,
+                codec_policy=self.codec_policy,
+                local=is_uds_family(self._address),
+                placement=self.effective_placement_policy,
+                file_refs=file_refs,
             )
 
+            answer_buffers: Optional[ChunkBuffers] = None
             packer_begin = tznow()
+            await packer.encode(self.codec_executor)
             with packer as contents:
                 if self.verbose >= 1:
                     packer_seconds = (tznow() - packer_begin).total_seconds()
                     packer_elapsed = round(packer_seconds, 3)
-                    logger.debug(f"Packer[sm={use_sm}]: {packer_elapsed}s")
+                    placed = (
+                        f"inline={packer.inline_count},"
+                        f"sm={packer.sm_count},"
+                        f"file={packer.file_count}"
+                    )
+                    logger.debug(f"Packer[sm={use_sm},{placed}]: {packer_elapsed}s")
 
                 packet = PacketQ(
                     session=self._session,
-                    method=method if method else str(),
-                    path=path if path else str(),
                     coding=int(coding.value),  # type: ignore[arg-type]
                     args=contents.args,
                     kwargs=contents.kwargs,
-                    sm_names=sms.keys(),
+                    sm_names=lease.sms.keys(),
+                    unlinked_sm_names=self._pop_unlinked(),
+                    daemon_sm=daemon_sm,
+                    **self._packet_route(method, path),
                 )
 
                 handshake_begin = tznow()
-                response = await self._stub.Packet(packet, **self._options)
+                if contents.buffers or (chunk_threshold and self.chunk_answers):
+                    response, answer_buffers = await self._chunked_packet(
+                        packet, contents.buffers
+                    )
+                else:
+                    response = await send(packet)
                 if self.verbose >= 1:
                     handshake_seconds = (tznow() - handshake_begin).total_seconds()
                     handshake_elapsed = round(handshake_seconds, 3)
                     logger.debug(f"Handshake[sm={use_sm}]: {handshake_elapsed}s")
 
             assert isinstance(response, PacketA)
+            # The segments allocated by the daemon join the pool on release.
+            for sm_name in owned_sm_names(
+                chain(response.args, response.kwargs.values())
+            ):
+                lease.adopt(sm_name)
+
             unpacker_begin = tznow()
-            result = content_unpack(
-                coding=coding,
-                encoding=encoding,
-                args=response.args,
-                kwargs=response.kwargs,
-                sms=sms,
+            result = await self.codec_executor.run(
+                contents_size(chain(response.args, response.kwargs.values())),
+                partial(
+                    content_unpack,
+                    coding=coding,
+                    encoding=encoding,
+                    args=response.args,
+                    kwargs=response.kwargs,
+                    sms=lease.sms,
+                    zero_copy=zero_copy,
+                    buffers=answer_buffers,
+                ),
             )
             if self.verbose >= 1:
                 unpacker_seconds = (tznow() - unpacker_begin).total_seconds()
                 unpacker_elapsed = round(unpacker_seconds, 3)
                 logger.debug(f"Unpacker[sm={use_sm}]: {unpacker_elapsed}s")
+        except BaseException:
+            lease.release()
+            raise
 
-            return result
+        if zero_copy and lease.sms:
+            result.lease = lease
+        else:
+            lease.release()
+        return result
 
     async def get(self, path: str, *args, **kwargs):
         return await self.request(M_GET, path, *args, **kwargs)
@@ -1,10 +1,23 @@
 # -*- coding: utf-8 -*-
 
 import sys
+from asyncio import CancelledError, Queue, Task, create_task, gather, get_running_loop
 from asyncio import run as asyncio_run
-from asyncio import sleep
+from asyncio import sleep, wait
+from itertools import chain
 from pathlib import Path
-from typing import Final, List, Mapping, Optional
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Final,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+)
 
 from type_serialize import ByteCoding
 from type_serialize.variables import COMPRESS_LEVEL_BEST
@@ -12,22 +25,46 @@ from type_serialize.variables import COMPRESS_LEVEL_BEST
 from reccd.aio.connection import try_connection
 from reccd.daemon.daemon_client import insecure_heartbeat, secure_heartbeat
 from reccd.logging.logging import reccd_logger as logger
-from reccd.memory.shared_memory_validator import validate_shared_memory
+from reccd.memory.memfd import MemfdReceiver, is_memfd_supported, memfd_address
+from reccd.memory.shared_memory_janitor import SharedMemoryJanitor, is_process_alive
+from reccd.memory.shared_memory_utils import (
+    SharedMemoryAttachmentCache,
+    unlink_shared_memory,
+)
+from reccd.memory.shared_memory_validator import (
+    validate_memfd,
+    validate_shared_memory,
+)
 from reccd.module.module import Module
-from reccd.packet.parameter_matcher import call_router
+from reccd.packet.chunk import ChunkAssembler, ChunkBuffers, iter_content_chunks
+from reccd.packet.codec_executor import DEFAULT_CODEC_EXECUTOR, CodecExecutor
+from reccd.packet.codec_policy import CodecPolicy
+from reccd.packet.content_inspector import has_pickle, owned_sm_names
+from reccd.packet.file_ref import is_file_visible
+from reccd.packet.parameter_matcher import ResultTuple, call_router
+from reccd.packet.placement_policy import PlacementPolicy
 from reccd.proto.daemon.daemon_api_pb2 import (
+    Coding,
+    FileAccessA,
+    FileAccessQ,
     PacketA,
+    PacketBatchA,
+    PacketBatchQ,
+    PacketChunkA,
+    PacketChunkQ,
     PacketQ,
     Pat,
     Pit,
     RegisterA,
     RegisterCode,
     RegisterQ,
+    RouteInfo,
 )
 from reccd.proto.daemon.daemon_api_pb2_grpc import (
     DaemonApiServicer,
     add_DaemonApiServicer_to_server,
 )
+from reccd.route.route_executor import RouteExecutor
 from reccd.rpc.server import (
     Server,
     ServerCredentials,
@@ -41,6 +78,9 @@ from reccd.variables.rpc import (
     DEFAULT_GRPC_OPTIONS,
     DEFAULT_HEARTBEAT_TIMEOUT,
     DEFAULT_PICKLE_ENCODING,
+    DEFAULT_SM_CACHE_IDLE_TIMEOUT,
+    DEFAULT_SM_JANITOR_INTERVAL,
+    DEFAULT_SM_REPORT_INTERVAL,
     DNS_URI_PREFIX,
     REGISTER_ANSWER_KEY_MIN_SM_BYTE,
     REGISTER_ANSWER_KEY_MIN_SM_SIZE,
@@ -50,10 +90,56 @@ DNS_URI_PREFIX_LEN: Final[int] = len(DNS_URI_PREFIX)
 
 
 class DaemonServicer(DaemonApiServicer):
-    def __init__(self, plugin: Module):
+
+    _janitor_task: Optional[Task]
+    _report_task: Optional[Task]
+    _reported_bytes: Dict[str, int]
+    _session_pids: Dict[str, int]
+
+    def __init__(
+        self,
+        plugin: Module,
+        sm_cache_idle_timeout=DEFAULT_SM_CACHE_IDLE_TIMEOUT,
+        codec_policy: Optional[CodecPolicy] = None,
+        allow_pickle=False,
+        placement_policy: Optional[PlacementPolicy] = None,
+        calibrate_placement=False,
+        memfd_address: Optional[str] = None,
+        sm_janitor_interval=DEFAULT_SM_JANITOR_INTERVAL,
+        sm_report_interval=DEFAULT_SM_REPORT_INTERVAL,
+        codec_executor: Optional[CodecExecutor] = None,
+        route_executor: Optional[RouteExecutor] = None,
+        file_ref_dirs: Optional[Sequence[str]] = None,
+    ):
         self._plugin = plugin
         self._encoding = DEFAULT_PICKLE_ENCODING
         self._compress_level = COMPRESS_LEVEL_BEST
+        if memfd_address and is_memfd_supported():
+            self._memfd: Optional[MemfdReceiver] = MemfdReceiver(memfd_address)
+        else:
+            self._memfd = None
+        self._sm_cache = SharedMemoryAttachmentCache(sm_cache_idle_timeout, self._memfd)
+        self._codec_policy = codec_policy if codec_policy else CodecPolicy()
+        self._codec_executor = codec_executor or DEFAULT_CODEC_EXECUTOR
+        self._route_executor = route_executor or RouteExecutor()
+
+        # Unpickling runs arbitrary code, so only trusted clients may use it.
+        self.allow_pickle = allow_pickle
+
+        # Only the files in these directories are mapped by reference, because
+        # the daemon cannot tell whether the client may read a file.
+        self.file_ref_dirs = list(file_ref_dirs) if file_ref_dirs else list()
+
+        self._placement_policy = placement_policy or PlacementPolicy()
+        self._calibrate_placement = calibrate_placement
+
+        self._janitor = SharedMemoryJanitor()
+        self._janitor_interval = sm_janitor_interval
+        self._janitor_task = None
+        self._report_interval = sm_report_interval
+        self._report_task = None
+        self._reported_bytes = dict()
+        self._session_pids = dict()
 
     def __repr__(self) -> str:
         return f"DaemonServicer<{self._plugin.module_name}>"
@@ -65,8 +151,128 @@ class DaemonServicer(DaemonApiServicer):
     def plugin(self) -> Module:
         return self._plugin
 
+    @property
+    def sm_cache(self) -> SharedMemoryAttachmentCache:
+        return self._sm_cache
+
+    @property
+    def placement_policy(self) -> PlacementPolicy:
+        return self._placement_policy
+
+    @property
+    def codec_executor(self) -> CodecExecutor:
+        return self._codec_executor
+
+    @property
+    def route_executor(self) -> RouteExecutor:
+        return self._route_executor
+
+    @property
+    def memfd(self) -> Optional[MemfdReceiver]:
+        return self._memfd
+
+    @property
+    def janitor(self) -> SharedMemoryJanitor:
+        return self._janitor
+
+    def session_bytes(self) -> Dict[str, int]:
+        return self._sm_cache.session_bytes()
+
+    def sweep_orphans(self) -> None:
+        """
+        Unlink the orphaned segments of this host and forget dead clients.
+        """
+        orphans = self._janitor.sweep()
+        if orphans:
+            freed = sum(x.size for x in orphans)
+            logger.warning(
+                f"Unlinked {len(orphans)} orphaned shared memory segments"
+                f" ({freed} bytes)"
+            )
+
+        for session, pid in list(self._session_pids.items()):
+            if not is_process_alive(pid):
+                del self._session_pids[session]
+                self._sm_cache.evict_session(session)
+
+        self.report_session_bytes()
+
+    def report_session_bytes(self) -> Dict[str, int]:
+        """
+        Log the shared memory mapped for each session, if it has changed
+        since the last report.
+        """
+        sessions = self.session_bytes()
+        if sessions != self._reported_bytes:
+            for session, size in sessions.items():
+                logger.info(
+                    f"Shared memory mapped for session '{session}': {size} bytes"
+                )
+            self._reported_bytes = sessions
+        return sessions
+
+    async def _report_session_bytes_forever(self) -> None:
+        while True:
+            await sleep(self._report_interval)
+            try:
+                self.report_session_bytes()
+            except BaseException as e:
+                logger.error(f"Shared memory report error: {e}")
+
+    def _start_reporter(self) -> None:
+        if self._report_interval <= 0:
+            return
+        self._report_task = create_task(self._report_session_bytes_forever())
+
+    async def _stop_reporter(self) -> None:
+        task = self._report_task
+        if task is None:
+            return
+        self._report_task = None
+        task.cancel()
+        try:
+            await task
+        except CancelledError:
+            pass
+
+    async def _sweep_orphans_forever(self) -> None:
+        while True:
+            await sleep(self._janitor_interval)
+            try:
+                self.sweep_orphans()
+            except BaseException as e:
+                logger.error(f"Shared memory janitor error: {e}")
+
+    def _start_janitor(self) -> None:
+        if self._janitor_interval <= 0 or not self._janitor.is_supported():
+            return
+        self.sweep_orphans()
+        self._janitor_task = create_task(self._sweep_orphans_forever())
+        logger.info(f"Shared memory janitor: every {self._janitor_interval}s")
+
+    async def _stop_janitor(self) -> None:
+        task = self._janitor_task
+        if task is None:
+            return
+        self._janitor_task = None
+        task.cancel()
+        try:
+            await task
+        except CancelledError:
+            pass
+
     async def open(self) -> None:
         logger.info("Daemon opening ...")
+        if self._calibrate_placement:
+            self._placement_policy = PlacementPolicy.calibrate()
+        logger.info(f"Placement policy: {self._placement_policy}")
+        logger.info(f"Codec executor: {self._codec_executor}")
+        logger.info(f"Route executor: {self._route_executor}")
+        if self._memfd is not None:
+            self._memfd.open(get_running_loop())
+            logger.info(f"Memfd side channel: {self._memfd.address!r}")
+        self._start_janitor()
+        self._start_reporter()
         if self._plugin.has_on_open:
             await self._plugin.on_open()
         if self._plugin.has_on_routes:
@@ -77,8 +283,23 @@ class DaemonServicer(DaemonApiServicer):
         logger.info("Daemon closing ...")
         if self._plugin.has_on_close:
             await self._plugin.on_close()
+        await self._stop_janitor()
+        await self._stop_reporter()
+        self.report_session_bytes()
+        for name, stats in self._route_executor.stats().items():
+            logger.debug(f"Route calls[{name}]: {stats}")
+        self._route_executor.shutdown()
+        logger.debug(f"Shared memory attachments: {self._sm_cache.stats}")
+        self._sm_cache.clear()
+        if self._memfd is not None:
+            self._memfd.close()
         logger.info("Daemon closed.")
 
+    @staticmethod
+    def _is_local_peer(context: ServicerContext) -> bool:
+        # Compression is not worth it on a Unix domain socket.
+        return is_uds_family(context.peer())
+
     async def Heartbeat(self, request: Pit, context: ServicerContext) -> Pat:
         logger.debug(f"Heartbeat(delay={request.delay})")
         await sleep(delay=request.delay)
@@ -90,6 +311,9 @@ class DaemonServicer(DaemonApiServicer):
         kwargs = dict(request.kwargs)
         logger.debug(f"Register(session={session},args={args},kwargs={kwargs})")
 
+        if request.pid > 0:
+            await self._register_pid(session, request.pid)
+
         if self._plugin.has_on_register:
             result = await self._plugin.on_register(*args, **kwargs)
             code = RegisterCode.Success
@@ -100,9 +324,17 @@ class DaemonServicer(DaemonApiServicer):
         test_sm_name = request.test_sm_name
         test_sm_pass = request.test_sm_pass
         if test_sm_name and test_sm_pass:
-            is_sm = validate_shared_memory(request.test_sm_name, request.test_sm_pass)
+            is_posix_sm = validate_shared_memory(test_sm_name, test_sm_pass)
         else:
-            is_sm = False
+            is_posix_sm = False
+        # Checked over the side channel, so memfd segments also work where
+        # the POSIX segments do not, e.g. without a usable /dev/shm.
+        is_memfd = validate_memfd(
+            self._memfd,
+            request.test_memfd_name,
+            request.test_memfd_pass,
+        )
+        is_sm = is_posix_sm or is_memfd
 
         if is_sm and result is not None:
             if isinstance(result, Mapping):
@@ -115,21 +347,241 @@ class DaemonServicer(DaemonApiServicer):
             min_sm_size = 0
             min_sm_byte = 0
 
+        if request.route_table:
+            routes = self._route_table()
+        else:
+            routes = list()
+
+        if is_memfd:
+            assert self._memfd is not None
+            memfd = self._memfd.address
+        else:
+            memfd = str()
+
         return RegisterA(
             code=code,
             is_sm=is_sm,
             min_sm_size=min_sm_size,
             min_sm_byte=min_sm_byte,
+            routes=routes,
+            inline_threshold=self._placement_policy.inline_threshold,
+            # The segments allocated by the daemon are named POSIX segments.
+            daemon_sm=is_posix_sm,
+            memfd_address=memfd,
+            route_epoch=self._plugin.route_epoch,
         )
 
+    async def _register_pid(self, session: str, pid: int) -> None:
+        if is_process_alive(pid):
+            self._session_pids[session] = pid
+        elif self._janitor_task is not None:
+            # The client is in another PID namespace, where its segments
+            # would look orphaned.
+            logger.warning(f"Client process {pid} is not visible, stop the janitor")
+            await self._stop_janitor()
+
+    def _route_table(self) -> List[RouteInfo]:
+        return [
+            RouteInfo(id=i, method=r.method, path=r.path)
+            for i, r in enumerate(self._plugin.routes)
+        ]
+
+    @staticmethod
+    def _discard_answer(answer: PacketA) -> None:
+        """
+        Unlink the segments handed over to a client that never got the answer.
+        """
+        for sm_name in owned_sm_names(chain(answer.args, answer.kwargs.values())):
+            unlink_shared_memory(sm_name)
+
+    def _discard_if_cancelled(
+        self,
+        context: ServicerContext,
+        answers: Iterable[PacketA],
+    ) -> None:
+        def _done(c: ServicerContext) -> None:
+            if c.cancelled():
+                for answer in answers:
+                    self._discard_answer(answer)
+
+        context.add_done_callback(_done)
+
     async def Packet(self, request: PacketQ, context: ServicerContext) -> PacketA:
+        answer = await self._packet(request, self._is_local_peer(context))
+        self._discard_if_cancelled(context, [answer])
+        return answer
+
+    async def _safe_packet(self, request: PacketQ, local=False) -> PacketA:
+        try:
+            answer = await self._packet(request, local)
+        except BaseException as e:
+            logger.exception(e)
+            answer = PacketA(error=f"{type(e).__name__}: {e}")
+        answer.correlation_id = request.correlation_id
+        return answer
+
+    async def PacketStream(
+        self,
+        request_iterator: AsyncIterable[PacketQ],
+        context: ServicerContext,
+    ) -> AsyncIterator[PacketA]:
+        local = self._is_local_peer(context)
+        answers: Queue[Optional[PacketA]] = Queue()
+        tasks: Set[Task] = set()
+
+        async def _answer(request: PacketQ) -> None:
+            await answers.put(await self._safe_packet(request, local))
+
+        async def _read() -> None:
+            try:
+                async for request in request_iterator:
+                    task = create_task(_answer(request))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                if tasks:
+                    await wait(list(tasks))
+            finally:
+                await answers.put(None)
+
+        reader = create_task(_read())
+        sending: Optional[PacketA] = None
+        try:
+            while True:
+                answer = await answers.get()
+                if answer is None:
+                    break
+                # Sent once the stream asks for the next answer.
+                sending = answer
+                yield answer
+                sending = None
+            await reader
+        finally:
+            reader.cancel()
+            for task in list(tasks):
+                task.cancel()
+            if sending is not None:
+                self._discard_answer(sending)
+            while not answers.empty():
+                answer = answers.get_nowait()
+                if answer is not None:
+                    self._discard_answer(answer)
+
+    async def PacketBatch(
+        self,
+        request: PacketBatchQ,
+        context: ServicerContext,
+    ) -> PacketBatchA:
+        logger.debug(
+            f"PacketBatch(size={len(request.packets)},concurrent={request.concurrent})"
+        )
+        local = self._is_local_peer(context)
+        packets = request.packets
+        if request.concurrent:
+            answers = await gather(*[self._safe_packet(p, local) for p in packets])
+        else:
+            answers = [await self._safe_packet(p, local) for p in packets]
+        self._discard_if_cancelled(context, answers)
+        return PacketBatchA(packets=answers)
+
+    async def PacketChunked(
+        self,
+        request_iterator: AsyncIterable[PacketChunkQ],
+        context: ServicerContext,
+    ) -> AsyncIterator[PacketChunkA]:
+        header: Optional[PacketQ] = None
+        assembler: Optional[ChunkAssembler] = None
+
+        async for message in request_iterator:
+            if message.HasField("header"):
+                if header is not None:
+                    raise ValueError("Duplicate packet header")
+                header = message.header
+                assembler = ChunkAssembler(header.args, header.kwargs)
+            else:
+                if assembler is None:
+                    raise ValueError("The packet header must come first")
+                assembler.write(message.chunk)
+
+        if header is None or assembler is None:
+            raise ValueError("No packet header")
+
+        assembler.validate()
+        result = await self._call_route(
+            header,
+            buffers=assembler.buffers,
+            chunk_threshold=header.chunk_size,
+            local=self._is_local_peer(context),
+        )
+
+        answer = PacketA(args=result.args, kwargs=result.kwargs)
+        self._discard_if_cancelled(context, [answer])
+        yield PacketChunkA(header=answer)
+        if result.buffers:
+            for chunk in iter_content_chunks(result.buffers, header.chunk_size):
+                yield PacketChunkA(chunk=chunk)
+
+    async def FileAccess(
+        self,
+        request: FileAccessQ,
+        context: ServicerContext,
+    ) -> FileAccessA:
+        logger.debug(f"FileAccess(size={len(request.files)})")
+        dirs = self.file_ref_dirs
+        return FileAccessA(visible=[is_file_visible(f, dirs) for f in request.files])
+
+    async def _packet(self, request: PacketQ, local=False) -> PacketA:
+        result = await self._call_route(request, local=local)
+        return PacketA(args=result.args, kwargs=result.kwargs)
+
+    @staticmethod
+    def _has_pickle(request: PacketQ) -> bool:
+        if request.coding == Coding.Pickle5:
+            return True
+        contents = chain(request.args, request.kwargs.values())
+        return any(has_pickle(content) for content in contents)
+
+    def _is_current_route_id(self, request: PacketQ) -> bool:
+        if not request.HasField("route_id"):
+            return False
+        if request.route_epoch == self._plugin.route_epoch:
+            return True
+        # The route table changed since the client registered,
+        # e.g. the daemon was restarted with other routes.
+        logger.warning(
+            f"Stale route table (epoch={request.route_epoch}),"
+            " match the route by its method and path"
+        )
+        return False
+
+    async def _call_route(
+        self,
+        request: PacketQ,
+        buffers: Optional[ChunkBuffers] = None,
+        chunk_threshold=0,
+        local=False,
+    ) -> ResultTuple:
         session = request.session
-        method = request.method
-        path = request.path
-        logger.debug(f"Packet(session={session},method={method},path={path})")
-        route, match_info = self._plugin.get_route(method, path)
-        result = await call_router(
-            func=route,
+        for sm_name in request.unlinked_sm_names:
+            self._sm_cache.evict(session, sm_name)
+            if self._memfd is not None:
+                self._memfd.forget(sm_name)
+        self._sm_cache.evict_idle()
+
+        if not self.allow_pickle and self._has_pickle(request):
+            raise PermissionError("The pickle coding is not allowed")
+
+        if self._is_current_route_id(request):
+            route_id = request.route_id
+            logger.debug(f"Packet(session={session},route_id={route_id})")
+            route = self._plugin.get_route_by_id(route_id)
+            match_info = dict(request.match_info)
+        else:
+            method = request.method
+            path = request.path
+            logger.debug(f"Packet(session={session},method={method},path={path})")
+            route, match_info = self._plugin.match_route(method, path)
+        return await call_router(
+            func=route.func,
             match_info=match_info,
             coding=ByteCoding(request.coding),
             encoding=self._encoding,
@@ -137,8 +589,22 @@ class DaemonServicer(DaemonApiServicer):
             args=request.args,
             kwargs=request.kwargs,
             sm_names=request.sm_names,
+            options=route.options,
+            session=session,
+            sm_cache=self._sm_cache,
+            plan=route.plan,
+            buffers=buffers,
+            chunk_threshold=chunk_threshold,
+            codec_policy=self._codec_policy,
+            local=local,
+            placement=self._placement_policy,
+            daemon_sm=request.daemon_sm,
+            owner_pid=self._session_pids.get(session),
+            codec_executor=self._codec_executor,
+            route_executor=self._route_executor,
+            route_name=f"{route.method} {route.path}",
+            file_ref_dirs=self.file_ref_dirs,
         )
-        return PacketA(args=result.args, kwargs=result.kwargs)
 
 
 class _AcceptInfo(object):
@@ -176,6 +642,13 @@ def create_daemon_server(
     private_key_path: Optional[str] = None,
     certificate_chain_path: Optional[str] = None,
     packages_dirs: Optional[List[str]] = None,
+    allow_pickle=False,
+    calibrate_placement=False,
+    sm_janitor_interval=DEFAULT_SM_JANITOR_INTERVAL,
+    sm_report_interval=DEFAULT_SM_REPORT_INTERVAL,
+    codec_threads: Optional[int] = None,
+    route_threads: Optional[int] = None,
+    file_ref_dirs: Optional[Sequence[str]] = None,
 ) -> _AcceptInfo:
     if packages_dirs:
         for packages_dir in packages_dirs:
@@ -191,7 +664,19 @@ def create_daemon_server(
     logger.info(f"Arguments: {sys.argv}")
 
     plugin = Module(module_name)
-    servicer = DaemonServicer(plugin)
+    servicer = DaemonServicer(
+        plugin,
+        allow_pickle=allow_pickle,
+        calibrate_placement=calibrate_placement,
+        memfd_address=memfd_address(bind_address),
+        sm_janitor_interval=sm_janitor_interval,
+        sm_report_interval=sm_report_interval,
+        codec_executor=None if codec_threads is None else CodecExecutor(codec_threads),
+        route_executor=RouteExecutor(route_threads),
+        file_ref_dirs=file_ref_dirs,
+    )
+    if allow_pickle:
+        logger.warning("The pickle coding is allowed")
 
     server = create_grpc_aio_server(options=DEFAULT_GRPC_OPTIONS)
 
@@ -278,6 +763,13 @@ async def run_daemon_server(
     private_key_path: Optional[str] = None,
     certificate_chain_path: Optional[str] = None,
     wait_connect=True,
+    allow_pickle=False,
+    calibrate_placement=False,
+    sm_janitor_interval=DEFAULT_SM_JANITOR_INTERVAL,
+    sm_report_interval=DEFAULT_SM_REPORT_INTERVAL,
+    codec_threads: Optional[int] = None,
+    route_threads: Optional[int] = None,
+    file_ref_dirs: Optional[Sequence[str]] = None,
 ) -> None:
     if not module_name:
         raise ValueError("The module name is required")
@@ -290,6 +782,13 @@ async def run_daemon_server(
         private_key_path=private_key_path,
         certificate_chain_path=certificate_chain_path,
         packages_dirs=None,
+        allow_pickle=allow_pickle,
+        calibrate_placement=calibrate_placement,
+        sm_janitor_interval=sm_janitor_interval,
+        sm_report_interval=sm_report_interval,
+        codec_threads=codec_threads,
+        route_threads=route_threads,
+        file_ref_dirs=file_ref_dirs,
     )
     servicer = accept_info.servicer
     await servicer.open()
@@ -323,6 +822,13 @@ def run_daemon_until_complete(
     private_key_path: Optional[str] = None,
     certificate_chain_path: Optional[str] = None,
     wait_connect=True,
+    allow_pickle=False,
+    calibrate_placement=False,
+    sm_janitor_interval=DEFAULT_SM_JANITOR_INTERVAL,
+    sm_report_interval=DEFAULT_SM_REPORT_INTERVAL,
+    codec_threads: Optional[int] = None,
+    route_threads: Optional[int] = None,
+    file_ref_dirs: Optional[Sequence[str]] = None,
 ) -> int:
     try:
         asyncio_run(
@@ -332,6 +838,13 @@ def run_daemon_until_complete(
                 private_key_path=private_key_path,
                 certificate_chain_path=certificate_chain_path,
                 wait_connect=wait_connect,
+                allow_pickle=allow_pickle,
+                calibrate_placement=calibrate_placement,
+                sm_janitor_interval=sm_janitor_interval,
+                sm_report_interval=sm_report_interval,
+                codec_threads=codec_threads,
+                route_threads=route_threads,
+                file_ref_dirs=file_ref_dirs,
             )
         )
         logger.info("Daemon completed successfully")
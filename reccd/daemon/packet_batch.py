@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+from asyncio import Future, Task, create_task, get_running_loop
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Sequence
+
+from reccd.packet.errors import PacketError
+from reccd.proto.daemon.daemon_api_pb2 import PacketA, PacketBatchQ, PacketQ
+from reccd.proto.daemon.daemon_api_pb2_grpc import DaemonApiStub
+
+
+class BatchRequest(NamedTuple):
+    method: str
+    path: str
+    args: Sequence[Any] = ()
+    kwargs: Mapping[str, Any] = {}
+
+
+class PacketBatcher:
+    """
+    Collects the packets of a batch and sends them in one `PacketBatch` call
+    once every item has been packed or discarded.
+    """
+
+    _packets: List[Optional[PacketQ]]
+    _futures: Dict[int, Future]
+    _flush_task: Optional[Task]
+
+    def __init__(
+        self,
+        stub: DaemonApiStub,
+        size: int,
+        concurrent: bool,
+        options: Mapping[str, Any],
+    ):
+        self._stub = stub
+        self._concurrent = concurrent
+        self._options = options
+        self._packets = [None] * size
+        self._futures = dict()
+        self._remaining = size
+        self._flush_task = None
+
+    async def send(self, index: int, packet: PacketQ) -> PacketA:
+        future = get_running_loop().create_future()
+        self._packets[index] = packet
+        self._futures[index] = future
+        self._done_one()
+
+        answer = await future
+        assert isinstance(answer, PacketA)
+        if answer.error:
+            raise PacketError(answer.error)
+        return answer
+
+    def discard(self, index: int) -> None:
+        """
+        The item failed before its packet was sent.
+        """
+        assert self._packets[index] is None
+        self._done_one()
+
+    def _done_one(self) -> None:
+        assert self._remaining >= 1
+        self._remaining -= 1
+        if self._remaining == 0 and self._futures:
+            self._flush_task = create_task(self._flush())
+
+    async def _flush(self) -> None:
+        indices = sorted(self._futures.keys())
+        packets: List[PacketQ] = list()
+        for index in indices:
+            packet = self._packets[index]
+            assert packet is not None
+            packets.append(packet)
+        request = PacketBatchQ(packets=packets, concurrent=self._concurrent)
+
+        try:
+            response = await self._stub.PacketBatch(request, **self._options)
+        except BaseException as e:
+            for future in self._futures.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for index, answer in zip(indices, response.packets):
+            future = self._futures[index]
+            if not future.done():
+                future.set_result(answer)
+
+        for future in self._futures.values():
+            if not future.done():
+                future.set_exception(PacketError("Missing answer in the batch"))
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+
+from asyncio import (
+    Future,
+    Lock,
+    Task,
+    create_task,
+    current_task,
+    get_running_loop,
+    wait_for,
+)
+from itertools import chain, count
+from typing import Any, Dict, Iterator, Optional
+
+from reccd.logging.logging import reccd_logger as logger
+from reccd.memory.shared_memory_utils import unlink_shared_memory
+from reccd.packet.content_inspector import owned_sm_names
+from reccd.packet.errors import PacketError, PacketStreamClosedError
+from reccd.proto.daemon.daemon_api_pb2 import PacketA, PacketQ
+from reccd.proto.daemon.daemon_api_pb2_grpc import DaemonApiStub
+
+
+class PacketStream:
+    """
+    Keeps many packets in flight over one `PacketStream` RPC.
+
+    Each packet gets a correlation ID,
+    so the daemon can answer in any order.
+
+    When the RPC ends, e.g. the daemon restarts, the pending packets fail
+    and the stream can be opened again.
+    """
+
+    _call: Optional[Any]
+    _reader: Optional[Task]
+    _pending: Dict[int, Future]
+    _ids: Iterator[int]
+
+    def __init__(self, stub: DaemonApiStub, timeout: Optional[float] = None):
+        self._stub = stub
+        self._timeout = timeout
+        self._call = None
+        self._reader = None
+        self._pending = dict()
+        self._ids = count(1)
+        self._write_lock = Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self._call is not None
+
+    @property
+    def count_pending(self) -> int:
+        return len(self._pending)
+
+    def open(self) -> None:
+        assert self._call is None
+        # The stream is long-lived, so the client timeout applies per packet.
+        self._call = self._stub.PacketStream()
+        self._reader = create_task(self._read())
+
+    async def close(self) -> None:
+        if self._call is None:
+            return
+
+        call = self._call
+        reader = self._reader
+        self._call = None
+        self._reader = None
+
+        try:
+            await call.done_writing()
+        except BaseException as e:
+            logger.debug(f"PacketStream done writing error: {e}")
+
+        assert reader is not None
+        reader.cancel()
+        try:
+            await reader
+        except BaseException:  # noqa
+            pass
+        call.cancel()
+        self._fail_pending(PacketStreamClosedError())
+
+    def _fail_pending(self, error: BaseException) -> None:
+        pending = self._pending
+        self._pending = dict()
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    @staticmethod
+    def _discard(answer: PacketA) -> None:
+        """
+        Unlink the segments handed over with an answer that nobody waits for.
+        """
+        for sm_name in owned_sm_names(chain(answer.args, answer.kwargs.values())):
+            unlink_shared_memory(sm_name)
+
+    def _end(self, call: Any, error: BaseException) -> None:
+        """
+        Forget the call that has ended without `close()`, e.g. because the
+        daemon restarted, and fail its pending packets.
+        """
+        if self._call is not call:
+            return
+        reader = self._reader
+        self._call = None
+        self._reader = None
+        if reader is not None and reader is not current_task():
+            reader.cancel()
+        self._fail_pending(error)
+
+    async def _read(self) -> None:
+        call = self._call
+        assert call is not None
+        error: BaseException
+        try:
+            async for answer in call:
+                future = self._pending.pop(answer.correlation_id, None)
+                if future is None:
+                    logger.warning(f"Unknown correlation id: {answer.correlation_id}")
+                    self._discard(answer)
+                elif future.done():
+                    self._discard(answer)
+                else:
+                    future.set_result(answer)
+        except BaseException as e:
+            error = e
+        else:
+            error = PacketStreamClosedError()
+        self._end(call, error)
+
+    async def _write(self, correlation_id: int, packet: PacketQ) -> Future:
+        """
+        Returns the future of the answer once the packet is written.
+        """
+        retry = True
+        while True:
+            call = self._call
+            if call is None:
+                raise PacketStreamClosedError()
+            future = get_running_loop().create_future()
+            self._pending[correlation_id] = future
+            try:
+                async with self._write_lock:
+                    await call.write(packet)
+                return future
+            except Exception as e:
+                self._pending.pop(correlation_id, None)
+                self._end(call, PacketStreamClosedError())
+                if not retry:
+                    raise PacketStreamClosedError() from e
+            # The RPC ended before the packet was written,
+            # so the packet is sent once more on a new call.
+            retry = False
+            self.open()
+
+    async def send(self, packet: PacketQ) -> PacketA:
+        correlation_id = next(self._ids)
+        packet.correlation_id = correlation_id
+        future: Optional[Future] = None
+
+        try:
+            future = await self._write(correlation_id, packet)
+            answer = await wait_for(future, timeout=self._timeout)
+        except BaseException:
+            # The answer may have arrived along with the timeout or cancellation.
+            if future is None or not future.done() or future.cancelled():
+                raise
+            if not future.exception():
+                self._discard(future.result())
+            raise
+        finally:
+            self._pending.pop(correlation_id, None)
+
+        assert isinstance(answer, PacketA)
+        if answer.error:
+            raise PacketError(answer.error)
+        return answer
@@ -5,7 +5,14 @@ from typing import Callable, List, Optional
 from reccd.apps.client import main as client_main
 from reccd.apps.modules import main as modules_main
 from reccd.apps.server import main as server_main
-from reccd.arguments import CMD_CLIENT, CMD_MODULES, CMD_SERVER, get_default_arguments
+from reccd.apps.shm import main as shm_main
+from reccd.arguments import (
+    CMD_CLIENT,
+    CMD_MODULES,
+    CMD_SERVER,
+    CMD_SHM,
+    get_default_arguments,
+)
 from reccd.logging.logging import SEVERITY_NAME_DEBUG
 from reccd.logging.logging import reccd_logger as logger
 from reccd.logging.logging import (
@@ -38,7 +45,7 @@ def main(
         )
         return 1
 
-    assert cmd in [CMD_CLIENT, CMD_MODULES, CMD_SERVER]
+    assert cmd in [CMD_CLIENT, CMD_MODULES, CMD_SERVER, CMD_SHM]
     assert isinstance(default_logging, bool)
     assert isinstance(simple_logging, bool)
     assert isinstance(severity, str)
@@ -63,6 +70,8 @@ def main(
         return modules_main(args, printer=printer)
     elif cmd == CMD_SERVER:
         return server_main(args, printer=printer)
+    elif cmd == CMD_SHM:
+        return shm_main(args, printer=printer)
     else:
         assert False, "Inaccessible section"
 
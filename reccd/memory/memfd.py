@@ -0,0 +1,364 @@
+# -*- coding: utf-8 -*-
+
+import os
+import socket
+import struct
+import sys
+from asyncio import AbstractEventLoop
+from mmap import mmap
+from threading import RLock
+from typing import Dict, Final, Optional, Set
+from uuid import uuid4
+
+from reccd.logging.logging import reccd_logger as logger
+from reccd.variables.rpc import (
+    MEMFD_ADDRESS_SUFFIX,
+    MEMFD_MESSAGE_SIZE,
+    MEMFD_SOCKET_MODE,
+    UNIX_ABSTRACT_URI_PREFIX,
+    UNIX_URI_PREFIX,
+)
+
+MEMFD_NAME_PREFIX: Final[str] = "memfd-"
+
+
+def is_memfd_supported() -> bool:
+    if not sys.platform.startswith("linux"):
+        return False
+    return hasattr(os, "memfd_create") and hasattr(socket, "send_fds")
+
+
+def is_memfd_name(name: str) -> bool:
+    return name.startswith(MEMFD_NAME_PREFIX)
+
+
+def memfd_address(bind_address: str) -> Optional[str]:
+    """
+    The socket address of the side channel next to the UDS address of the
+    daemon, or ``None`` if the daemon is not bound to a UDS address.
+    """
+    if bind_address.startswith(UNIX_URI_PREFIX):
+        path = bind_address[len(UNIX_URI_PREFIX) :]
+        if path.startswith("///"):
+            path = path[2:]
+        return path + MEMFD_ADDRESS_SUFFIX
+    if bind_address.startswith(UNIX_ABSTRACT_URI_PREFIX):
+        name = bind_address[len(UNIX_ABSTRACT_URI_PREFIX) :]
+        return "\0" + name + MEMFD_ADDRESS_SUFFIX
+    return None
+
+
+def peer_uid(sock: socket.socket) -> int:
+    """
+    The user ID of the process on the other end of a connected UDS socket.
+    """
+    size = struct.calcsize("3i")
+    creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, size)
+    _, uid, _ = struct.unpack("3i", creds)
+    return uid
+
+
+def _seals() -> int:
+    from fcntl import F_SEAL_GROW, F_SEAL_SEAL, F_SEAL_SHRINK  # noqa
+
+    return F_SEAL_SHRINK | F_SEAL_GROW | F_SEAL_SEAL
+
+
+class MemfdSegment:
+    """
+    Anonymous shared memory with the interface of ``SharedMemory``.
+
+    The size is sealed, so the peer cannot shrink it under a mapping.
+    The kernel frees the memory when the last descriptor and mapping are
+    closed, so nothing is left in ``/dev/shm`` when a process crashes.
+    """
+
+    __slots__ = ("_name", "_fd", "_mmap", "_buf")
+
+    def __init__(self, name: str, fd: int, size: int):
+        self._name = name
+        self._fd = fd
+        self._mmap = mmap(fd, size)
+        self._buf: Optional[memoryview] = memoryview(self._mmap)
+
+    def __repr__(self) -> str:
+        return f"MemfdSegment<name={self._name},size={self.size}>"
+
+    @classmethod
+    def create(cls, size: int) -> "MemfdSegment":
+        from fcntl import F_ADD_SEALS, fcntl  # noqa
+
+        name = MEMFD_NAME_PREFIX + uuid4().hex
+        fd = os.memfd_create(name, os.MFD_CLOEXEC | os.MFD_ALLOW_SEALING)
+        try:
+            os.ftruncate(fd, size)
+            fcntl(fd, F_ADD_SEALS, _seals())
+            return cls(name, fd, size)
+        except BaseException:
+            os.close(fd)
+            raise
+
+    @classmethod
+    def attach(cls, name: str, fd: int) -> "MemfdSegment":
+        from fcntl import F_GET_SEALS, F_SEAL_SHRINK, fcntl  # noqa
+
+        if not fcntl(fd, F_GET_SEALS) & F_SEAL_SHRINK:
+            raise PermissionError(f"The memfd segment is not sealed: {name}")
+        fd = os.dup(fd)
+        try:
+            return cls(name, fd, os.fstat(fd).st_size)
+        except BaseException:
+            os.close(fd)
+            raise
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def fd(self) -> int:
+        return self._fd
+
+    @property
+    def size(self) -> int:
+        return len(self._mmap)
+
+    @property
+    def buf(self) -> memoryview:
+        assert self._buf is not None
+        return self._buf
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+        if self._buf is not None:
+            # Raises BufferError if a view is still exported, like SharedMemory.
+            self._buf.release()
+            self._buf = None
+        if not self._mmap.closed:
+            self._mmap.close()
+
+    def unlink(self) -> None:
+        # Anonymous, so there is no name to remove.
+        pass
+
+
+class MemfdSender:
+    """
+    Client end of the side channel that passes memfd descriptors
+    to the daemon with ``SCM_RIGHTS``.
+
+    A segment is sent as soon as it is created, so it is known to the daemon
+    before any packet refers to it.
+    """
+
+    _sock: Optional[socket.socket]
+
+    def __init__(self, address: str):
+        self._address = address
+        self._sock = None
+
+    @property
+    def address(self) -> str:
+        return self._address
+
+    def is_open(self) -> bool:
+        return self._sock is not None
+
+    def open(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        try:
+            sock.connect(self._address)
+        except BaseException:
+            sock.close()
+            raise
+        self._sock = sock
+
+    def close(self) -> None:
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def create(self, size: int) -> MemfdSegment:
+        assert self._sock is not None
+        sm = MemfdSegment.create(size)
+        try:
+            socket.send_fds(self._sock, [sm.name.encode()], [sm.fd])
+        except BaseException:
+            sm.close()
+            raise
+        return sm
+
+
+class MemfdReceiver:
+    """
+    Daemon end of the side channel.
+
+    Only processes of ``uid``, the effective user of the daemon by default,
+    may connect. A socket file is also created with ``MEMFD_SOCKET_MODE``,
+    while an abstract address is only guarded by the peer credentials.
+
+    Received descriptors are kept by segment name until the client reports
+    the segment as unlinked or disconnects. Sockets are read without
+    blocking, from the event loop and whenever an unknown name is opened,
+    which may happen on a route thread, so the sockets are read under a lock.
+    """
+
+    _listener: Optional[socket.socket]
+    _connections: Dict[socket.socket, Set[str]]
+    _fds: Dict[str, int]
+    _loop: Optional[AbstractEventLoop]
+
+    def __init__(self, address: str, uid: Optional[int] = None):
+        self._address = address
+        self._uid = uid if uid is not None else os.geteuid()
+        self._listener = None
+        self._connections = dict()
+        self._fds = dict()
+        self._loop = None
+        self._lock = RLock()
+
+    @property
+    def address(self) -> str:
+        return self._address
+
+    @property
+    def size(self) -> int:
+        return len(self._fds)
+
+    def is_open(self) -> bool:
+        return self._listener is not None
+
+    def open(self, loop: Optional[AbstractEventLoop] = None) -> None:
+        if not self._address.startswith("\0") and os.path.exists(self._address):
+            os.remove(self._address)
+
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        try:
+            listener.bind(self._address)
+            if not self._address.startswith("\0"):
+                # Before listen(), so that no peer connects in between.
+                os.chmod(self._address, MEMFD_SOCKET_MODE)
+            listener.listen()
+            listener.setblocking(False)
+        except BaseException:
+            listener.close()
+            raise
+        self._listener = listener
+
+        self._loop = loop
+        if loop is not None:
+            loop.add_reader(listener.fileno(), self._accept)
+
+    def close(self) -> None:
+        with self._lock:
+            for connection in list(self._connections.keys()):
+                self._disconnect(connection)
+            if self._listener is not None:
+                if self._loop is not None:
+                    self._loop.remove_reader(self._listener.fileno())
+                    self._loop = None
+                self._listener.close()
+                self._listener = None
+                if not self._address.startswith("\0"):
+                    if os.path.exists(self._address):
+                        os.remove(self._address)
+
+    def _disconnect(self, connection: socket.socket) -> None:
+        if self._loop is not None:
+            self._loop.remove_reader(connection.fileno())
+        for name in self._connections.pop(connection):
+            fd = self._fds.pop(name, None)
+            if fd is not None:
+                os.close(fd)
+        connection.close()
+
+    def _accept(self) -> None:
+        with self._lock:
+            self._accept_connections()
+
+    def _accept_connections(self) -> None:
+        if self._listener is None:
+            return
+        while True:
+            try:
+                connection, _ = self._listener.accept()
+            except BlockingIOError:
+                break
+            uid = peer_uid(connection)
+            if uid != self._uid:
+                connection.close()
+                logger.warning(f"Refused the memfd side channel of user {uid}")
+                continue
+            connection.setblocking(False)
+            self._connections[connection] = set()
+            if self._loop is not None:
+                self._loop.add_reader(
+                    connection.fileno(), self._on_readable, connection
+                )
+
+    def _on_readable(self, connection: socket.socket) -> None:
+        with self._lock:
+            if connection in self._connections and not self._receive(connection):
+                self._disconnect(connection)
+
+    def _receive(self, connection: socket.socket) -> bool:
+        """
+        Returns ``False`` if the client has disconnected.
+        """
+        names = self._connections[connection]
+        while True:
+            try:
+                message, fds, _, _ = socket.recv_fds(connection, MEMFD_MESSAGE_SIZE, 1)
+            except BlockingIOError:
+                return True
+            except ConnectionError:
+                return False
+
+            if not message and not fds:
+                return False
+            if len(fds) != 1:
+                for fd in fds:
+                    os.close(fd)
+                logger.warning("Invalid memfd message without one descriptor")
+                continue
+
+            name = message.decode()
+            if not is_memfd_name(name) or name in self._fds:
+                os.close(fds[0])
+                logger.warning(f"Invalid memfd segment name: {name}")
+                continue
+
+            self._fds[name] = fds[0]
+            names.add(name)
+
+    def poll(self) -> None:
+        with self._lock:
+            if self._listener is None:
+                return
+            self._accept_connections()
+            for connection in list(self._connections.keys()):
+                if not self._receive(connection):
+                    self._disconnect(connection)
+
+    def open_segment(self, name: str) -> MemfdSegment:
+        with self._lock:
+            fd = self._fds.get(name)
+            if fd is None:
+                # The descriptor may still be queued in the side channel.
+                self.poll()
+                fd = self._fds.get(name)
+                if fd is None:
+                    raise FileNotFoundError(f"Unknown memfd segment: {name}")
+            return MemfdSegment.attach(name, fd)
+
+    def forget(self, name: str) -> bool:
+        with self._lock:
+            fd = self._fds.pop(name, None)
+            if fd is None:
+                return False
+            for names in self._connections.values():
+                names.discard(name)
+            os.close(fd)
+            return True
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from time import perf_counter
+from typing import Callable, List, NamedTuple, Optional, Tuple, Union
+
+from numpy import copyto, frombuffer, ndarray, uint8
+from numpy.random import randint
+
+from reccd.variables.rpc import (
+    DEFAULT_PARALLEL_COPY_MAX_SIZE,
+    DEFAULT_PARALLEL_COPY_MIN_SIZE,
+    DEFAULT_PARALLEL_COPY_REPEAT,
+    DEFAULT_PARALLEL_COPY_THREADS,
+    DEFAULT_PARALLEL_COPY_THRESHOLD,
+)
+
+BufferLike = Union[bytes, bytearray, memoryview]
+
+
+def _split(length: int, parts: int) -> List[Tuple[int, int]]:
+    step = -(-length // parts)
+    return [(begin, min(begin + step, length)) for begin in range(0, length, step)]
+
+
+class ParallelCopier:
+    """
+    Copies large buffers in ranges on a small thread pool.
+
+    ``numpy.copyto`` releases the GIL, so the ranges are copied in parallel.
+    Copies up to ``threshold`` bytes stay on the calling thread, which also
+    copies one of the ranges itself. By default, there are as many threads as
+    CPUs up to ``DEFAULT_PARALLEL_COPY_THREADS``.
+    """
+
+    _executor: Optional[ThreadPoolExecutor]
+
+    def __init__(
+        self,
+        threads: Optional[int] = None,
+        threshold=DEFAULT_PARALLEL_COPY_THRESHOLD,
+    ):
+        if threads is None:
+            threads = min(DEFAULT_PARALLEL_COPY_THREADS, os.cpu_count() or 1)
+        self.threads = max(threads, 1)
+        self.threshold = threshold
+        self._executor = None
+        self._lock = Lock()
+
+    def __repr__(self) -> str:
+        return f"ParallelCopier<threads={self.threads},threshold={self.threshold}>"
+
+    def is_parallel(self, nbytes: int) -> bool:
+        return self.threads > 1 and nbytes > self.threshold
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.threads - 1,
+                    thread_name_prefix="reccd-copy",
+                )
+            return self._executor
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    def copy_array(self, dst: ndarray, src: ndarray) -> None:
+        """
+        Like ``copyto(dst, src, casting="no")``, split along the first axis.
+        A broadcast ``src`` of another shape is copied serially.
+        """
+        if not self.is_parallel(dst.nbytes) or dst.ndim == 0 or dst.shape != src.shape:
+            copyto(dst, src, casting="no")
+            return
+
+        if dst.flags.c_contiguous and src.flags.c_contiguous:
+            # Split over all elements, e.g. for a leading dimension of 1.
+            dst = dst.reshape(-1)
+            src = src.reshape(-1)
+
+        ranges = _split(len(dst), self.threads)
+        executor = self._get_executor()
+        futures = [
+            executor.submit(copyto, dst[b:e], src[b:e], casting="no")
+            for b, e in ranges[1:]
+        ]
+        begin, end = ranges[0]
+        copyto(dst[begin:end], src[begin:end], casting="no")
+        for future in futures:
+            future.result()
+
+    def copy_buffer(self, dst: memoryview, src: BufferLike) -> None:
+        """
+        Like ``dst[:] = src`` for contiguous byte buffers of the same size.
+        """
+        if not self.is_parallel(dst.nbytes):
+            dst[:] = src
+            return
+        self.copy_array(frombuffer(dst, dtype=uint8), frombuffer(src, dtype=uint8))
+
+    def read(self, src: memoryview, writable=False) -> Union[bytes, bytearray]:
+        """
+        A copy of the buffer, which is a ``bytearray`` if it is writable
+        or was copied in parallel.
+        """
+        if not writable and not self.is_parallel(src.nbytes):
+            return bytes(src)
+        result = bytearray(src.nbytes)
+        self.copy_buffer(memoryview(result), src)
+        return result
+
+
+DEFAULT_PARALLEL_COPIER = ParallelCopier()
+
+
+class CopyTiming(NamedTuple):
+    size: int
+    serial_seconds: float
+    parallel_seconds: float
+
+
+def _best_seconds(func: Callable[[], None], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        begin = perf_counter()
+        func()
+        best = min(best, perf_counter() - begin)
+    return best
+
+
+def benchmark_parallel_copy(
+    min_size=DEFAULT_PARALLEL_COPY_MIN_SIZE,
+    max_size=DEFAULT_PARALLEL_COPY_MAX_SIZE,
+    repeat=DEFAULT_PARALLEL_COPY_REPEAT,
+    threads: Optional[int] = None,
+) -> List[CopyTiming]:
+    """
+    Time serial and parallel copies of power-of-two sizes on this host.
+    """
+    if min_size <= 0 or max_size < min_size:
+        raise ValueError("Invalid benchmark size range")
+
+    serial = ParallelCopier(threads=1)
+    parallel = ParallelCopier(threads=threads, threshold=0)
+    timings = list()
+    try:
+        size = min_size
+        while size <= max_size:
+            src = randint(0, 255, size=size, dtype=uint8)
+            dst = src.copy()  # Faulted in before the measurement.
+            timings.append(
+                CopyTiming(
+                    size=size,
+                    serial_seconds=_best_seconds(
+                        lambda: serial.copy_array(dst, src), repeat
+                    ),
+                    parallel_seconds=_best_seconds(
+                        lambda: parallel.copy_array(dst, src), repeat
+                    ),
+                )
+            )
+            size *= 2
+    finally:
+        parallel.shutdown()
+    return timings
+
+
+def crossover_size(timings: List[CopyTiming]) -> Optional[int]:
+    """
+    The smallest size from which the parallel copy is faster at every larger
+    size, or ``None`` if it never is.
+    """
+    result = None
+    for timing in sorted(timings, key=lambda t: t.size, reverse=True):
+        if timing.parallel_seconds >= timing.serial_seconds:
+            break
+        result = timing.size
+    return result
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+
+from bisect import insort
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, NamedTuple, Optional, Union
+
+from numpy import asarray, ndarray
+
+from reccd.memory.parallel_copy import DEFAULT_PARALLEL_COPIER, ParallelCopier
+from reccd.memory.shared_memory_queue import (
+    SharedMemoryFactory,
+    SharedMemoryQueue,
+    Written,
+    size_class,
+)
+from reccd.memory.shared_memory_utils import (
+    create_shared_memory,
+    destroy_shared_memory,
+    prepare_shared_memory,
+)
+from reccd.variables.rpc import DEFAULT_SM_ARENA_ALIGNMENT, DEFAULT_SM_ARENA_SIZE
+
+
+class SharedMemoryArenaStats(NamedTuple):
+    segments: int
+    capacity_bytes: int
+    allocated_bytes: int
+    allocations: int
+
+
+def align_up(value: int, alignment: int) -> int:
+    return (value + alignment - 1) // alignment * alignment
+
+
+class _ArenaSegment:
+    """
+    A segment with a first-fit free list of ``[offset, size]`` blocks,
+    sorted by offset and coalesced on release.
+    """
+
+    __slots__ = ("sm", "capacity", "free", "allocated")
+
+    def __init__(self, sm: SharedMemory, capacity: int):
+        self.sm = sm
+        self.capacity = capacity
+        self.free: List[List[int]] = [[0, capacity]]
+        self.allocated: Dict[int, int] = dict()
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.allocated
+
+    def allocate(self, size: int) -> int:
+        for index, block in enumerate(self.free):
+            offset, free_size = block
+            if free_size < size:
+                continue
+            if free_size == size:
+                del self.free[index]
+            else:
+                block[0] += size
+                block[1] -= size
+            self.allocated[offset] = size
+            return offset
+        return -1
+
+    def release(self, offset: int) -> None:
+        size = self.allocated.pop(offset)
+        insort(self.free, [offset, size])
+
+        # Coalesce with the neighbouring free blocks.
+        merged: List[List[int]] = list()
+        for block in self.free:
+            if merged and merged[-1][0] + merged[-1][1] == block[0]:
+                merged[-1][1] += block[1]
+            else:
+                merged.append(block)
+        self.free = merged
+
+
+class SharedMemoryArena:
+    """
+    Sub-allocates the contents of a session from a few large segments,
+    so that a request with many arguments uses one mapping instead of
+    one segment per argument.
+
+    Writes return the ``offset`` of the allocation in its segment.
+    The allocation is returned to the free list by ``release()``.
+    A segment is added when no free block fits, and extra segments are
+    destroyed as soon as they are empty again.
+    """
+
+    _segments: Dict[str, _ArenaSegment]
+
+    def __init__(
+        self,
+        arena_size=DEFAULT_SM_ARENA_SIZE,
+        alignment=DEFAULT_SM_ARENA_ALIGNMENT,
+        factory: SharedMemoryFactory = create_shared_memory,
+        prefault=False,
+        huge_pages=False,
+        copier: Optional[ParallelCopier] = None,
+    ):
+        if arena_size <= 0:
+            raise ValueError("The arena size must be greater than 0")
+        if alignment <= 0 or alignment & (alignment - 1):
+            raise ValueError("The alignment must be a power of two")
+
+        self.factory = factory
+        self.copier = copier if copier else DEFAULT_PARALLEL_COPIER
+        self.prefault = prefault
+        self.huge_pages = huge_pages
+        self._arena_size = arena_size
+        self._alignment = alignment
+        self._segments = dict()
+        self._primary = str()
+        self._unlinked: List[str] = list()
+        self._allocations = 0
+
+    @property
+    def arena_size(self) -> int:
+        return self._arena_size
+
+    @property
+    def stats(self) -> SharedMemoryArenaStats:
+        segments = self._segments.values()
+        return SharedMemoryArenaStats(
+            segments=len(self._segments),
+            capacity_bytes=sum(s.capacity for s in segments),
+            allocated_bytes=sum(sum(s.allocated.values()) for s in segments),
+            allocations=self._allocations,
+        )
+
+    def pop_unlinked(self) -> List[str]:
+        """
+        Names of the segments unlinked since the last call.
+        """
+        result = self._unlinked
+        self._unlinked = list()
+        return result
+
+    def find_working(self, key: str) -> SharedMemory:
+        return self._segments[key].sm
+
+    def _add_segment(self, size: int) -> _ArenaSegment:
+        capacity = max(self._arena_size, size_class(size, self._alignment))
+        sm = self.factory(capacity)
+        try:
+            prepare_shared_memory(sm, self.prefault, self.huge_pages)
+        except BaseException:
+            destroy_shared_memory(sm)
+            raise
+        segment = _ArenaSegment(sm, capacity)
+        self._segments[segment.sm.name] = segment
+        if not self._primary:
+            self._primary = segment.sm.name
+        return segment
+
+    def allocate(self, size: int) -> Written:
+        aligned_size = align_up(max(size, 1), self._alignment)
+        for segment in self._segments.values():
+            offset = segment.allocate(aligned_size)
+            if offset >= 0:
+                break
+        else:
+            segment = self._add_segment(aligned_size)
+            offset = segment.allocate(aligned_size)
+            assert offset >= 0
+
+        self._allocations += 1
+        return Written(segment.sm.name, offset, offset + size)
+
+    def release(self, written: Written) -> None:
+        segment = self._segments[written.sm_name]
+        segment.release(written.offset)
+        if segment.is_empty and written.sm_name != self._primary:
+            del self._segments[written.sm_name]
+            self._destroy(segment.sm)
+
+    def _destroy(self, sm: SharedMemory) -> None:
+        self._unlinked.append(sm.name)
+        destroy_shared_memory(sm)
+
+    def write(self, data: Union[bytes, memoryview]) -> Written:
+        if isinstance(data, memoryview):
+            if data.format != "B" or data.ndim != 1 or not data.c_contiguous:
+                return self.write_array(asarray(data))
+            size = data.nbytes
+        else:
+            assert isinstance(data, bytes)
+            size = len(data)
+
+        written = self.allocate(size)
+        sm = self._segments[written.sm_name].sm
+        assert sm.buf is not None
+        try:
+            self.copier.copy_buffer(sm.buf[written.offset : written.end], data)
+        except BaseException:
+            self.release(written)
+            raise
+        return written
+
+    def write_array(self, array: ndarray) -> Written:
+        """
+        Copy the array directly into the arena in C-contiguous order.
+        """
+        written = self.allocate(array.nbytes)
+        sm = self._segments[written.sm_name].sm
+        view = ndarray(
+            shape=array.shape,
+            dtype=array.dtype,
+            buffer=sm.buf,
+            offset=written.offset,
+        )
+        try:
+            self.copier.copy_array(view, array)
+        except BaseException:
+            self.release(written)
+            raise
+        finally:
+            del view
+        return written
+
+    def clear(self) -> None:
+        for segment in self._segments.values():
+            self._destroy(segment.sm)
+        self._segments.clear()
+        self._primary = str()
+
+
+SharedMemoryWriter = Union[SharedMemoryQueue, SharedMemoryArena]
+"""Where the packer writes the contents placed in shared memory."""
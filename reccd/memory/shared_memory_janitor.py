@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+
+import os
+from typing import List, NamedTuple
+
+from reccd.logging.logging import reccd_logger as logger
+from reccd.memory.shared_memory_name import parse_shared_memory_name
+from reccd.variables.rpc import SM_DIRECTORY
+
+
+def is_process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # The process exists, but belongs to another user.
+        return True
+    return True
+
+
+class OrphanedSegment(NamedTuple):
+    name: str
+    pid: int
+    session: str
+    size: int
+
+
+class SharedMemoryJanitor:
+    """
+    Unlinks the reccd segments whose owner process is dead.
+
+    Segments are taken away from the resource tracker, so the segments of a
+    crashed client or a killed daemon are otherwise kept until reboot.
+
+    Owners are looked up by PID, so every process that shares the directory
+    must also share the PID namespace of the janitor.
+    """
+
+    __slots__ = ("_directory", "_sweeps", "_unlinked", "_unlinked_bytes")
+
+    def __init__(self, directory=SM_DIRECTORY):
+        self._directory = directory
+        self._sweeps = 0
+        self._unlinked = 0
+        self._unlinked_bytes = 0
+
+    def __repr__(self) -> str:
+        return f"SharedMemoryJanitor<directory={self._directory!r}>"
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    @property
+    def sweeps(self) -> int:
+        return self._sweeps
+
+    @property
+    def unlinked(self) -> int:
+        return self._unlinked
+
+    @property
+    def unlinked_bytes(self) -> int:
+        return self._unlinked_bytes
+
+    def is_supported(self) -> bool:
+        return os.path.isdir(self._directory)
+
+    def find_orphans(self) -> List[OrphanedSegment]:
+        if not self.is_supported():
+            return list()
+
+        result = list()
+        with os.scandir(self._directory) as entries:
+            for entry in entries:
+                owner = parse_shared_memory_name(entry.name)
+                if owner is None or is_process_alive(owner.pid):
+                    continue
+                try:
+                    size = entry.stat().st_size
+                except FileNotFoundError:
+                    continue
+                result.append(OrphanedSegment(entry.name, *owner, size))
+        return result
+
+    def sweep(self, dry_run=False) -> List[OrphanedSegment]:
+        """
+        Returns the orphaned segments that were unlinked,
+        or that would be unlinked if ``dry_run`` is set.
+        """
+        orphans = self.find_orphans()
+        self._sweeps += 1
+        if dry_run:
+            return orphans
+
+        unlinked = list()
+        for orphan in orphans:
+            try:
+                os.unlink(os.path.join(self._directory, orphan.name))
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                logger.warning(f"Failed to unlink '{orphan.name}': {e}")
+                continue
+            unlinked.append(orphan)
+            self._unlinked += 1
+            self._unlinked_bytes += orphan.size
+        return unlinked
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+import os
+from secrets import token_hex
+from typing import Final, NamedTuple, Optional
+
+from reccd.variables.rpc import SM_NAME_PREFIX
+
+SESSION_TAG_LENGTH: Final[int] = 8
+"""Characters of the session kept in a name, which stays within the 31 of macOS."""
+
+
+class SharedMemoryOwner(NamedTuple):
+    pid: int
+    session: str
+
+
+def shared_memory_name(session: str = "", pid: Optional[int] = None) -> str:
+    """
+    A new segment name, e.g. ``reccd_1f2e_0123abcd_89abcdef``, which encodes
+    the process that is responsible for unlinking the segment.
+    """
+    if pid is None:
+        pid = os.getpid()
+    tag = session[:SESSION_TAG_LENGTH]
+    return f"{SM_NAME_PREFIX}{pid:x}_{tag}_{token_hex(4)}"
+
+
+def parse_shared_memory_name(name: str) -> Optional[SharedMemoryOwner]:
+    """
+    The owner encoded in the name, or ``None`` if reccd did not create it.
+    """
+    if not name.startswith(SM_NAME_PREFIX):
+        return None
+    fields = name[len(SM_NAME_PREFIX) :].split("_")
+    if len(fields) != 3:
+        return None
+    try:
+        pid = int(fields[0], 16)
+    except ValueError:
+        return None
+    if pid <= 0:
+        return None
+    return SharedMemoryOwner(pid, fields[1])
@@ -1,13 +1,29 @@
 # -*- coding: utf-8 -*-
 
-from collections import deque
+from collections import OrderedDict
 from multiprocessing.shared_memory import SharedMemory
-from typing import Deque, Dict, NamedTuple, Optional, Union
-
-from reccd.memory.shared_memory_utils import create_shared_memory, destroy_shared_memory
+from time import monotonic
+from typing import Callable, Dict, List, NamedTuple, Optional, Union
+
+from numpy import asarray, ndarray
+
+from reccd.memory.parallel_copy import DEFAULT_PARALLEL_COPIER, ParallelCopier
+from reccd.memory.shared_memory_utils import (
+    create_shared_memory,
+    destroy_shared_memory,
+    prepare_shared_memory,
+)
+from reccd.variables.rpc import (
+    DEFAULT_SM_POOL_IDLE_TIMEOUT,
+    DEFAULT_SM_POOL_MAX_BYTES,
+    DEFAULT_SM_POOL_MIN_SIZE,
+)
 
 SHARED_MEMORY_INFINITY_QUEUE = 0
 
+SharedMemoryFactory = Callable[[int], SharedMemory]
+"""Creates a segment of the given size, e.g. ``create_shared_memory``."""
+
 
 class Written(NamedTuple):
     sm_name: str
@@ -19,26 +35,180 @@ class Written(NamedTuple):
         return self.end - self.offset
 
 
+class SharedMemoryPoolStats(NamedTuple):
+    resident_bytes: int
+    waiting_bytes: int
+    working_bytes: int
+    hits: int
+    misses: int
+    evictions: int
+    allocations_per_second: float
+    adoptions: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def size_class(size: int, min_size=DEFAULT_SM_POOL_MIN_SIZE) -> int:
+    """
+    The smallest power of two that is at least ``size`` and ``min_size``.
+    """
+    size = max(size, min_size, 1)
+    return 1 << (size - 1).bit_length()
+
+
+class _Idle(NamedTuple):
+    sm: SharedMemory
+    size_class: int
+    since: float
+
+
 class SharedMemoryQueue:
-    def __init__(self, max_queue=SHARED_MEMORY_INFINITY_QUEUE):
+    """
+    Pool of shared memory segments in power-of-two size classes.
+
+    A rented segment comes from the smallest size class that fits and has an
+    idle segment, otherwise a new segment is created. Idle segments are
+    destroyed in least-recently-used order when the pool exceeds ``max_bytes``
+    or ``max_queue`` idle segments, and after ``idle_timeout`` seconds.
+
+    New segments are created by ``factory``, which can be replaced at any time.
+    With ``prefault``, their pages are faulted in when they are created, and
+    with ``huge_pages``, large segments ask for transparent huge pages.
+    """
+
+    _waiting: Dict[int, Dict[str, SharedMemory]]
+    _idle: "OrderedDict[str, _Idle]"
+    _working: Dict[str, SharedMemory]
+    _classes: Dict[str, int]
+
+    def __init__(
+        self,
+        max_queue=SHARED_MEMORY_INFINITY_QUEUE,
+        max_bytes=DEFAULT_SM_POOL_MAX_BYTES,
+        idle_timeout=DEFAULT_SM_POOL_IDLE_TIMEOUT,
+        min_size=DEFAULT_SM_POOL_MIN_SIZE,
+        factory: SharedMemoryFactory = create_shared_memory,
+        prefault=False,
+        huge_pages=False,
+        copier: Optional[ParallelCopier] = None,
+    ):
+        self.factory = factory
+        self.copier = copier if copier else DEFAULT_PARALLEL_COPIER
+        self.prefault = prefault
+        self.huge_pages = huge_pages
         self._max_queue = max_queue
-        self._waiting: Deque[SharedMemory] = deque()
-        self._working: Dict[str, SharedMemory] = dict()
+        self._max_bytes = max_bytes
+        self._idle_timeout = idle_timeout
+        self._min_size = min_size
+
+        # Idle segments by size class, and across classes in LRU order.
+        self._waiting = dict()
+        self._idle = OrderedDict()
+        self._working = dict()
+        self._classes = dict()
+        self._unlinked: List[str] = list()
+
+        self._waiting_bytes = 0
+        self._working_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._adoptions = 0
+        self._created_at = monotonic()
 
     @property
     def max_queue(self) -> int:
         return self._max_queue
 
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    @property
+    def idle_timeout(self) -> float:
+        return self._idle_timeout
+
+    @property
+    def stats(self) -> SharedMemoryPoolStats:
+        elapsed = monotonic() - self._created_at
+        return SharedMemoryPoolStats(
+            resident_bytes=self._waiting_bytes + self._working_bytes,
+            waiting_bytes=self._waiting_bytes,
+            working_bytes=self._working_bytes,
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            allocations_per_second=self._misses / elapsed if elapsed > 0 else 0.0,
+            adoptions=self._adoptions,
+        )
+
+    def _destroy(self, sm: SharedMemory) -> None:
+        self._classes.pop(sm.name, None)
+        self._unlinked.append(sm.name)
+        destroy_shared_memory(sm)
+
+    def pop_unlinked(self) -> List[str]:
+        """
+        Names of the segments unlinked since the last call.
+        """
+        result = self._unlinked
+        self._unlinked = list()
+        return result
+
+    def _pop_idle(self, name: str) -> SharedMemory:
+        idle = self._idle.pop(name)
+        bucket = self._waiting[idle.size_class]
+        del bucket[name]
+        if not bucket:
+            del self._waiting[idle.size_class]
+        self._waiting_bytes -= idle.size_class
+        return idle.sm
+
+    def _evict_oldest(self) -> None:
+        name = next(iter(self._idle))
+        self._destroy(self._pop_idle(name))
+        self._evictions += 1
+
+    def _is_over_capacity(self) -> bool:
+        if self._max_queue and len(self._idle) > self._max_queue:
+            return True
+        resident_bytes = self._waiting_bytes + self._working_bytes
+        return bool(self._max_bytes) and resident_bytes > self._max_bytes
+
+    def _evict_over_capacity(self) -> None:
+        while self._idle and self._is_over_capacity():
+            self._evict_oldest()
+
+    def trim_idle(self, now: Optional[float] = None) -> int:
+        """
+        Destroy the segments idle for longer than ``idle_timeout``.
+        """
+        if now is None:
+            now = monotonic()
+        count = 0
+        while self._idle:
+            oldest = next(iter(self._idle.values()))
+            if now - oldest.since < self._idle_timeout:
+                break
+            self._evict_oldest()
+            count += 1
+        return count
+
     def clear_waiting(self) -> None:
-        while self._waiting:
-            sm = self._waiting.popleft()
-            destroy_shared_memory(sm)
+        while self._idle:
+            name = next(iter(self._idle))
+            self._destroy(self._pop_idle(name))
         assert not self._waiting
+        assert self._waiting_bytes == 0
 
     def clear_working(self) -> None:
         while self._working:
             _, sm = self._working.popitem()
-            destroy_shared_memory(sm)
+            self._destroy(sm)
+        self._working_bytes = 0
         assert not self._working
 
     def clear(self) -> None:
@@ -46,7 +216,7 @@ class SharedMemoryQueue:
         self.clear_working()
 
     def size_waiting(self) -> int:
-        return len(self._waiting)
+        return len(self._idle)
 
     def size_working(self) -> int:
         return len(self._working)
@@ -54,34 +224,131 @@ class SharedMemoryQueue:
     def find_working(self, key: str) -> SharedMemory:
         return self._working[key]
 
-    def secure_worker(self, size: int) -> SharedMemory:
+    def _find_best_fit(self, cls: int) -> Optional[SharedMemory]:
+        candidates = [c for c in self._waiting.keys() if c >= cls]
+        if not candidates:
+            return None
+        bucket = self._waiting[min(candidates)]
+        # The most recently restored segment is the most likely to be resident.
+        name = next(reversed(bucket))
+        return self._pop_idle(name)
+
+    def _create(self, cls: int) -> SharedMemory:
+        sm = self.factory(cls)
         try:
-            sm = self._waiting.popleft()
-            if sm.size < size:
-                destroy_shared_memory(sm)
-                raise BufferError
-        except (IndexError, BufferError):
-            sm = create_shared_memory(size)
-        assert sm is not None
+            prepare_shared_memory(sm, self.prefault, self.huge_pages)
+        except BaseException:
+            destroy_shared_memory(sm)
+            raise
+        self._classes[sm.name] = cls
+        return sm
+
+    def _push_idle(self, sm: SharedMemory, cls: int) -> None:
+        self._waiting.setdefault(cls, dict())[sm.name] = sm
+        self._idle[sm.name] = _Idle(sm, cls, monotonic())
+        self._waiting_bytes += cls
+
+    def warm_up(self, count: int, size: int) -> int:
+        """
+        Create idle segments so that ``count`` segments of ``size`` bytes
+        can be rented without creating one. Returns the number created.
+        """
+        if count <= 0 or size <= 0:
+            return 0
+
+        cls = size_class(size, self._min_size)
+        available = sum(len(b) for c, b in self._waiting.items() if c >= cls)
+        created = max(count - available, 0)
+        for _ in range(created):
+            self._push_idle(self._create(cls), cls)
+        self._evict_over_capacity()
+        return created
+
+    def secure_worker(self, size: int) -> SharedMemory:
+        self.trim_idle()
+
+        cls = size_class(size, self._min_size)
+        sm = self._find_best_fit(cls)
+        if sm is not None:
+            self._hits += 1
+        else:
+            self._misses += 1
+            sm = self._create(cls)
+
         self._working[sm.name] = sm
+        self._working_bytes += self._classes[sm.name]
+        self._evict_over_capacity()
+        return sm
+
+    def adopt(self, name: str) -> SharedMemory:
+        """
+        Take over a segment created by another process as a working segment.
+        Like a rented segment, it joins the pool when it is restored.
+        """
+        sm = SharedMemory(name=name)
+        # The largest size class that the segment can serve.
+        cls = 1 << (sm.size.bit_length() - 1)
+        self._classes[sm.name] = cls
+        self._working[sm.name] = sm
+        self._working_bytes += cls
+        self._adoptions += 1
+        self._evict_over_capacity()
         return sm
 
     def write(self, data: Union[bytes, memoryview], offset=0) -> Written:
         if isinstance(data, memoryview):
-            return self.write(data.tobytes(), offset)
+            if data.format != "B" or data.ndim != 1 or not data.c_contiguous:
+                return self.write_array(asarray(data), offset)
+            size = data.nbytes
+        else:
+            assert isinstance(data, bytes)
+            size = len(data)
 
-        assert isinstance(data, bytes)
-        end = offset + len(data)
+        end = offset + size
         sm = self.secure_worker(end)
-        sm.buf[offset:end] = data
+        assert sm.buf is not None
+        try:
+            self.copier.copy_buffer(sm.buf[offset:end], data)
+        except BaseException:
+            self.restore(sm.name)
+            raise
         return Written(sm.name, offset, end)
 
+    def write_array(self, array: ndarray, offset=0) -> Written:
+        """
+        Copy the array directly into the segment in C-contiguous order.
+        """
+        end = offset + array.nbytes
+        sm = self.secure_worker(end)
+        view = ndarray(
+            shape=array.shape,
+            dtype=array.dtype,
+            buffer=sm.buf,
+            offset=offset,
+        )
+        try:
+            self.copier.copy_array(view, array)
+        except BaseException:
+            self.restore(sm.name)
+            raise
+        finally:
+            del view
+        return Written(sm.name, offset, end)
+
+    def release(self, written: Written) -> None:
+        self.restore(written.sm_name)
+
     def restore(self, name: str) -> None:
-        self._waiting.append(self._working.pop(name))
+        sm = self._working.pop(name)
+        cls = self._classes[name]
+        self._working_bytes -= cls
+        self._push_idle(sm, cls)
+        self._evict_over_capacity()
 
     @staticmethod
     def read(name: str, offset=0, size: Optional[int] = None) -> bytes:
         sm = SharedMemory(name=name)
+        assert sm.buf is not None
         if size is None:
             return bytes(sm.buf[offset:])
         else:
@@ -109,19 +376,39 @@ class SharedMemoryQueue:
 
     class MultiRentalManager:
 
-        __slots__ = ("_sms", "_smq")
+        __slots__ = ("_sms", "_smq", "_released")
 
         def __init__(self, sms: Dict[str, SharedMemory], smq: "SharedMemoryQueue"):
             self._sms = sms
             self._smq = smq
+            self._released = False
 
-        def __enter__(self) -> Dict[str, SharedMemory]:
+        @property
+        def sms(self) -> Dict[str, SharedMemory]:
             return self._sms
 
-        def __exit__(self, exc_type, exc_value, tb):
+        @property
+        def released(self) -> bool:
+            return self._released
+
+        def adopt(self, name: str) -> SharedMemory:
+            sm = self._smq.adopt(name)
+            self._sms[sm.name] = sm
+            return sm
+
+        def release(self) -> None:
+            if self._released:
+                return
+            self._released = True
             for sm in self._sms.values():
                 self._smq.restore(sm.name)
 
+        def __enter__(self) -> Dict[str, SharedMemory]:
+            return self._sms
+
+        def __exit__(self, exc_type, exc_value, tb):
+            self.release()
+
     def multi_rent(self, rental_size: int, buffer_byte: int) -> MultiRentalManager:
         if rental_size <= 0 or buffer_byte <= 0:
             return self.MultiRentalManager(dict(), self)
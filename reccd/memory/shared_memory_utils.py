@@ -1,7 +1,18 @@
 # -*- coding: utf-8 -*-
 
+import mmap
 import os
 from multiprocessing.shared_memory import SharedMemory
+from threading import RLock
+from time import monotonic
+from typing import Dict, NamedTuple, Optional
+
+from numpy import frombuffer, uint8
+
+from reccd.logging.logging import reccd_logger as logger
+from reccd.memory.memfd import MemfdReceiver, is_memfd_name
+from reccd.memory.shared_memory_name import shared_memory_name
+from reccd.variables.rpc import DEFAULT_SM_CACHE_IDLE_TIMEOUT, HUGE_PAGE_SIZE
 
 
 def _unregister_shared_memory_tracker(sm: SharedMemory) -> None:
@@ -12,6 +23,13 @@ def _unregister_shared_memory_tracker(sm: SharedMemory) -> None:
         unregister(getattr(sm, "_name"), "shared_memory")
 
 
+def detach_shared_memory(sm: SharedMemory) -> None:
+    try:
+        sm.close()
+    except BufferError:
+        logger.warning(f"Shared memory '{sm.name}' is still referenced")
+
+
 class _AttachSharedMemoryContext:
     def __init__(self, name: str):
         self.name = name
@@ -21,7 +39,9 @@ class _AttachSharedMemoryContext:
         return self.sm
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.sm.close()
+        # If a view on the shared memory is still referenced (e.g. by a route),
+        # the mapping is released when the last view is garbage collected.
+        detach_shared_memory(self.sm)
         _unregister_shared_memory_tracker(self.sm)
 
 
@@ -29,10 +49,241 @@ def attach_shared_memory(name: str):
     return _AttachSharedMemoryContext(name)
 
 
-def create_shared_memory(buffer_size: int) -> SharedMemory:
-    return SharedMemory(create=True, size=buffer_size)
+class AttachmentCacheStats(NamedTuple):
+    hits: int
+    remaps: int
+    evictions: int
+    sessions: int
+    mappings: int
+    mapped_bytes: int
+
+
+class _SessionAttachments:
+
+    __slots__ = ("sms", "last_used", "users")
+
+    def __init__(self):
+        self.sms: Dict[str, SharedMemory] = dict()
+        self.last_used = monotonic()
+        # Attachments held by calls in progress, which are never idle.
+        self.users = 0
+
+
+class SharedMemoryAttachmentCache:
+    """
+    Keeps the shared memory of clients mapped across requests.
+
+    Mappings are keyed by session and segment name, and are evicted when the
+    client reports an unlinked segment or when the session goes idle.
+    Each ``attach`` holds the session until the matching ``release``, so that
+    a long call does not lose its mappings to ``evict_idle``.
+
+    Names of memfd segments are opened from the descriptors of ``memfd``.
+
+    Synchronous routes attach segments from the route threads of the daemon,
+    so all methods hold a lock.
+    """
+
+    _sessions: Dict[str, _SessionAttachments]
+    _memfd: Optional[MemfdReceiver]
+
+    def __init__(
+        self,
+        idle_timeout: float = DEFAULT_SM_CACHE_IDLE_TIMEOUT,
+        memfd: Optional[MemfdReceiver] = None,
+    ):
+        self._idle_timeout = idle_timeout
+        self._memfd = memfd
+        self._sessions = dict()
+        self._hits = 0
+        self._remaps = 0
+        self._evictions = 0
+        self._lock = RLock()
+
+    @property
+    def idle_timeout(self) -> float:
+        return self._idle_timeout
+
+    @property
+    def stats(self) -> AttachmentCacheStats:
+        with self._lock:
+            return AttachmentCacheStats(
+                hits=self._hits,
+                remaps=self._remaps,
+                evictions=self._evictions,
+                sessions=len(self._sessions),
+                mappings=sum(len(x.sms) for x in self._sessions.values()),
+                mapped_bytes=sum(self.session_bytes().values()),
+            )
+
+    def session_bytes(self) -> Dict[str, int]:
+        """
+        Bytes of client shared memory that each session keeps mapped here.
+        """
+        with self._lock:
+            return {
+                session: sum(sm.size for sm in attachments.sms.values())
+                for session, attachments in self._sessions.items()
+            }
+
+    def attach(self, session: str, name: str) -> SharedMemory:
+        with self._lock:
+            return self._attach(session, name)
+
+    def _attach(self, session: str, name: str) -> SharedMemory:
+        attachments = self._sessions.get(session)
+        if attachments is None:
+            attachments = _SessionAttachments()
+            self._sessions[session] = attachments
+        attachments.last_used = monotonic()
+
+        sm = attachments.sms.get(name)
+        if sm is not None:
+            self._hits += 1
+        else:
+            sm = self._open(name)
+            attachments.sms[name] = sm
+            self._remaps += 1
+        attachments.users += 1
+        return sm
+
+    def release(self, session: str) -> None:
+        """
+        Release an attachment of the session after the call that held it.
+        """
+        with self._lock:
+            attachments = self._sessions.get(session)
+            if attachments is None:
+                return
+            attachments.users = max(attachments.users - 1, 0)
+            attachments.last_used = monotonic()
+
+    def _open(self, name: str) -> SharedMemory:
+        if is_memfd_name(name):
+            if self._memfd is None:
+                raise FileNotFoundError(f"The memfd side channel is closed: {name}")
+            return self._memfd.open_segment(name)  # type: ignore[return-value]
+
+        sm = SharedMemory(name=name)
+        _unregister_shared_memory_tracker(sm)
+        return sm
+
+    def evict(self, session: str, name: str) -> bool:
+        with self._lock:
+            attachments = self._sessions.get(session)
+            if attachments is None:
+                return False
+            sm = attachments.sms.pop(name, None)
+            if sm is None:
+                return False
+            detach_shared_memory(sm)
+            self._evictions += 1
+            return True
+
+    def evict_session(self, session: str) -> int:
+        with self._lock:
+            attachments = self._sessions.pop(session, None)
+            if attachments is None:
+                return 0
+            for sm in attachments.sms.values():
+                detach_shared_memory(sm)
+            count = len(attachments.sms)
+            self._evictions += count
+            return count
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        if now is None:
+            now = monotonic()
+        with self._lock:
+            expired = [
+                session
+                for session, attachments in self._sessions.items()
+                if attachments.users == 0
+                and now - attachments.last_used >= self._idle_timeout
+            ]
+            return sum(self.evict_session(session) for session in expired)
+
+    def clear(self) -> None:
+        with self._lock:
+            for session in list(self._sessions.keys()):
+                self.evict_session(session)
+
+
+def create_shared_memory(
+    buffer_size: int,
+    session: str = "",
+    pid: Optional[int] = None,
+) -> SharedMemory:
+    """
+    The name of the segment encodes the owner, i.e. ``pid`` or this process,
+    so that the janitor can unlink it if the owner dies.
+    """
+    while True:
+        name = shared_memory_name(session, pid)
+        try:
+            return SharedMemory(name=name, create=True, size=buffer_size)
+        except FileExistsError:
+            continue
+
+
+def advise_huge_pages(sm: SharedMemory) -> bool:
+    """
+    Ask for transparent huge pages, which the kernel honors for shared memory
+    only if ``shmem_enabled`` is ``advise`` or ``within_size``.
+    """
+    advice = getattr(mmap, "MADV_HUGEPAGE", None)
+    memory_map = getattr(sm, "_mmap", None)
+    if advice is None or memory_map is None or sm.size < HUGE_PAGE_SIZE:
+        return False
+    try:
+        memory_map.madvise(advice)
+    except OSError:
+        return False
+    return True
+
+
+def prefault_shared_memory(sm: SharedMemory) -> None:
+    """
+    Write to every page of a new segment, so that the first request does not
+    pay the page faults. The contents of a new segment are zero anyway.
+    """
+    assert sm.buf is not None
+    pages = frombuffer(sm.buf, dtype=uint8)
+    pages[:: mmap.PAGESIZE] = 0
+    del pages
+
+
+def prepare_shared_memory(sm: SharedMemory, prefault=False, huge_pages=False) -> None:
+    # Huge pages must be advised before the pages are faulted in.
+    if huge_pages:
+        advise_huge_pages(sm)
+    if prefault:
+        prefault_shared_memory(sm)
+
+
+def hand_over_shared_memory(sm: SharedMemory) -> None:
+    """
+    Detach a created segment without unlinking it, so that it outlives this
+    process. The receiver becomes responsible for unlinking it.
+    """
+    _unregister_shared_memory_tracker(sm)
+    detach_shared_memory(sm)
 
 
 def destroy_shared_memory(sm: SharedMemory) -> None:
-    sm.close()
+    # If an ndarray view (e.g. a zero-copy response) is still alive,
+    # the mapping is released when the last view is garbage collected.
+    detach_shared_memory(sm)
     sm.unlink()
+
+
+def unlink_shared_memory(name: str) -> bool:
+    """
+    Unlink a handed over segment whose receiver never took it over.
+    """
+    try:
+        sm = SharedMemory(name=name)
+    except FileNotFoundError:
+        return False
+    destroy_shared_memory(sm)
+    return True
@@ -5,6 +5,8 @@ from multiprocessing.shared_memory import SharedMemory
 from typing import NamedTuple, Optional
 from uuid import uuid4
 
+from reccd.logging.logging import reccd_logger as logger
+from reccd.memory.memfd import MemfdReceiver, MemfdSender
 from reccd.memory.shared_memory_utils import (
     attach_shared_memory,
     create_shared_memory,
@@ -29,8 +31,15 @@ def register_shared_memory(disable=False):
     else:
         test_sm_data = uuid4().hex
         test_sm_pass_bytes = bytes.fromhex(test_sm_data)
-        sm = create_shared_memory(len(test_sm_pass_bytes))
-        test_sm_name = sm.name
+        try:
+            sm = create_shared_memory(len(test_sm_pass_bytes))
+            test_sm_name = sm.name
+        except OSError as e:
+            # e.g. a container without a usable /dev/shm
+            logger.warning(f"Failed to create the test shared memory: {e}")
+            test_sm_data = str()
+            sm = None
+            test_sm_name = str()
 
     try:
         if sm:
@@ -49,3 +58,44 @@ def validate_shared_memory(name: str, data: str) -> bool:
         except:  # noqa
             pass
     return False
+
+
+@contextmanager
+def register_memfd(sender: Optional[MemfdSender] = None):
+    """
+    A test segment passed over the memfd side channel, which the daemon
+    checks independently of the POSIX segment of ``register_shared_memory``.
+    """
+    if sender is None:
+        yield SharedMemoryTestInfo(str(), str())
+        return
+
+    test_sm_data = uuid4().hex
+    test_sm_pass_bytes = bytes.fromhex(test_sm_data)
+    try:
+        sm = sender.create(len(test_sm_pass_bytes))
+    except OSError as e:
+        logger.warning(f"Failed to send the test memfd segment: {e}")
+        yield SharedMemoryTestInfo(str(), str())
+        return
+
+    try:
+        sm.buf[:] = test_sm_pass_bytes
+        yield SharedMemoryTestInfo(sm.name, test_sm_data)
+    finally:
+        sm.close()
+
+
+def validate_memfd(receiver: Optional[MemfdReceiver], name: str, data: str) -> bool:
+    if receiver is None or not receiver.is_open() or not name or not data:
+        return False
+    try:
+        sm = receiver.open_segment(name)
+        try:
+            return bytes(sm.buf[:]) == bytes.fromhex(data)
+        finally:
+            sm.close()
+    except:  # noqa
+        return False
+    finally:
+        receiver.forget(name)
@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 
+from hashlib import sha256
 from inspect import iscoroutinefunction
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
 
 from reccd.module.errors import (
     ModuleCallbackCoroutineError,
@@ -13,22 +14,37 @@ from reccd.module.errors import (
 )
 from reccd.module.mixin._module_base import ModuleBase
 from reccd.route.dynamic_resource import DynamicResource
+from reccd.route.route_index import RouteIndex
+from reccd.route.route_options import RouteOptions
+from reccd.route.route_plan import RoutePlan
 from reccd.variables.module import NAME_ON_ROUTES
 
 RouteMethod = str
 RoutePath = str
 RouteCallable = Any
-RouteTuple = Tuple[RouteMethod, RoutePath, Any]
+RouteOptionsMapping = Mapping[str, Any]
+RouteTuple = Union[
+    Tuple[RouteMethod, RoutePath, Any],
+    Tuple[RouteMethod, RoutePath, Any, RouteOptionsMapping],
+]
 
 
 class Route:
-    def __init__(self, method: str, path: str, func):
+    def __init__(
+        self,
+        method: str,
+        path: str,
+        func,
+        options: Optional[RouteOptionsMapping] = None,
+    ):
         normalize_method = str(method).strip().upper()
         normalize_path = str(path).strip()
 
         self.method = normalize_method
         self.path = normalize_path
         self.func = func
+        self.options = RouteOptions.from_mapping(options)
+        self.plan = RoutePlan(func)
         self.dynamic_resource = DynamicResource(normalize_path)
 
     def match(self, method: str, path: str) -> Optional[Dict[str, str]]:
@@ -44,16 +60,35 @@ class Route:
 class ModuleRouter(ModuleBase):
 
     _routes: List[Route] = list()
+    _route_index: RouteIndex
+    _route_epoch: str = str()
 
     def __new__(cls, *args, **kwargs):
         instance = super().__new__(cls)
         instance._routes = list()
+        instance._route_index = RouteIndex()
+        instance._route_epoch = str()
         return instance
 
     @property
     def count_routes(self):
         return len(self._routes)
 
+    @property
+    def routes(self) -> List[Route]:
+        """
+        The index of each route is its route ID.
+        """
+        return self._routes
+
+    @property
+    def route_epoch(self) -> str:
+        """
+        Digest of the methods and paths of the routes, in route ID order.
+        A route ID is only valid with the epoch of the table it came from.
+        """
+        return self._route_epoch
+
     @property
     def has_on_routes(self) -> bool:
         return self.has(NAME_ON_ROUTES)
@@ -92,6 +127,23 @@ class ModuleRouter(ModuleBase):
                 f"The 3rd in element #{index} must be a callable",
             )
 
+        if len(item) >= 4:
+            options = item[3]
+            if not isinstance(options, Mapping):
+                raise ModuleCallbackInvalidReturnValueError(
+                    self.module_name,
+                    NAME_ON_ROUTES,
+                    f"The 4th in element #{index} must be of type `Mapping`",
+                )
+            try:
+                RouteOptions.from_mapping(options)
+            except (TypeError, ValueError) as e:
+                raise ModuleCallbackInvalidReturnValueError(
+                    self.module_name,
+                    NAME_ON_ROUTES,
+                    f"The 4th in element #{index} is invalid route options: {e}",
+                )
+
     def _validate_routes_result(self, result: Any) -> None:
         if result is None:
             raise ModuleCallbackInvalidReturnValueError(
@@ -130,15 +182,27 @@ class ModuleRouter(ModuleBase):
 
     def update_routes(self) -> None:
         assert isinstance(self._routes, list)
-        for method, path, route in self._on_routes():
-            self._routes.append(Route(method, path, route))
-
-    def get_route(self, method: str, path: str) -> Tuple[Any, Dict[str, str]]:
+        for item in self._on_routes():
+            method, path, route = item[0], item[1], item[2]
+            options = item[3] if len(item) >= 4 else None
+            self._add_route(Route(method, path, route, options))
+
+    def _add_route(self, route: Route) -> None:
+        index = self._route_index.add(route.method, route.dynamic_resource)
+        assert index == len(self._routes)
+        self._routes.append(route)
+        entry = f"{self._route_epoch} {route.method} {route.path}"
+        self._route_epoch = sha256(entry.encode()).hexdigest()[:16]
+
+    def match_route(self, method: str, path: str) -> Tuple[Route, Dict[str, str]]:
         assert isinstance(self._routes, list)
-        for route in self._routes:
-            match_info = route.match(method, path)
-            if match_info is not None:
-                return route.func, match_info
+        # Normalize once, instead of once per route.
+        normalize_method = str(method).strip().upper()
+        normalize_path = str(path).strip()
+        found = self._route_index.find(normalize_method, normalize_path)
+        if found is not None:
+            index, match_info = found
+            return self._routes[index], match_info
         raise ModuleCallbackNotFoundRouteError(
             self.module_name,
             NAME_ON_ROUTES,
@@ -146,6 +210,20 @@ class ModuleRouter(ModuleBase):
             path,
         )
 
+    def get_route_by_id(self, route_id: int) -> Route:
+        if 0 <= route_id < len(self._routes):
+            return self._routes[route_id]
+        raise ModuleCallbackNotFoundRouteError(
+            self.module_name,
+            NAME_ON_ROUTES,
+            "<route id>",
+            str(route_id),
+        )
+
+    def get_route(self, method: str, path: str) -> Tuple[Any, Dict[str, str]]:
+        route, match_info = self.match_route(method, path)
+        return route.func, match_info
+
     async def route(self, method: str, path: str, *args, **kwargs) -> Any:
         callback, _ = self.get_route(method, path)
         assert callback is not None
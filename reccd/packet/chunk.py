@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+
+from typing import Dict, Iterable, Iterator, Mapping, Union
+
+from numpy import ascontiguousarray, empty, ndarray, uint8
+
+from reccd.packet.content_inspector import has_array
+from reccd.proto.daemon.daemon_api_pb2 import Content, ContentChunk
+
+ContentKey = Union[int, str]
+"""Index of a positional content, or key of a keyword content."""
+
+ChunkBuffer = Union[ndarray, bytearray, bytes, memoryview]
+"""Bytes of a chunked content. Array contents are kept as ``uint8`` ndarray."""
+
+ChunkBuffers = Dict[ContentKey, ChunkBuffer]
+
+
+def chunk_key(chunk: ContentChunk) -> ContentKey:
+    target = chunk.WhichOneof("target")
+    if target == "arg":
+        return chunk.arg
+    elif target == "kwarg":
+        return chunk.kwarg
+    raise ValueError("The target of the chunk is not set")
+
+
+def chunk_buffer_view(buffer: ChunkBuffer) -> memoryview:
+    if isinstance(buffer, ndarray):
+        return buffer.data
+    return memoryview(buffer)
+
+
+def array_to_chunk_buffer(array: ndarray) -> memoryview:
+    # The same byte order as `ndarray_to_bytes()`
+    return chunk_buffer_view(ascontiguousarray(array)).cast("B")
+
+
+def iter_content_chunks(
+    buffers: Mapping[ContentKey, ChunkBuffer],
+    chunk_size: int,
+) -> Iterator[ContentChunk]:
+    if chunk_size <= 0:
+        raise ValueError("The chunk size must be greater than 0")
+
+    for key, buffer in buffers.items():
+        view = chunk_buffer_view(buffer)
+        target = dict(arg=key) if isinstance(key, int) else dict(kwarg=key)
+        for offset in range(0, len(view), chunk_size):
+            data = bytes(view[offset : offset + chunk_size])
+            yield ContentChunk(offset=offset, data=data, **target)
+
+
+class ChunkAssembler:
+    """
+    Writes the received chunks straight into buffers preallocated from the
+    contents of the header. Array contents get an ``uint8`` ndarray,
+    which the unpacker uses as the buffer of the result array.
+
+    The chunks of each content must arrive in order, so that a duplicate or
+    overlapping chunk cannot leave a hole in the buffer.
+    """
+
+    _buffers: ChunkBuffers
+    _views: Dict[ContentKey, memoryview]
+    _offsets: Dict[ContentKey, int]
+
+    def __init__(self, args: Iterable[Content], kwargs: Mapping[str, Content]):
+        self._buffers = dict()
+        self._views = dict()
+        self._offsets = dict()
+
+        for index, content in enumerate(args):
+            self._preallocate(index, content)
+        for key, content in kwargs.items():
+            self._preallocate(key, content)
+
+    def _preallocate(self, key: ContentKey, content: Content) -> None:
+        if not content.chunked:
+            return
+
+        buffer: ChunkBuffer
+        if has_array(content):
+            buffer = empty(content.size, dtype=uint8)
+        else:
+            buffer = bytearray(content.size)
+
+        self._buffers[key] = buffer
+        self._views[key] = chunk_buffer_view(buffer)
+        self._offsets[key] = 0
+
+    @property
+    def buffers(self) -> ChunkBuffers:
+        return self._buffers
+
+    @property
+    def complete(self) -> bool:
+        return all(self._offsets[k] == len(v) for k, v in self._views.items())
+
+    def write(self, chunk: ContentChunk) -> None:
+        key = chunk_key(chunk)
+        view = self._views.get(key)
+        if view is None:
+            raise KeyError(f"Not a chunked content: {key}")
+
+        begin = chunk.offset
+        end = begin + len(chunk.data)
+        if begin != self._offsets[key]:
+            raise ValueError(f"The chunk [{begin}:{end}] is out of order: {key}")
+        if end > len(view):
+            raise ValueError(f"The chunk [{begin}:{end}] is out of range: {key}")
+
+        view[begin:end] = chunk.data
+        self._offsets[key] = end
+
+    def validate(self) -> None:
+        if not self.complete:
+            incomplete = [
+                k for k, v in self._views.items() if self._offsets[k] != len(v)
+            ]
+            raise ValueError(f"Incomplete chunked contents: {incomplete}")
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+import os
+from asyncio import get_running_loop
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import chain, islice
+from threading import Lock
+from typing import Any, Callable, Final, Iterator, Mapping, Optional, TypeVar
+
+from numpy import ndarray
+
+from reccd.variables.rpc import DEFAULT_CODEC_THREADS, DEFAULT_CODEC_THRESHOLD
+
+_T = TypeVar("_T")
+
+PAYLOAD_SIZE_DEPTH: Final[int] = 4
+PAYLOAD_SIZE_SAMPLE: Final[int] = 64
+SCALAR_SIZE: Final[int] = 8
+
+
+def payload_size(obj: Any, depth=PAYLOAD_SIZE_DEPTH) -> int:
+    """
+    A cheap estimate of the bytes the codec handles for the object.
+
+    Only the first items of a large collection are visited, and the rest is
+    assumed to be alike, so the estimate does not cost a pass over the data.
+    """
+    if isinstance(obj, ndarray):
+        return obj.nbytes
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return memoryview(obj).nbytes
+    if isinstance(obj, str):
+        return len(obj)
+    if isinstance(obj, (bool, int, float)) or obj is None:
+        return SCALAR_SIZE
+    if depth <= 0:
+        return 0
+
+    items: Iterator[Any]
+    if isinstance(obj, Mapping):
+        items = chain.from_iterable(obj.items())
+        length = 2 * len(obj)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        items = iter(obj)
+        length = len(obj)
+    elif hasattr(obj, "__dict__"):
+        items = iter(vars(obj).values())
+        length = len(vars(obj))
+    else:
+        return 0
+
+    sample = list(islice(items, PAYLOAD_SIZE_SAMPLE))
+    if not sample:
+        return 0
+    size = sum(payload_size(x, depth - 1) for x in sample)
+    return size * length // len(sample)
+
+
+class CodecExecutor:
+    """
+    Encodes and decodes payloads larger than ``threshold`` bytes on a thread
+    pool, so that one large request does not stall the event loop.
+
+    zlib, numpy copies and most of the codecs release the GIL. Small payloads
+    stay on the event loop, where a thread hand-off would cost more than the
+    codec. By default, there are as many threads as CPUs up to
+    ``DEFAULT_CODEC_THREADS``, and 0 threads disable the offloading.
+    """
+
+    _executor: Optional[ThreadPoolExecutor]
+
+    def __init__(
+        self,
+        threads: Optional[int] = None,
+        threshold=DEFAULT_CODEC_THRESHOLD,
+    ):
+        if threads is None:
+            threads = min(DEFAULT_CODEC_THREADS, os.cpu_count() or 1)
+        self.threads = max(threads, 0)
+        self.threshold = threshold
+        self.offloaded = 0
+        self._executor = None
+        self._lock = Lock()
+
+    def __repr__(self) -> str:
+        return f"CodecExecutor<threads={self.threads},threshold={self.threshold}>"
+
+    def is_offloaded(self, nbytes: int) -> bool:
+        return self.threads > 0 and nbytes > self.threshold
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.threads,
+                    thread_name_prefix="reccd-codec",
+                )
+            return self._executor
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    async def run(self, nbytes: int, func: Callable[..., _T], *args: Any) -> _T:
+        """
+        Call ``func`` on the pool if ``nbytes`` is large, otherwise in place.
+        """
+        if not self.is_offloaded(nbytes):
+            return func(*args)
+        self.offloaded += 1
+        loop = get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), partial(func, *args))
+
+
+DEFAULT_CODEC_EXECUTOR = CodecExecutor()
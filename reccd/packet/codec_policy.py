@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+
+import zlib
+from typing import Any, Dict, Final, List, NamedTuple, Optional, Sequence
+
+from numpy import ndarray
+from type_serialize import ByteCoding, deserialize, serialize
+from type_serialize.byte.byte_coder import bytes_to_object, object_to_bytes
+from type_serialize.driver.numpy import NumpyProto
+from type_serialize.variables import COMPRESS_LEVEL_FAST
+
+from reccd.packet.oob import extract_arrays, pickle_object, restore_arrays
+from reccd.proto.daemon.daemon_api_pb2 import Coding, Content
+from reccd.variables.rpc import (
+    DEFAULT_COMPRESS_MAX_RATIO,
+    DEFAULT_COMPRESS_SAMPLE_SIZE,
+    DEFAULT_COMPRESS_THRESHOLD,
+)
+
+ZLIB_TO_RAW_CODINGS: Final[Dict[ByteCoding, ByteCoding]] = {
+    ByteCoding.JsonZlib: ByteCoding.Json,
+    ByteCoding.PyjsonZlib: ByteCoding.Pyjson,
+    ByteCoding.OrjsonZlib: ByteCoding.Orjson,
+    ByteCoding.MsgpackZlib: ByteCoding.Msgpack,
+    ByteCoding.YamlZlib: ByteCoding.Yaml,
+}
+
+
+class EncodedObject(NamedTuple):
+    coding: ByteCoding
+    data: bytes
+
+
+def content_coding(content: Content, default: ByteCoding) -> ByteCoding:
+    if content.HasField("coding"):
+        return ByteCoding(content.coding)
+    return default
+
+
+class CodecPolicy:
+    """
+    Chooses per payload whether a zlib coding is worth its compression.
+
+    Objects are encoded without compression first. They are compressed at
+    ``level`` only if they are larger than ``compress_threshold`` and a
+    sampled prefix compresses to at most ``max_ratio`` of its size.
+    Local transports (Unix domain sockets, shared memory) never compress.
+    Codings without a zlib variant are encoded as-is.
+    """
+
+    __slots__ = (
+        "compress_threshold",
+        "sample_size",
+        "max_ratio",
+        "level",
+    )
+
+    def __init__(
+        self,
+        compress_threshold=DEFAULT_COMPRESS_THRESHOLD,
+        sample_size=DEFAULT_COMPRESS_SAMPLE_SIZE,
+        max_ratio=DEFAULT_COMPRESS_MAX_RATIO,
+        level=COMPRESS_LEVEL_FAST,
+    ):
+        self.compress_threshold = compress_threshold
+        self.sample_size = sample_size
+        self.max_ratio = max_ratio
+        self.level = level
+
+    def __repr__(self) -> str:
+        items = ",".join(f"{k}={getattr(self, k)}" for k in self.__slots__)
+        return f"CodecPolicy<{items}>"
+
+    def is_compressible(self, data: bytes) -> bool:
+        if len(data) < self.compress_threshold:
+            return False
+        sample = memoryview(data)[: self.sample_size]
+        compressed = zlib.compress(sample, COMPRESS_LEVEL_FAST)
+        return len(compressed) <= len(sample) * self.max_ratio
+
+    def encode(
+        self,
+        obj: Any,
+        coding: ByteCoding,
+        local=False,
+        compress: Optional[bool] = None,
+    ) -> EncodedObject:
+        """
+        If ``compress`` is not ``None``, it replaces the adaptive decision.
+        """
+        return self.encode_serialized(serialize(obj), coding, local, compress)
+
+    def encode_serialized(
+        self,
+        tree: Any,
+        coding: ByteCoding,
+        local=False,
+        compress: Optional[bool] = None,
+    ) -> EncodedObject:
+        """
+        Same as ``encode()`` for an object already passed through ``serialize()``.
+        """
+        raw_coding = ZLIB_TO_RAW_CODINGS.get(coding)
+        if raw_coding is None:
+            data = object_to_bytes(coding=coding, data=tree, level=self.level)
+            return EncodedObject(coding, data)
+
+        raw = object_to_bytes(coding=raw_coding, data=tree)
+        if compress is None:
+            compress = not local and self.is_compressible(raw)
+
+        if compress:
+            return EncodedObject(coding, zlib.compress(raw, self.level))
+        else:
+            return EncodedObject(raw_coding, raw)
+
+
+DEFAULT_CODEC_POLICY = CodecPolicy()
+
+
+class EncodedTree(NamedTuple):
+    data: bytes
+
+    # None if the packet coding is used.
+    coding: Optional[Coding.ValueType]
+
+    # Nested arrays sent out-of-band, in the order of their placeholders.
+    arrays: List[NumpyProto]
+
+    # Out-of-band buffers of a pickled object.
+    buffers: List[memoryview]
+
+    # The data is the object itself pickled with protocol 5.
+    pickled: bool
+
+
+def encode_object(
+    obj: Any,
+    coding: ByteCoding,
+    compress_level: int,
+    policy: Optional[CodecPolicy] = None,
+    local=False,
+    compress: Optional[bool] = None,
+) -> EncodedTree:
+    if coding == ByteCoding.Pickle5:
+        # Arbitrary objects are pickled as-is, without `serialize()`.
+        data, buffers = pickle_object(obj)
+        pickle_coding = None if policy is None else Coding.ValueType(coding.value)
+        return EncodedTree(data, pickle_coding, list(), buffers, True)
+
+    tree, arrays = extract_arrays(serialize(obj))
+    if policy is None:
+        data = object_to_bytes(coding=coding, data=tree, level=compress_level)
+        return EncodedTree(data, None, arrays, list(), False)
+
+    encoded = policy.encode_serialized(tree, coding, local, compress)
+    encoded_coding = Coding.ValueType(encoded.coding.value)
+    return EncodedTree(encoded.data, encoded_coding, arrays, list(), False)
+
+
+def decode_object(
+    data: Any,
+    coding: ByteCoding,
+    arrays: Sequence[ndarray] = (),
+    cls: Optional[Any] = None,
+) -> Any:
+    tree = restore_arrays(bytes_to_object(coding=coding, data=data), arrays)
+    if cls is not None:
+        return deserialize(tree, cls)
+    return tree
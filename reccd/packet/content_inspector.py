@@ -1,6 +1,10 @@
 # -*- coding: utf-8 -*-
 
-from reccd.proto.daemon.daemon_api_pb2 import Content
+from typing import Iterable, List
+
+from numpy import ndarray
+
+from reccd.proto.daemon.daemon_api_pb2 import ArrayInfo, Coding, Content
 
 
 def has_array(content: Content) -> bool:
@@ -22,3 +26,73 @@ def has_shared_memory(content: Content) -> bool:
     if content.size == 0:
         return False
     return True
+
+
+def shared_memory_slice(content: Content, buffer: memoryview) -> memoryview:
+    """
+    The bytes of the content in the buffer of its segment.
+    """
+    begin = content.sm_offset
+    return buffer[begin : begin + content.size]
+
+
+def owned_sm_names(contents: Iterable[Content]) -> List[str]:
+    """
+    Names of the segments whose ownership passes to the receiver.
+    """
+    result = list()
+    for content in contents:
+        if content.sm_owned:
+            result.append(content.sm_name)
+        result += owned_sm_names(content.oob)
+    return result
+
+
+def contents_size(contents: Iterable[Content]) -> int:
+    """
+    Bytes of the payload of the contents, including out-of-band data.
+    """
+    return sum(content.size + contents_size(content.oob) for content in contents)
+
+
+def shared_memory_names(contents: Iterable[Content]) -> List[str]:
+    """
+    Names of the segments the contents are read from.
+    """
+    result = list()
+    for content in contents:
+        if has_shared_memory(content):
+            result.append(content.sm_name)
+        result += shared_memory_names(content.oob)
+    return result
+
+
+def has_pickle(content: Content) -> bool:
+    """
+    The content, or any of its out-of-band contents, is decoded with
+    ``pickle.loads``.
+    """
+    if content.pickled:
+        return True
+    if content.HasField("coding") and content.coding == Coding.Pickle5:
+        return True
+    return any(has_pickle(oob) for oob in content.oob)
+
+
+def contiguous_array_info(array: ndarray) -> ArrayInfo:
+    """
+    Array information for the C-contiguous byte layout of the array.
+
+    Both ``ndarray_to_bytes`` and ``SharedMemoryQueue.write_array`` emit the
+    C-contiguous layout, so the strides of a non-contiguous source must not be
+    forwarded as-is.
+    """
+    if array.flags.c_contiguous:
+        strides = list(array.strides)
+    else:
+        strides = list()
+        stride = array.itemsize
+        for dim in reversed(array.shape):
+            strides.insert(0, stride)
+            stride *= dim
+    return ArrayInfo(shape=array.shape, dtype=array.dtype.name, strides=strides)
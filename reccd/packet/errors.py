@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+
+
+class PacketError(Exception):
+    """
+    The daemon failed to answer a packet of a stream or a batch.
+    """
+
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.message = message
+
+
+class PacketStreamClosedError(PacketError):
+    def __init__(self, message="The packet stream is closed"):
+        super().__init__(message)
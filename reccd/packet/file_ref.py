@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+import os
+from mmap import ACCESS_READ, ALLOCATIONGRANULARITY, mmap
+from typing import Iterable, NamedTuple, Optional
+
+from numpy import dtype as np_dtype
+from numpy import frombuffer, memmap, ndarray, uint8
+
+from reccd.proto.daemon.daemon_api_pb2 import ArrayInfo, Content, FileRef
+
+
+class FileIdentity(NamedTuple):
+    path: str
+    device: int
+    inode: int
+    file_size: int
+    mtime_ns: int
+
+
+def file_identity(ref: FileRef) -> FileIdentity:
+    return FileIdentity(ref.path, ref.device, ref.inode, ref.file_size, ref.mtime_ns)
+
+
+def _stat_identity(path: str, st: os.stat_result) -> FileIdentity:
+    return FileIdentity(path, st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def _data_offset(array: memmap) -> Optional[int]:
+    """
+    Offset of the first element of the array in its file, or ``None`` if
+    the array is not a view on the mapping of the file.
+    """
+    mm = getattr(array, "_mmap", None)
+    if not isinstance(mm, mmap) or mm.closed:
+        return None
+
+    base = frombuffer(mm, dtype=uint8)
+    begin = base.__array_interface__["data"][0]
+    address = array.__array_interface__["data"][0]
+    extent = sum((n - 1) * s for n, s in zip(array.shape, array.strides))
+    if address < begin or address + extent + array.itemsize > begin + base.nbytes:
+        return None
+
+    # The file is mapped from the offset rounded down to the granularity.
+    start = array.offset - array.offset % ALLOCATIONGRANULARITY
+    return start + address - begin
+
+
+def memmap_file_ref(array: ndarray) -> Optional[FileRef]:
+    """
+    A reference to the data of a file-backed ``memmap``, e.g. from
+    ``numpy.load(mmap_mode="r")``, or ``None`` if the file cannot be shared.
+
+    Copy-on-write maps hold private changes, so they are never referenced.
+    """
+    if not isinstance(array, memmap) or array.mode == "c" or not array.filename:
+        return None
+    if array.size == 0 or any(s < 0 for s in array.strides):
+        return None
+    if np_dtype(array.dtype.name) != array.dtype:
+        # Only the dtype name is sent, e.g. big-endian data cannot be described.
+        return None
+
+    offset = _data_offset(array)
+    if offset is None:
+        return None
+
+    try:
+        identity = _stat_identity(array.filename, os.stat(array.filename))
+    except OSError:
+        return None
+    return FileRef(offset=offset, **identity._asdict())
+
+
+def is_file_allowed(path: str, directories: Iterable[str]) -> bool:
+    """
+    The real path of the file is inside one of the directories, so a client
+    cannot make the daemon map a file it may not read itself.
+    """
+    real = os.path.realpath(path)
+    for directory in directories:
+        root = os.path.realpath(directory)
+        if os.path.commonpath([real, root]) == root:
+            return True
+    return False
+
+
+def is_file_visible(ref: FileRef, directories: Iterable[str]) -> bool:
+    """
+    The file is allowed and readable here, and is the same file the client
+    referenced.
+    """
+    if not is_file_allowed(ref.path, directories):
+        return False
+    try:
+        st = os.stat(ref.path)
+    except OSError:
+        return False
+    if _stat_identity(ref.path, st) != file_identity(ref):
+        return False
+    return os.access(ref.path, os.R_OK)
+
+
+def has_file(content: Content) -> bool:
+    return content.HasField("file")
+
+
+def file_array_info(array: ndarray) -> ArrayInfo:
+    """
+    Unlike the data sent in bytes, the file is read with the strides as-is.
+    """
+    return ArrayInfo(
+        shape=array.shape,
+        dtype=array.dtype.name,
+        strides=list(array.strides),
+    )
+
+
+def open_file_ref(content: Content, directories: Iterable[str]) -> ndarray:
+    """
+    A read-only array on a memory map of the referenced file.
+    """
+    ref = content.file
+    path = os.path.realpath(ref.path)
+    if not is_file_allowed(path, directories):
+        raise PermissionError(f"The file is not in the file ref directories: {path}")
+
+    with open(path, "rb") as f:
+        if _stat_identity(ref.path, os.fstat(f.fileno())) != file_identity(ref):
+            raise FileNotFoundError(f"The file has changed: {ref.path}")
+        mm = mmap(f.fileno(), 0, access=ACCESS_READ)
+
+    return ndarray(
+        shape=content.array.shape,
+        dtype=content.array.dtype,
+        buffer=mm,
+        offset=ref.offset,
+        strides=content.array.strides,
+    )
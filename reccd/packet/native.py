@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+from typing import Any, Final, Optional, Union
+
+from type_serialize import deserialize
+
+from reccd.proto.daemon.daemon_api_pb2 import Content
+from reccd.variables.rpc import DEFAULT_INLINE_BYTES_SIZE
+
+INT64_MIN: Final[int] = -(2**63)
+INT64_MAX: Final[int] = 2**63 - 1
+
+BYTES_LIKE_TYPES: Final = (bytes, bytearray, memoryview)
+
+
+def is_bytes_like(obj: Any) -> bool:
+    return type(obj) in BYTES_LIKE_TYPES
+
+
+def raw_buffer(obj: Union[bytes, bytearray, memoryview]) -> Union[bytes, memoryview]:
+    """
+    The bytes-like object as a flat byte buffer, copied only if not contiguous.
+    """
+    if isinstance(obj, bytes):
+        return obj
+    view = memoryview(obj)
+    if not view.c_contiguous:
+        return view.tobytes()
+    return view.cast("B")
+
+
+def native_to_content(
+    obj: Any,
+    inline_bytes_size=DEFAULT_INLINE_BYTES_SIZE,
+) -> Optional[Content]:
+    """
+    A content that holds the primitive value inline, or ``None`` if the value
+    needs the codec. Subclasses such as ``IntEnum`` are not primitive.
+    """
+    cls = type(obj)
+    try:
+        if obj is None:
+            return Content(none_value=True)
+        elif cls is bool:
+            return Content(bool_value=obj)
+        elif cls is int:
+            if INT64_MIN <= obj <= INT64_MAX:
+                return Content(int_value=obj)
+        elif cls is float:
+            return Content(float_value=obj)
+        elif cls is str:
+            return Content(str_value=obj)
+        elif cls in BYTES_LIKE_TYPES:
+            if memoryview(obj).nbytes <= inline_bytes_size:
+                return Content(bytes_value=bytes(obj))
+    except UnicodeEncodeError:
+        # Strings with lone surrogates are not valid UTF-8.
+        pass
+    return None
+
+
+def has_native(content: Content) -> bool:
+    return content.WhichOneof("native") is not None
+
+
+def content_to_native(content: Content) -> Any:
+    field = content.WhichOneof("native")
+    if field is None:
+        raise ValueError("The content does not hold a native value")
+    if field == "none_value":
+        return None
+    return getattr(content, field)
+
+
+def cast_native(value: Any, cls: Optional[Any] = None) -> Any:
+    """
+    Convert the value only if it is not already an instance of ``cls``.
+    """
+    if cls is None or not isinstance(cls, type) or isinstance(value, cls):
+        return value
+    return deserialize(value, cls)
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+from pickle import PickleBuffer, dumps, loads
+from typing import Any, Final, Iterable, List, Sequence, Tuple
+
+from numpy import ndarray
+from type_serialize.driver.numpy import NumpyProto
+
+from reccd.variables.rpc import (
+    DEFAULT_PICKLE_OOB_THRESHOLD,
+    DEFAULT_PICKLE_PROTOCOL_VERSION,
+)
+
+OOB_KEY: Final[str] = "__reccd_oob__"
+"""
+Key of the placeholder that refers to an out-of-band array by its index.
+A user dict that has this key is escaped as the value of the same key.
+"""
+
+
+def extract_arrays(tree: Any) -> Tuple[Any, List[NumpyProto]]:
+    """
+    Replace each serialized ndarray in the tree with an out-of-band placeholder.
+    """
+    arrays: List[NumpyProto] = list()
+
+    def _walk(node: Any) -> Any:
+        if isinstance(node, NumpyProto):
+            arrays.append(node)
+            return {OOB_KEY: len(arrays) - 1}
+        elif isinstance(node, dict):
+            result = {k: _walk(v) for k, v in node.items()}
+            return {OOB_KEY: result} if OOB_KEY in node else result
+        elif isinstance(node, list):
+            return [_walk(v) for v in node]
+        else:
+            return node
+
+    result = _walk(tree)
+    return result, arrays
+
+
+def proto_to_array(proto: NumpyProto) -> ndarray:
+    # The buffer of the proto is always in C-contiguous order.
+    return ndarray(shape=proto.shape, dtype=proto.dtype, buffer=proto.buffer)
+
+
+def restore_arrays(tree: Any, arrays: Sequence[ndarray]) -> Any:
+    """
+    Replace the placeholders with the serialized form of the out-of-band arrays,
+    which ``type_serialize.deserialize`` turns back into ndarrays.
+
+    The tree is walked even without arrays, to unescape the user dicts.
+    """
+
+    def _walk(node: Any) -> Any:
+        if isinstance(node, dict):
+            if len(node) == 1 and OOB_KEY in node:
+                value = node[OOB_KEY]
+                if isinstance(value, dict):
+                    return {k: _walk(v) for k, v in value.items()}
+                array = arrays[value]
+                shape, strides = list(array.shape), list(array.strides)
+                return [shape, array.dtype.name, array.data, strides]
+            return {k: _walk(v) for k, v in node.items()}
+        elif isinstance(node, list):
+            return [_walk(v) for v in node]
+        else:
+            return node
+
+    return _walk(tree)
+
+
+def pickle_object(
+    obj: Any,
+    threshold=DEFAULT_PICKLE_OOB_THRESHOLD,
+) -> Tuple[bytes, List[memoryview]]:
+    """
+    Pickle the object with protocol 5, keeping the buffers larger than
+    ``threshold`` out-of-band. The returned views are not copied.
+
+    Only objects that export a ``PickleBuffer`` (such as ndarrays) have
+    out-of-band buffers. Wrap other bytes-likes in ``PickleBuffer`` to
+    send them out-of-band.
+    """
+    buffers: List[memoryview] = list()
+
+    def _buffer_callback(buffer: PickleBuffer) -> bool:
+        try:
+            view = buffer.raw()
+        except BufferError:
+            # Non-contiguous buffers are serialized in-band.
+            return True
+        if view.nbytes < threshold:
+            return True
+        buffers.append(view)
+        return False
+
+    data = dumps(
+        obj,
+        protocol=DEFAULT_PICKLE_PROTOCOL_VERSION,
+        buffer_callback=_buffer_callback,
+    )
+    return data, buffers
+
+
+def unpickle_object(data: Any, buffers: Iterable[Any] = ()) -> Any:
+    return loads(data, buffers=buffers)
@@ -1,20 +1,42 @@
 # -*- coding: utf-8 -*-
 
-from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Set
+from itertools import chain
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from numpy import ndarray
 from type_serialize import ByteCoding
-from type_serialize import encode as byte_encode
-from type_serialize.driver.numpy import ndarray_to_bytes
+from type_serialize.driver.numpy import NumpyProto, ndarray_to_bytes
 
-from reccd.memory.shared_memory_queue import SharedMemoryQueue
-from reccd.proto.daemon.daemon_api_pb2 import ArrayInfo, Content
+from reccd.memory.shared_memory_arena import SharedMemoryWriter
+from reccd.memory.shared_memory_queue import Written
+from reccd.packet.chunk import ChunkBuffers, ContentKey, array_to_chunk_buffer
+from reccd.packet.codec_executor import CodecExecutor, payload_size
+from reccd.packet.codec_policy import CodecPolicy, EncodedTree, encode_object
+from reccd.packet.content_inspector import contiguous_array_info
+from reccd.packet.file_ref import file_array_info
+from reccd.packet.native import is_bytes_like, native_to_content, raw_buffer
+from reccd.packet.oob import proto_to_array
+from reccd.packet.placement_policy import DEFAULT_PLACEMENT_POLICY, PlacementPolicy
+from reccd.proto.daemon.daemon_api_pb2 import Coding, Content, FileRef
 
 
 class PackedTuple(NamedTuple):
     args: List[Content]
     kwargs: Dict[str, Content]
 
+    # Data of the chunked contents.
+    buffers: ChunkBuffers
+
 
 class Packer:
 
@@ -22,8 +44,10 @@ class Packer:
     _compress_level: int
     _args: List[Any]
     _kwargs: Dict[str, Any]
-    _smq: Optional[SharedMemoryQueue]
-    _written_sm_names: Set[str]
+    _smq: Optional[SharedMemoryWriter]
+    _written: List[Written]
+    _chunk_buffers: ChunkBuffers
+    _encoded: Dict[ContentKey, EncodedTree]
 
     def __init__(
         self,
@@ -31,88 +55,213 @@ class Packer:
         compress_level: int,
         args: Optional[Iterable[Any]] = None,
         kwargs: Optional[Mapping[str, Any]] = None,
-        smq: Optional[SharedMemoryQueue] = None,
+        smq: Optional[SharedMemoryWriter] = None,
+        chunk_threshold=0,
+        codec_policy: Optional[CodecPolicy] = None,
+        local=False,
+        placement: Optional[PlacementPolicy] = None,
+        file_refs: Optional[Dict[int, FileRef]] = None,
     ):
         self._coding = coding
         self._compress_level = compress_level
         self._args = list(args) if args else list()
         self._kwargs = dict(kwargs) if kwargs else dict()
         self._smq = smq
-        self._written_sm_names = set()
+        self._written = list()
+        self._chunk_threshold = chunk_threshold
+        self._chunk_buffers = dict()
+        self._codec_policy = codec_policy
+        self._local = local or smq is not None
+        self._placement = placement if placement else DEFAULT_PLACEMENT_POLICY
+        # Files of the arguments, by the id of the array, that the receiver maps.
+        self._file_refs = file_refs if file_refs else dict()
+        self._encoded = dict()
+        self.inline_count = 0
+        self.sm_count = 0
+        self.file_count = 0
 
     def restore(self) -> None:
         if not self._smq:
             return
-        for name in self._written_sm_names:
-            self._smq.restore(name)
-        self._written_sm_names.clear()
-
-    def object_to_content(self, obj: Any) -> Content:
-        buffer = byte_encode(
-            data=obj,
-            level=self._compress_level,
-            coding=self._coding,
-        )
+        for written in self._written:
+            self._smq.release(written)
+        self._written.clear()
+
+    def _is_chunked(self, size: int, key: Optional[ContentKey]) -> bool:
+        if key is None or self._chunk_threshold <= 0:
+            return False
+        return size > self._chunk_threshold
+
+    def _use_shared_memory(self, size: int) -> bool:
+        if self._smq is None or size == 0:
+            return False
+        if self._placement.use_shared_memory(size):
+            self.sm_count += 1
+            return True
+        else:
+            self.inline_count += 1
+            return False
 
-        if self._smq and buffer:
+    def buffer_fields(self, buffer: Union[bytes, memoryview]) -> Dict[str, Any]:
+        if self._use_shared_memory(len(buffer)):
+            assert self._smq is not None
             written = self._smq.write(buffer)
-            sm_name = written.sm_name
-            self._written_sm_names.add(sm_name)
-            data = bytes()
-            size = written.size
+            self._written.append(written)
+            return dict(
+                size=written.size,
+                sm_name=written.sm_name,
+                sm_offset=written.offset,
+            )
         else:
-            sm_name = None
-            data = buffer
-            size = len(buffer)
-
-        return Content(
-            size=size,
-            data=data,
-            sm_name=sm_name,
+            data = bytes(buffer)
+            return dict(size=len(data), data=data)
+
+    def oob_fields(self, proto: NumpyProto) -> Dict[str, Any]:
+        fields = self.buffer_fields(proto.buffer)
+        fields["array"] = contiguous_array_info(proto_to_array(proto))
+        return fields
+
+    def encode_object(self, obj: Any) -> EncodedTree:
+        return encode_object(
+            obj,
+            coding=self._coding,
+            compress_level=self._compress_level,
+            policy=self._codec_policy,
+            local=self._local,
         )
 
-    def array_to_content(self, array: ndarray) -> Content:
-        buffer = ndarray_to_bytes(array)
-        assert isinstance(buffer, bytes)
+    async def encode(self, executor: CodecExecutor) -> None:
+        """
+        Encode the large objects on the executor in advance. The contents are
+        still placed on the calling thread, because the shared memory pool is
+        not thread-safe.
+        """
+        items: Iterable[Tuple[ContentKey, Any]]
+        items = chain(enumerate(self._args), self._kwargs.items())
+        for key, obj in items:
+            if not self._is_encoded(obj):
+                continue
+            size = payload_size(obj)
+            if executor.is_offloaded(size):
+                self._encoded[key] = await executor.run(size, self.encode_object, obj)
+
+    @staticmethod
+    def _is_encoded(obj: Any) -> bool:
+        if obj is None or type(obj) in (bool, int, float, str):
+            return False
+        return not isinstance(obj, ndarray) and not is_bytes_like(obj)
 
-        if self._smq and buffer:
+    def object_to_content(self, obj: Any, key: Optional[ContentKey] = None) -> Content:
+        encoded = self._encoded.pop(key, None) if key is not None else None
+        if encoded is None:
+            encoded = self.encode_object(obj)
+        content = self.buffer_to_content(encoded.data, encoded.coding, key)
+        content.pickled = encoded.pickled
+        # Out-of-band data skips the codec. Added in place to avoid copying.
+        for proto in encoded.arrays:
+            content.oob.add(**self.oob_fields(proto))
+        for buffer in encoded.buffers:
+            content.oob.add(**self.buffer_fields(buffer))
+        return content
+
+    def raw_to_content(self, obj: Any, key: Optional[ContentKey] = None) -> Content:
+        content = self.buffer_to_content(raw_buffer(obj), key=key)
+        content.raw = True
+        return content
+
+    def buffer_to_content(
+        self,
+        buffer: Union[bytes, memoryview],
+        coding: Optional[Coding.ValueType] = None,
+        key: Optional[ContentKey] = None,
+    ) -> Content:
+        if self._use_shared_memory(len(buffer)):
+            assert self._smq is not None
             written = self._smq.write(buffer)
-            sm_name = written.sm_name
-            self._written_sm_names.add(sm_name)
-            data = bytes()
-            size = written.size
+            self._written.append(written)
+            return Content(
+                size=written.size,
+                sm_name=written.sm_name,
+                sm_offset=written.offset,
+                coding=coding,
+            )
+        elif self._is_chunked(len(buffer), key):
+            assert key is not None
+            self._chunk_buffers[key] = buffer
+            return Content(size=len(buffer), chunked=True, coding=coding)
         else:
-            sm_name = None
-            data = buffer
-            size = len(buffer)
-
-        return Content(
-            size=size,
-            data=data,
-            sm_name=sm_name,
-            array=ArrayInfo(
-                shape=array.shape,
-                dtype=array.dtype.name,
-                strides=array.strides,
-            ),
-        )
+            data = bytes(buffer)
+            return Content(size=len(data), data=data, coding=coding)
+
+    def array_to_content(
+        self,
+        array: ndarray,
+        key: Optional[ContentKey] = None,
+    ) -> Content:
+        file_ref = self._file_refs.get(id(array))
+        if file_ref is not None:
+            self.file_count += 1
+            return Content(
+                size=array.nbytes,
+                array=file_array_info(array),
+                file=file_ref,
+            )
+
+        if self._is_chunked(array.nbytes, key) and not self._smq:
+            assert key is not None
+            # Chunks are sliced from the array without intermediate bytes.
+            self._chunk_buffers[key] = array_to_chunk_buffer(array)
+            return Content(
+                size=array.nbytes,
+                array=contiguous_array_info(array),
+                chunked=True,
+            )
 
-    def any_to_content(self, obj: Any) -> Content:
+        if self._use_shared_memory(array.nbytes):
+            assert self._smq is not None
+            # Copy directly into the segment without intermediate bytes.
+            written = self._smq.write_array(array)
+            self._written.append(written)
+            return Content(
+                size=written.size,
+                sm_name=written.sm_name,
+                sm_offset=written.offset,
+                array=contiguous_array_info(array),
+            )
+        else:
+            data = ndarray_to_bytes(array)
+            assert isinstance(data, bytes)
+            return Content(
+                size=len(data),
+                data=data,
+                array=contiguous_array_info(array),
+            )
+
+    def any_to_content(self, obj: Any, key: Optional[ContentKey] = None) -> Content:
         if isinstance(obj, ndarray):
-            return self.array_to_content(obj)
+            return self.array_to_content(obj, key)
+
+        # Primitives skip the codec and the shared memory.
+        native = native_to_content(obj)
+        if native is not None:
+            return native
+        elif is_bytes_like(obj):
+            return self.raw_to_content(obj, key)
         else:
-            return self.object_to_content(obj)
+            return self.object_to_content(obj, key)
 
     def args_to_contents(self) -> List[Content]:
-        return [self.any_to_content(o) for o in self._args]
+        return [self.any_to_content(o, i) for i, o in enumerate(self._args)]
 
     def kwargs_to_contents(self) -> Dict[str, Content]:
-        return {k: self.any_to_content(o) for k, o in self._kwargs.items()}
+        return {k: self.any_to_content(o, k) for k, o in self._kwargs.items()}
 
     def __enter__(self) -> PackedTuple:
         args = self.args_to_contents()
         kwargs = self.kwargs_to_contents()
-        return PackedTuple(args=args, kwargs=kwargs)
+        return PackedTuple(args=args, kwargs=kwargs, buffers=self._chunk_buffers)
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.restore()
+        self._chunk_buffers = dict()
+        self._encoded = dict()
@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
 
+from asyncio import CancelledError
 from collections import deque
-from inspect import iscoroutinefunction, signature
+from contextlib import ExitStack
+from itertools import chain
+from multiprocessing.shared_memory import SharedMemory
 from typing import (
     Any,
     Deque,
@@ -11,60 +14,78 @@ from typing import (
     Mapping,
     NamedTuple,
     Optional,
+    Sequence,
     Union,
 )
 
 from numpy import ndarray
 from type_serialize import ByteCoding
-from type_serialize import decode as byte_decode
-from type_serialize import encode as byte_encode
-from type_serialize.driver.numpy import ndarray_to_bytes
+from type_serialize.driver.numpy import NumpyProto, ndarray_to_bytes
 
-from reccd.conversion.to_boolean import string_to_boolean
-from reccd.inspect.type_origin import get_type_origin
 from reccd.logging.logging import reccd_logger as logger
-from reccd.memory.shared_memory_utils import attach_shared_memory
-from reccd.packet.content_inspector import has_array, has_shared_memory
-from reccd.proto.daemon.daemon_api_pb2 import ArrayInfo, Content
-
-
-def _is_path_class(obj) -> bool:
-    if not isinstance(obj, type):
-        return False
-    if issubclass(obj, str):
-        return True
-    if issubclass(obj, int):
-        return True
-    if issubclass(obj, float):
-        return True
-    if issubclass(obj, bool):
-        return True
-    return False
-
-
-def _cast_builtin_type_from_string(data: str, cls) -> Any:
-    assert isinstance(cls, type)
-    if issubclass(cls, str):
-        return data
-    elif issubclass(cls, int):
-        return int(data)
-    elif issubclass(cls, float):
-        return float(data)
-    elif issubclass(cls, bool):
-        return string_to_boolean(data)
-    return cls(data)  # type: ignore[call-arg]
+from reccd.memory.parallel_copy import DEFAULT_PARALLEL_COPIER
+from reccd.memory.shared_memory_queue import size_class
+from reccd.memory.shared_memory_utils import (
+    SharedMemoryAttachmentCache,
+    attach_shared_memory,
+    create_shared_memory,
+    destroy_shared_memory,
+    hand_over_shared_memory,
+)
+from reccd.packet.chunk import ChunkBuffers, ContentKey, array_to_chunk_buffer
+from reccd.packet.codec_executor import (
+    DEFAULT_CODEC_EXECUTOR,
+    CodecExecutor,
+    payload_size,
+)
+from reccd.packet.codec_policy import (
+    CodecPolicy,
+    content_coding,
+    decode_object,
+    encode_object,
+)
+from reccd.packet.content_inspector import (
+    contents_size,
+    contiguous_array_info,
+    has_array,
+    has_shared_memory,
+    owned_sm_names,
+    shared_memory_names,
+    shared_memory_slice,
+)
+from reccd.packet.file_ref import has_file, open_file_ref
+from reccd.packet.native import (
+    cast_native,
+    content_to_native,
+    has_native,
+    is_bytes_like,
+    native_to_content,
+    raw_buffer,
+)
+from reccd.packet.oob import proto_to_array, unpickle_object
+from reccd.packet.placement_policy import DEFAULT_PLACEMENT_POLICY, PlacementPolicy
+from reccd.packet.result_allocator import ResultAllocator
+from reccd.proto.daemon.daemon_api_pb2 import Coding, Content
+from reccd.route.route_executor import RouteExecutor
+from reccd.route.route_options import DEFAULT_ROUTE_OPTIONS, RouteOptions
+from reccd.route.route_plan import ParameterBinder, RoutePlan
 
 
 class ResultTuple(NamedTuple):
     args: List[Content]
     kwargs: Dict[str, Content]
 
+    # Data of the chunked contents.
+    buffers: ChunkBuffers
+
 
 class ParameterMatcher:
 
     _args: Deque[Content]
     _kwargs: Dict[str, Content]
     _sm_names: Deque[str]
+    _owned: Dict[str, SharedMemory]
+    _pinned: Dict[str, SharedMemory]
 
     def __init__(
         self,
@@ -76,28 +97,168 @@ class ParameterMatcher:
         args: Iterable[Content],
         kwargs: Mapping[str, Content],
         sm_names: Iterable[str],
+        options: Optional[RouteOptions] = None,
+        session: Optional[str] = None,
+        sm_cache: Optional[SharedMemoryAttachmentCache] = None,
+        plan: Optional[RoutePlan] = None,
+        buffers: Optional[ChunkBuffers] = None,
+        chunk_threshold=0,
+        codec_policy: Optional[CodecPolicy] = None,
+        local=False,
+        placement: Optional[PlacementPolicy] = None,
+        daemon_sm=False,
+        owner_pid: Optional[int] = None,
+        codec_executor: Optional[CodecExecutor] = None,
+        route_executor: Optional[RouteExecutor] = None,
+        route_name: Optional[str] = None,
+        file_ref_dirs: Sequence[str] = (),
     ):
-        self._func = func
+        self._plan = plan if plan is not None else RoutePlan(func)
+        self._func = self._plan.func
         self._match_info = match_info
         self._coding = coding
         self._encoding = encoding
         self._compress_level = compress_level
-        self._signature = signature(func)
         self._args = deque(args)
         self._kwargs = dict(kwargs)
         self._sm_names = deque(sm_names)
+        self._options = options if options is not None else DEFAULT_ROUTE_OPTIONS
+        self._session = session if session else str()
+        self._sm_cache = sm_cache
+        self._attachments = ExitStack()
+        self._daemon_sm = daemon_sm
+        self._owner_pid = owner_pid
+        self._owned = dict()
+        self._pinned = dict()
+        self._allocator = ResultAllocator(self._secure_segment)
+        self._buffers = buffers if buffers else dict()
+        self._arg_index = 0
+        self._chunk_threshold = chunk_threshold
+        self._result_buffers: ChunkBuffers = dict()
+        self._codec_policy = codec_policy
+        self._codec_executor = codec_executor or DEFAULT_CODEC_EXECUTOR
+        # If None, the route is called on the event loop.
+        self._route_executor = route_executor
+        self._route_name: str = (
+            route_name if route_name else getattr(func, "__qualname__", repr(func))
+        )
+        self._local = local or self._has_shared_memory
+        # Files outside of these directories are never mapped.
+        self._file_ref_dirs = file_ref_dirs
+
+        if self._options.inline_threshold is not None:
+            placement = PlacementPolicy(self._options.inline_threshold)
+        self._placement = placement if placement else DEFAULT_PLACEMENT_POLICY
+
+    @property
+    def _has_shared_memory(self) -> bool:
+        return bool(self._sm_names) or self._daemon_sm
 
     async def call(self) -> ResultTuple:
-        update_arguments = self._get_arguments()
+        result: Optional[ResultTuple] = None
+        try:
+            result = await self._call()
+            return result
+        finally:
+            # Detach the shared memory of the views after the route call.
+            self._allocator.clear()
+            self._release_owned(result)
+            self._attachments.close()
+
+    def _release_owned(self, result: Optional[ResultTuple]) -> None:
+        """
+        Hand over the created segments that the result refers to, and unlink
+        the others, e.g. unused allocations or those of a failed call.
+        """
+        handed_over = set()
+        if result is not None:
+            contents = chain(result.args, result.kwargs.values())
+            handed_over.update(owned_sm_names(contents))
+
+        for sm_name, sm in self._owned.items():
+            if sm_name in handed_over:
+                hand_over_shared_memory(sm)
+            else:
+                destroy_shared_memory(sm)
+        self._owned.clear()
+
+    def _secure_segment(self, size: int) -> Optional[SharedMemory]:
+        """
+        A rented segment of the client if the next one fits, otherwise
+        a new segment whose ownership passes to the client.
+        """
+        if self._sm_names:
+            sm = self._attach(self._sm_names[0])
+            if sm.size >= size:
+                self._sm_names.popleft()
+                return sm
+
+        if not self._daemon_sm:
+            return None
+
+        # Sized in the classes of the client's pool, which adopts it, and
+        # named after the client, which unlinks it.
+        sm = create_shared_memory(size_class(size), self._session, self._owner_pid)
+        self._owned[sm.name] = sm
+        return sm
+
+    def _pin(self, sm_names: Iterable[str]) -> None:
+        """
+        Attach the segments on the event loop in advance, because the
+        attachment cache is shared by all requests.
+        """
+        for sm_name in sm_names:
+            if sm_name not in self._pinned:
+                self._pinned[sm_name] = self._attach(sm_name)
+
+    def _attach(self, sm_name: str) -> SharedMemory:
+        pinned = self._pinned.get(sm_name)
+        if pinned is not None:
+            return pinned
+        if self._sm_cache is not None:
+            sm = self._sm_cache.attach(self._session, sm_name)
+            self._attachments.callback(self._sm_cache.release, self._session)
+            return sm
+        else:
+            return self._attachments.enter_context(attach_shared_memory(sm_name))
+
+    async def _decode_arguments(self) -> List[Any]:
+        contents = list(chain(self._args, self._kwargs.values()))
+        size = contents_size(contents)
+        if self._codec_executor.is_offloaded(size):
+            self._pin(shared_memory_names(contents))
+        return await self._codec_executor.run(size, self._get_arguments)
+
+    async def _encode_result(self, result: Any) -> ResultTuple:
+        size = payload_size(result)
+        if self._codec_executor.is_offloaded(size):
+            self._pin(self._sm_names)
+        return await self._codec_executor.run(size, self._result_to_tuple, result)
+
+    async def _call(self) -> ResultTuple:
+        update_arguments = await self._decode_arguments()
 
         try:
-            if iscoroutinefunction(self._func):
+            if self._route_executor is not None:
+                result = await self._route_executor.call(
+                    self._route_name,
+                    self._func,
+                    update_arguments,
+                    self._plan.is_coroutine,
+                    self._options,
+                )
+            elif self._plan.is_coroutine:
                 result = await self._func(*update_arguments)
             else:
                 result = self._func(*update_arguments)
+        except CancelledError:
+            raise
         except BaseException as e:
             raise RuntimeError("A runtime error occurred in the route") from e
 
+        return await self._encode_result(result)
+
+    def _result_to_tuple(self, result: Any) -> ResultTuple:
         result_args: List[Any] = list()
         result_kwargs: Dict[str, Any] = dict()
 
@@ -117,49 +278,86 @@ class ParameterMatcher:
         return ResultTuple(
             args=self._args_to_contents(*result_args),
             kwargs=self._kwargs_to_contents(**result_kwargs),
+            buffers=self._result_buffers,
         )
 
     def _get_arguments(self) -> List[Any]:
-        return [self._get_argument(key) for key in self._signature.parameters.keys()]
+        return [self._get_argument(binder) for binder in self._plan.binders]
 
-    def _get_argument(self, key: str) -> Any:
-        param = self._signature.parameters[key]
+    def _get_argument(self, binder: ParameterBinder) -> Any:
+        key = binder.key
 
-        type_origin = get_type_origin(param)
-        assert type_origin is not None
-        assert isinstance(type_origin, type) or type_origin is Union
-
-        # param.kind
-        #  - POSITIONAL_ONLY
-        #  - POSITIONAL_OR_KEYWORD
-        #  - VAR_POSITIONAL
-        #  - KEYWORD_ONLY
-        #  - VAR_KEYWORD
+        # Result allocator
+        if binder.is_allocator:
+            return self._allocator
 
         # Path
-        if _is_path_class(type_origin) and key in self._match_info:
+        if binder.path_caster is not None and key in self._match_info:
             path_value = self._match_info[key]
             try:
-                return _cast_builtin_type_from_string(path_value, type_origin)
+                return binder.path_caster(path_value)
             except ValueError:
                 logger.debug(f"Type casting error for path parameter: {key}")
                 return path_value
 
         # Keyword arguments
         if key in self._kwargs:
-            return self._content_to_any(self._kwargs[key], type_origin)
+            return self._content_to_any(self._kwargs[key], binder.type_origin, key)
 
         # Positional arguments
         if self._args:
-            return self._content_to_any(self._args.popleft(), type_origin)
+            index = self._arg_index
+            self._arg_index += 1
+            return self._content_to_any(self._args.popleft(), binder.type_origin, index)
 
         return None
 
-    def _content_to_any(self, content: Content, cls: Optional[Any] = None) -> Any:
-        if has_shared_memory(content):
-            with attach_shared_memory(content.sm_name) as sm:
-                size = content.size
-                data = bytes(sm.buf[:size])
+    def _content_to_view(self, content: Content) -> ndarray:
+        sm = self._attach(content.sm_name)
+        assert sm.buf is not None
+        array = ndarray(
+            shape=content.array.shape,
+            dtype=content.array.dtype,
+            buffer=shared_memory_slice(content, sm.buf),
+            strides=content.array.strides,
+        )
+        if not self._options.writable_view:
+            array.flags.writeable = False
+        return array
+
+    def _content_to_any(
+        self,
+        content: Content,
+        cls: Optional[Any] = None,
+        key: Optional[ContentKey] = None,
+    ) -> Any:
+        if has_native(content):
+            return cast_native(content_to_native(content), cls)
+
+        if has_file(content):
+            array = open_file_ref(content, self._file_ref_dirs)
+            # Like the shared memory, the map is only a view during the call.
+            return array if self._options.shared_memory_view else array.copy()
+
+        if self._options.shared_memory_view:
+            if has_shared_memory(content) and has_array(content):
+                return self._content_to_view(content)
+
+        if content.chunked:
+            if key not in self._buffers:
+                raise KeyError(f"The chunked content does not exist: {key}")
+            data = self._buffers[key]
+            if not has_array(content):
+                # Not every decoder accepts a bytearray.
+                data = bytes(data)
+        elif has_shared_memory(content):
+            sm = self._attach(content.sm_name)
+            assert sm.buf is not None
+            view = shared_memory_slice(content, sm.buf)
+            if has_array(content):
+                data = DEFAULT_PARALLEL_COPIER.read(view)
+            else:
+                data = bytes(view)
         else:
             data = content.data
 
@@ -170,59 +368,145 @@ class ParameterMatcher:
                 buffer=data,
                 strides=content.array.strides,
             )
+        elif content.raw:
+            return cast_native(data, cls)
+        elif content.pickled:
+            buffers = [self._content_to_pickle_buffer(oob) for oob in content.oob]
+            return unpickle_object(data, buffers)
         else:
-            return byte_decode(data=data, cls=cls, coding=self._coding)
+            coding = content_coding(content, self._coding)
+            arrays = [self._content_to_any(oob) for oob in content.oob]
+            return decode_object(data, coding, arrays, cls)
+
+    def _content_to_pickle_buffer(self, content: Content) -> Any:
+        if not has_shared_memory(content):
+            return content.data
+
+        sm = self._attach(content.sm_name)
+        assert sm.buf is not None
+        view = shared_memory_slice(content, sm.buf)
+        if self._options.shared_memory_view:
+            return view if self._options.writable_view else view.toreadonly()
+        else:
+            # Writable, like the buffers of a regular unpickle.
+            return DEFAULT_PARALLEL_COPIER.read(view, writable=True)
 
-    def _object_to_content(self, obj: Any) -> Content:
-        buffer = byte_encode(data=obj, level=self._compress_level, coding=self._coding)
-        size = len(buffer)
+    def _use_shared_memory(self, size: int) -> bool:
+        if not self._has_shared_memory or size == 0:
+            return False
+        return self._placement.use_shared_memory(size)
 
-        if self._sm_names and buffer:
-            data = bytes()
-            sm_name = self._sm_names.popleft()
-            with attach_shared_memory(sm_name) as sm:
-                sm.buf[:size] = buffer
-        else:
-            data = buffer
-            sm_name = None
+    def _sm_fields(self, sm: SharedMemory) -> Dict[str, Any]:
+        return dict(sm_name=sm.name, sm_owned=sm.name in self._owned)
 
-        return Content(size=size, data=data, sm_name=sm_name)
+    def _buffer_fields(self, buffer: Union[bytes, memoryview]) -> Dict[str, Any]:
+        size = len(buffer)
 
-    def _array_to_content(self, array: ndarray) -> Content:
-        buffer = ndarray_to_bytes(array)
+        if self._use_shared_memory(size):
+            sm = self._secure_segment(size)
+            if sm is not None:
+                assert sm.buf is not None
+                DEFAULT_PARALLEL_COPIER.copy_buffer(sm.buf[:size], buffer)
+                return dict(size=size, **self._sm_fields(sm))
+
+        return dict(size=size, data=bytes(buffer))
+
+    def _oob_fields(self, proto: NumpyProto) -> Dict[str, Any]:
+        fields = self._buffer_fields(proto.buffer)
+        fields["array"] = contiguous_array_info(proto_to_array(proto))
+        return fields
+
+    def _is_chunked(self, size: int, key: Optional[ContentKey]) -> bool:
+        if key is None or self._chunk_threshold <= 0 or self._has_shared_memory:
+            return False
+        return size > self._chunk_threshold
+
+    def _object_to_content(self, obj: Any, key: Optional[ContentKey] = None) -> Content:
+        encoded = encode_object(
+            obj,
+            coding=self._coding,
+            compress_level=self._compress_level,
+            policy=self._codec_policy,
+            local=self._local,
+            compress=self._options.compress,
+        )
+        content = self._buffer_to_content(encoded.data, encoded.coding, key)
+        content.pickled = encoded.pickled
+        # Out-of-band data skips the codec. Added in place to avoid copying.
+        for proto in encoded.arrays:
+            content.oob.add(**self._oob_fields(proto))
+        for buffer in encoded.buffers:
+            content.oob.add(**self._buffer_fields(buffer))
+        return content
+
+    def _raw_to_content(self, obj: Any, key: Optional[ContentKey] = None) -> Content:
+        content = self._buffer_to_content(raw_buffer(obj), key=key)
+        content.raw = True
+        return content
+
+    def _buffer_to_content(
+        self,
+        buffer: Union[bytes, memoryview],
+        coding: Optional[Coding.ValueType] = None,
+        key: Optional[ContentKey] = None,
+    ) -> Content:
         size = len(buffer)
 
-        if self._sm_names and buffer:
-            data = bytes()
-            sm_name = self._sm_names.popleft()
-            with attach_shared_memory(sm_name) as sm:
-                sm.buf[:size] = buffer
-        else:
-            data = buffer
-            sm_name = None
+        if self._is_chunked(size, key):
+            assert key is not None
+            self._result_buffers[key] = buffer
+            return Content(size=size, chunked=True, coding=coding)
+
+        return Content(coding=coding, **self._buffer_fields(buffer))
 
+    def _array_to_content(
+        self,
+        array: ndarray,
+        key: Optional[ContentKey] = None,
+    ) -> Content:
+        allocated_sm_name = self._allocator.find(array)
+        if allocated_sm_name is not None:
+            # The route has already written the result into the shared memory.
+            return Content(
+                size=array.nbytes,
+                sm_name=allocated_sm_name,
+                sm_owned=allocated_sm_name in self._owned,
+                array=contiguous_array_info(array),
+            )
+
+        if self._is_chunked(array.nbytes, key):
+            assert key is not None
+            self._result_buffers[key] = array_to_chunk_buffer(array)
+            return Content(
+                size=array.nbytes,
+                array=contiguous_array_info(array),
+                chunked=True,
+            )
+
+        buffer = ndarray_to_bytes(array)
         return Content(
-            size=size,
-            data=data,
-            sm_name=sm_name,
-            array=ArrayInfo(
-                shape=array.shape,
-                dtype=array.dtype.name,
-                strides=array.strides,
-            ),
+            array=contiguous_array_info(array),
+            **self._buffer_fields(buffer),
         )
 
-    def _any_to_content(self, obj: Any) -> Content:
+    def _any_to_content(self, obj: Any, key: Optional[ContentKey] = None) -> Content:
         if isinstance(obj, ndarray):
-            return self._array_to_content(obj)
+            return self._array_to_content(obj, key)
+
+        # Primitives skip the codec and the shared memory.
+        native = native_to_content(obj)
+        if native is not None:
+            return native
+        elif is_bytes_like(obj):
+            return self._raw_to_content(obj, key)
         else:
-            return self._object_to_content(obj)
+            return self._object_to_content(obj, key)
 
     def _args_to_contents(self, *args: Any) -> List[Content]:
-        return [self._any_to_content(o) for o in args]
+        return [self._any_to_content(o, i) for i, o in enumerate(args)]
 
     def _kwargs_to_contents(self, **kwargs: Any) -> Dict[str, Content]:
-        return {k: self._any_to_content(o) for k, o in kwargs.items()}
+        return {k: self._any_to_content(o, k) for k, o in kwargs.items()}
 
 
 async def call_router(
@@ -234,7 +518,22 @@ async def call_router(
     args: Iterable[Content],
     kwargs: Mapping[str, Content],
     sm_names: Iterable[str],
-):
+    options: Optional[RouteOptions] = None,
+    session: Optional[str] = None,
+    sm_cache: Optional[SharedMemoryAttachmentCache] = None,
+    plan: Optional[RoutePlan] = None,
+    buffers: Optional[ChunkBuffers] = None,
+    chunk_threshold=0,
+    codec_policy: Optional[CodecPolicy] = None,
+    local=False,
+    placement: Optional[PlacementPolicy] = None,
+    daemon_sm=False,
+    owner_pid: Optional[int] = None,
+    codec_executor: Optional[CodecExecutor] = None,
+    route_executor: Optional[RouteExecutor] = None,
+    route_name: Optional[str] = None,
+    file_ref_dirs: Sequence[str] = (),
+) -> ResultTuple:
     matcher = ParameterMatcher(
         func=func,
         match_info=match_info,
@@ -244,5 +543,20 @@ async def call_router(
         args=args,
         kwargs=kwargs,
         sm_names=sm_names,
+        options=options,
+        session=session,
+        sm_cache=sm_cache,
+        plan=plan,
+        buffers=buffers,
+        chunk_threshold=chunk_threshold,
+        codec_policy=codec_policy,
+        local=local,
+        placement=placement,
+        daemon_sm=daemon_sm,
+        owner_pid=owner_pid,
+        codec_executor=codec_executor,
+        route_executor=route_executor,
+        route_name=route_name,
+        file_ref_dirs=file_ref_dirs,
     )
     return await matcher.call()
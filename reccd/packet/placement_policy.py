@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+from time import perf_counter
+from typing import Callable, Optional
+
+from reccd.logging.logging import reccd_logger as logger
+from reccd.memory.shared_memory_queue import SharedMemoryQueue
+from reccd.proto.daemon.daemon_api_pb2 import Content
+from reccd.variables.rpc import (
+    DEFAULT_CALIBRATE_MAX_SIZE,
+    DEFAULT_CALIBRATE_MIN_SIZE,
+    DEFAULT_CALIBRATE_REPEAT,
+    DEFAULT_INLINE_THRESHOLD,
+)
+
+
+class PlacementPolicy:
+    """
+    Decides whether a buffer is placed inline in the packet or in shared memory.
+
+    Buffers up to ``inline_threshold`` bytes are inlined, because below that
+    size a segment round trip costs more than copying through the protobuf.
+    """
+
+    __slots__ = ("inline_threshold",)
+
+    def __init__(self, inline_threshold=DEFAULT_INLINE_THRESHOLD):
+        self.inline_threshold = inline_threshold
+
+    def __repr__(self) -> str:
+        return f"PlacementPolicy<inline_threshold={self.inline_threshold}>"
+
+    def use_shared_memory(self, size: int) -> bool:
+        return size > self.inline_threshold
+
+    @classmethod
+    def calibrate(cls, **kwargs) -> "PlacementPolicy":
+        return cls(calibrate_inline_threshold(**kwargs))
+
+
+def _best_seconds(func: Callable[[], None], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        begin = perf_counter()
+        func()
+        best = min(best, perf_counter() - begin)
+    return best
+
+
+def _inline_seconds(buffer: bytes, repeat: int) -> float:
+    def _inline() -> None:
+        data = Content(data=buffer).SerializeToString()
+        # Model the send and receive copies of the transport.
+        received = bytes(memoryview(bytes(memoryview(data))))
+        Content.FromString(received)
+
+    return _best_seconds(_inline, repeat)
+
+
+def _shared_memory_seconds(
+    smq: SharedMemoryQueue,
+    buffer: bytes,
+    repeat: int,
+) -> float:
+    def _shared_memory() -> None:
+        written = smq.write(buffer)
+        descriptor = Content(sm_name=written.sm_name, size=written.size)
+        content = Content.FromString(descriptor.SerializeToString())
+        sm = smq.find_working(content.sm_name)
+        assert sm.buf is not None
+        bytes(sm.buf[: content.size])
+        smq.restore(written.sm_name)
+
+    _shared_memory()  # Creates the segment outside of the measurement.
+    return _best_seconds(_shared_memory, repeat)
+
+
+def calibrate_inline_threshold(
+    min_size=DEFAULT_CALIBRATE_MIN_SIZE,
+    max_size=DEFAULT_CALIBRATE_MAX_SIZE,
+    repeat=DEFAULT_CALIBRATE_REPEAT,
+) -> int:
+    """
+    Measure on this host the largest power-of-two size below which inlining
+    is faster than a pooled shared memory segment.
+
+    The threshold is the size before the first two consecutive sizes
+    where shared memory wins, so that a single noisy sample is ignored.
+    """
+    if min_size <= 0 or max_size < min_size:
+        raise ValueError("Invalid calibration size range")
+
+    smq = SharedMemoryQueue()
+    threshold = max_size
+    previous: Optional[int] = None
+    try:
+        size = min_size
+        while size <= max_size:
+            buffer = bytes(size)
+            inline = _inline_seconds(buffer, repeat)
+            shared = _shared_memory_seconds(smq, buffer, repeat)
+            if shared < inline:
+                if previous is not None:
+                    threshold = previous // 2
+                    break
+                previous = size
+            else:
+                previous = None
+            size *= 2
+    finally:
+        smq.clear()
+
+    logger.debug(f"Calibrated inline threshold: {threshold} bytes")
+    return threshold
+
+
+DEFAULT_PLACEMENT_POLICY = PlacementPolicy()
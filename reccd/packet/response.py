@@ -1,21 +1,48 @@
 # -*- coding: utf-8 -*-
 
 from functools import reduce
-from typing import Any, Dict, List, Type, TypeVar, Union
+from typing import Any, Dict, List, Optional, Protocol, Type, TypeVar, Union
 
 from type_serialize import deserialize
 
 _T = TypeVar("_T")
 
 
+class Lease(Protocol):
+    def release(self) -> None: ...
+
+
 class Response:
 
     args: List[Any]
     kwargs: Dict[str, Any]
+    lease: Optional[Lease]
 
     def __init__(self, *args, **kwargs):
         self.args = list(args) if args else list()
         self.kwargs = {k: v for k, v in kwargs.items()} if kwargs else dict()
+        self.lease = None
+
+    @property
+    def leased(self) -> bool:
+        return self.lease is not None
+
+    def release(self) -> None:
+        """
+        Return the shared memory backing zero-copy results to the pool.
+
+        Arrays obtained from this response must not be used afterwards.
+        """
+        if self.lease is not None:
+            lease = self.lease
+            self.lease = None
+            lease.release()
+
+    def __enter__(self) -> "Response":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
 
     @property
     def is_args(self) -> bool:
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+from numpy import dtype as np_dtype
+from numpy import empty, ndarray, prod
+
+ShapeLike = Union[int, Sequence[int]]
+
+
+class ResultAllocator:
+    """
+    Allocates result arrays directly in the client's response shared memory.
+
+    Add a parameter annotated with this class to the route function.
+    If the route returns the allocated array as-is, only its descriptor is sent.
+    When there is no suitable segment, a normal ndarray is returned instead.
+    """
+
+    _secure: Callable[[int], Optional[SharedMemory]]
+    _allocated: Dict[int, str]
+    _arrays: List[ndarray]
+
+    def __init__(self, secure: Callable[[int], Optional[SharedMemory]]):
+        self._secure = secure
+        self._allocated = dict()
+        self._arrays = list()
+
+    def empty(self, shape: ShapeLike, dtype="uint8") -> ndarray:
+        dt = np_dtype(dtype)
+        shape = (shape,) if isinstance(shape, int) else tuple(shape)
+        nbytes = int(prod(shape)) * dt.itemsize
+
+        sm = self._secure(nbytes) if nbytes else None
+        if sm is None:
+            return empty(shape, dt)
+
+        array = ndarray(shape=shape, dtype=dt, buffer=sm.buf)
+        self._allocated[id(array)] = sm.name
+        self._arrays.append(array)  # Keep the id unique while allocated.
+        return array
+
+    def find(self, array: ndarray) -> Optional[str]:
+        return self._allocated.get(id(array))
+
+    def clear(self) -> None:
+        self._allocated.clear()
+        self._arrays.clear()
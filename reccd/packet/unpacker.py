@@ -5,9 +5,17 @@ from typing import Any, Dict, Iterable, List, Mapping, Optional
 
 from numpy import ndarray
 from type_serialize import ByteCoding
-from type_serialize.byte.byte_coder import bytes_to_object
 
-from reccd.packet.content_inspector import has_array, has_shared_memory
+from reccd.memory.parallel_copy import DEFAULT_PARALLEL_COPIER
+from reccd.packet.chunk import ChunkBuffers, ContentKey
+from reccd.packet.codec_policy import content_coding, decode_object
+from reccd.packet.content_inspector import (
+    has_array,
+    has_shared_memory,
+    shared_memory_slice,
+)
+from reccd.packet.native import content_to_native, has_native
+from reccd.packet.oob import unpickle_object
 from reccd.packet.response import Response
 from reccd.proto.daemon.daemon_api_pb2 import Content
 
@@ -19,6 +27,8 @@ class Unpacker:
     _args: List[Content]
     _kwargs: Dict[str, Content]
     _sms: Dict[str, SharedMemory]
+    _zero_copy: bool
+    _buffers: ChunkBuffers
 
     def __init__(
         self,
@@ -27,26 +37,66 @@ class Unpacker:
         args: Optional[Iterable[Content]] = None,
         kwargs: Optional[Mapping[str, Content]] = None,
         sms: Optional[Mapping[str, SharedMemory]] = None,
+        zero_copy=False,
+        buffers: Optional[ChunkBuffers] = None,
     ):
         self._coding = coding
         self._encoding = encoding
         self._args = list(args) if args else list()
         self._kwargs = dict(kwargs) if kwargs else dict()
         self._sms = dict(sms) if sms else dict()
+        self._zero_copy = zero_copy
+        self._buffers = buffers if buffers else dict()
 
-    def content_to_any(self, content: Content) -> Any:
-        if has_shared_memory(content):
-            if not self._sms:
-                raise ValueError("The shared-memory-list does not exist")
-            if content.sm_name not in self._sms:
-                raise IndexError(
-                    f"The shared-memory('{content.sm_name}') does not exist"
-                )
-            size = content.size
-            data = bytes(self._sms[content.sm_name].buf[:size])
+    def find_shared_memory(self, content: Content) -> SharedMemory:
+        if not self._sms:
+            raise ValueError("The shared-memory-list does not exist")
+        if content.sm_name not in self._sms:
+            raise IndexError(f"The shared-memory('{content.sm_name}') does not exist")
+        return self._sms[content.sm_name]
+
+    def content_to_any(self, content: Content, key: Optional[ContentKey] = None) -> Any:
+        if has_native(content):
+            return content_to_native(content)
+
+        if content.chunked:
+            if key not in self._buffers:
+                raise KeyError(f"The chunked content does not exist: {key}")
+            buffer = self._buffers[key]
+            if has_array(content):
+                return self.buffer_to_any(content, buffer)
+            # Not every decoder accepts a bytearray.
+            return self.buffer_to_any(content, bytes(buffer))
+
+        if not has_shared_memory(content):
+            return self.buffer_to_any(content, content.data)
+
+        sm = self.find_shared_memory(content)
+        assert sm.buf is not None
+        view = shared_memory_slice(content, sm.buf)
+        if not has_array(content):
+            return self.buffer_to_any(content, bytes(view))
+        elif self._zero_copy:
+            # The view is valid until the lease of the response is released.
+            return self.buffer_to_any(content, view)
+        else:
+            return self.buffer_to_any(content, DEFAULT_PARALLEL_COPIER.read(view))
+
+    def content_to_pickle_buffer(self, content: Content) -> Any:
+        if not has_shared_memory(content):
+            return content.data
+
+        sm = self.find_shared_memory(content)
+        assert sm.buf is not None
+        view = shared_memory_slice(content, sm.buf)
+        if self._zero_copy:
+            # The view is valid until the lease of the response is released.
+            return view
         else:
-            data = content.data
+            # Writable, like the buffers of a regular unpickle.
+            return DEFAULT_PARALLEL_COPIER.read(view, writable=True)
 
+    def buffer_to_any(self, content: Content, data: Any) -> Any:
         if has_array(content):
             return ndarray(
                 shape=content.array.shape,
@@ -54,14 +104,21 @@ class Unpacker:
                 buffer=data,
                 strides=content.array.strides,
             )
+        elif content.raw:
+            return data
+        elif content.pickled:
+            buffers = [self.content_to_pickle_buffer(oob) for oob in content.oob]
+            return unpickle_object(data, buffers)
         else:
-            return bytes_to_object(data=data, coding=self._coding)
+            coding = content_coding(content, self._coding)
+            arrays = [self.content_to_any(oob) for oob in content.oob]
+            return decode_object(data, coding, arrays)
 
     def args_to_anys(self) -> List[Any]:
-        return [self.content_to_any(arg) for arg in self._args]
+        return [self.content_to_any(arg, i) for i, arg in enumerate(self._args)]
 
     def kwargs_to_anys(self) -> Dict[str, Any]:
-        return {key: self.content_to_any(arg) for key, arg in self._kwargs.items()}
+        return {k: self.content_to_any(arg, k) for k, arg in self._kwargs.items()}
 
     def unpack(self) -> Response:
         args = self.args_to_anys()
@@ -75,6 +132,8 @@ def content_unpack(
     args: Optional[Iterable[Content]] = None,
     kwargs: Optional[Mapping[str, Content]] = None,
     sms: Optional[Mapping[str, SharedMemory]] = None,
+    zero_copy=False,
+    buffers: Optional[ChunkBuffers] = None,
 ) -> Response:
     unpacker = Unpacker(
         coding=coding,
@@ -82,5 +141,7 @@ def content_unpack(
         args=args,
         kwargs=kwargs,
         sms=sms,
+        zero_copy=zero_copy,
+        buffers=buffers,
     )
     return unpacker.unpack()
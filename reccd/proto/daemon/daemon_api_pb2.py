@@ -16,7 +16,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x10\x64\x61\x65mon_api.proto\x12\x12reccd.proto.daemon\"\x14\n\x03Pit\x12\r\n\x05\x64\x65lay\x18\x01 \x01(\x02\"\x11\n\x03Pat\x12\n\n\x02ok\x18\x01 \x01(\x08\"\xc0\x01\n\tRegisterQ\x12\x0f\n\x07session\x18\x01 \x01(\t\x12\x0c\n\x04\x61rgs\x18\x02 \x03(\t\x12\x39\n\x06kwargs\x18\x03 \x03(\x0b\x32).reccd.proto.daemon.RegisterQ.KwargsEntry\x12\x14\n\x0ctest_sm_name\x18\x04 \x01(\t\x12\x14\n\x0ctest_sm_pass\x18\x05 \x01(\t\x1a-\n\x0bKwargsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"t\n\tRegisterA\x12.\n\x04\x63ode\x18\x01 \x01(\x0e\x32 .reccd.proto.daemon.RegisterCode\x12\r\n\x05is_sm\x18\x02 \x01(\x08\x12\x13\n\x0bmin_sm_size\x18\x03 \x01(\x05\x12\x13\n\x0bmin_sm_byte\x18\x04 \x01(\x05\":\n\tArrayInfo\x12\r\n\x05shape\x18\x01 \x03(\x05\x12\r\n\x05\x64type\x18\x02 \x01(\t\x12\x0f\n\x07strides\x18\x03 \x03(\x05\"\x84\x01\n\x07\x43ontent\x12\x0c\n\x04size\x18\x01 \x01(\x05\x12\x0c\n\x04\x64\x61ta\x18\x02 \x01(\x0c\x12\x14\n\x07sm_name\x18\x03 \x01(\tH\x00\x88\x01\x01\x12\x31\n\x05\x61rray\x18\x04 \x01(\x0b\x32\x1d.reccd.proto.daemon.ArrayInfoH\x01\x88\x01\x01\x42\n\n\x08_sm_nameB\x08\n\x06_array\"\xa6\x02\n\x07PacketQ\x12\x0f\n\x07session\x18\x01 \x01(\t\x12\x0e\n\x06method\x18\x02 \x01(\t\x12\x0c\n\x04path\x18\x03 \x01(\t\x12*\n\x06\x63oding\x18\x04 \x01(\x0e\x32\x1a.reccd.proto.daemon.Coding\x12)\n\x04\x61rgs\x18\x05 \x03(\x0b\x32\x1b.reccd.proto.daemon.Content\x12\x37\n\x06kwargs\x18\x06 \x03(\x0b\x32\'.reccd.proto.daemon.PacketQ.KwargsEntry\x12\x10\n\x08sm_names\x18\x07 \x03(\t\x1aJ\n\x0bKwargsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12*\n\x05value\x18\x02 \x01(\x0b\x32\x1b.reccd.proto.daemon.Content:\x02\x38\x01\"\xb9\x01\n\x07PacketA\x12)\n\x04\x61rgs\x18\x03 \x03(\x0b\x32\x1b.reccd.proto.daemon.Content\x12\x37\n\x06kwargs\x18\x04 \x03(\x0b\x32\'.reccd.proto.daemon.PacketA.KwargsEntry\x1aJ\n\x0bKwargsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12*\n\x05value\x18\x02 \x01(\x0b\x32\x1b.reccd.proto.daemon.Content:\x02\x38\x01*9\n\x0cRegisterCode\x12\x0b\n\x07Success\x10\x00\x12\x1c\n\x18NotFoundRegisterFunction\x10\x01*\x86\x03\n\x06\x43oding\x12\x07\n\x03Raw\x10\x00\x12\x0b\n\x07Pickle5\x10\x01\x12\x08\n\x04Json\x10\x02\x12\x0c\n\x08JsonZlib\x10\x03\x12\x0c\n\x08JsonGzip\x10\x04\x12\x0c\n\x08JsonLzma\x10\x05\x12\x0b\n\x07JsonBz2\x10\x06\x12\n\n\x06Pyjson\x10\x07\x12\x0e\n\nPyjsonZlib\x10\x08\x12\x0e\n\nPyjsonGzip\x10\t\x12\x0e\n\nPyjsonLzma\x10\n\x12\r\n\tPyjsonBz2\x10\x0b\x12\n\n\x06Orjson\x10\x0c\x12\x0e\n\nOrjsonZlib\x10\r\x12\x0e\n\nOrjsonGzip\x10\x0e\x12\x0e\n\nOrjsonLzma\x10\x0f\x12\r\n\tOrjsonBz2\x10\x10\x12\x0b\n\x07Msgpack\x10\x11\x12\x0f\n\x0bMsgpackZlib\x10\x12\x12\x0f\n\x0bMsgpackGzip\x10\x13\x12\x0f\n\x0bMsgpackLzma\x10\x14\x12\x0e\n\nMsgpackBz2\x10\x15\x12\x08\n\x04Yaml\x10\x16\x12\x0c\n\x08YamlZlib\x10\x17\x12\x0c\n\x08YamlGzip\x10\x18\x12\x0c\n\x08YamlLzma\x10\x19\x12\x0b\n\x07YamlBz2\x10\x1a\x32\xde\x01\n\tDaemonApi\x12?\n\tHeartbeat\x12\x17.reccd.proto.daemon.Pit\x1a\x17.reccd.proto.daemon.Pat\"\x00\x12J\n\x08Register\x12\x1d.reccd.proto.daemon.RegisterQ\x1a\x1d.reccd.proto.daemon.RegisterA\"\x00\x12\x44\n\x06Packet\x12\x1b.reccd.proto.daemon.PacketQ\x1a\x1b.reccd.proto.daemon.PacketA\"\x00\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x10\x64\x61\x65mon_api.proto\x12\x12reccd.proto.daemon\"\x14\n\x03Pit\x12\r\n\x05\x64\x65lay\x18\x01 \x01(\x02\"\x11\n\x03Pat\x12\n\n\x02ok\x18\x01 \x01(\x08\"\x94\x02\n\tRegisterQ\x12\x0f\n\x07session\x18\x01 \x01(\t\x12\x0c\n\x04\x61rgs\x18\x02 \x03(\t\x12\x39\n\x06kwargs\x18\x03 \x03(\x0b\x32).reccd.proto.daemon.RegisterQ.KwargsEntry\x12\x14\n\x0ctest_sm_name\x18\x04 \x01(\t\x12\x14\n\x0ctest_sm_pass\x18\x05 \x01(\t\x12\x13\n\x0broute_table\x18\x06 \x01(\x08\x12\x0b\n\x03pid\x18\x07 \x01(\x05\x12\x17\n\x0ftest_memfd_name\x18\x08 \x01(\t\x12\x17\n\x0ftest_memfd_pass\x18\t \x01(\t\x1a-\n\x0bKwargsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"5\n\tRouteInfo\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0e\n\x06method\x18\x02 \x01(\t\x12\x0c\n\x04path\x18\x03 \x01(\t\"\xfc\x01\n\tRegisterA\x12.\n\x04\x63ode\x18\x01 \x01(\x0e\x32 .reccd.proto.daemon.RegisterCode\x12\r\n\x05is_sm\x18\x02 \x01(\x08\x12\x13\n\x0bmin_sm_size\x18\x03 \x01(\x05\x12\x13\n\x0bmin_sm_byte\x18\x04 \x01(\x05\x12-\n\x06routes\x18\x05 \x03(\x0b\x32\x1d.reccd.proto.daemon.RouteInfo\x12\x18\n\x10inline_threshold\x18\x06 \x01(\x03\x12\x11\n\tdaemon_sm\x18\x07 \x01(\x08\x12\x15\n\rmemfd_address\x18\x08 \x01(\t\x12\x13\n\x0broute_epoch\x18\t \x01(\t\":\n\tArrayInfo\x12\r\n\x05shape\x18\x01 \x03(\x05\x12\r\n\x05\x64type\x18\x02 \x01(\t\x12\x0f\n\x07strides\x18\x03 \x03(\x05\"\x85\x04\n\x07\x43ontent\x12\x0c\n\x04size\x18\x01 \x01(\x03\x12\x0c\n\x04\x64\x61ta\x18\x02 \x01(\x0c\x12\x14\n\x07sm_name\x18\x03 \x01(\tH\x01\x88\x01\x01\x12\x31\n\x05\x61rray\x18\x04 \x01(\x0b\x32\x1d.reccd.proto.daemon.ArrayInfoH\x02\x88\x01\x01\x12\x0f\n\x07\x63hunked\x18\x05 \x01(\x08\x12/\n\x06\x63oding\x18\x06 \x01(\x0e\x32\x1a.reccd.proto.daemon.CodingH\x03\x88\x01\x01\x12(\n\x03oob\x18\x07 \x03(\x0b\x32\x1b.reccd.proto.daemon.Content\x12\x0f\n\x07pickled\x18\x08 \x01(\x08\x12\x14\n\nnone_value\x18\t \x01(\x08H\x00\x12\x14\n\nbool_value\x18\n \x01(\x08H\x00\x12\x13\n\tint_value\x18\x0b \x01(\x12H\x00\x12\x15\n\x0b\x66loat_value\x18\x0c \x01(\x01H\x00\x12\x13\n\tstr_value\x18\r \x01(\tH\x00\x12\x15\n\x0b\x62ytes_value\x18\x0e \x01(\x0cH\x00\x12\x0b\n\x03raw\x18\x0f \x01(\x08\x12\x11\n\tsm_offset\x18\x10 \x01(\x03\x12\x10\n\x08sm_owned\x18\x11 \x01(\x08\x12.\n\x04\x66ile\x18\x12 \x01(\x0b\x32\x1b.reccd.proto.daemon.FileRefH\x04\x88\x01\x01\x42\x08\n\x06nativeB\n\n\x08_sm_nameB\x08\n\x06_arrayB\t\n\x07_codingB\x07\n\x05_file\"k\n\x07\x46ileRef\x12\x0c\n\x04path\x18\x01 \x01(\t\x12\x0e\n\x06offset\x18\x02 \x01(\x03\x12\x0e\n\x06\x64\x65vice\x18\x03 \x01(\x04\x12\r\n\x05inode\x18\x04 \x01(\x04\x12\x11\n\tfile_size\x18\x05 \x01(\x03\x12\x10\n\x08mtime_ns\x18\x06 \x01(\x03\"9\n\x0b\x46ileAccessQ\x12*\n\x05\x66iles\x18\x01 \x03(\x0b\x32\x1b.reccd.proto.daemon.FileRef\"\x1e\n\x0b\x46ileAccessA\x12\x0f\n\x07visible\x18\x01 \x03(\x08\"V\n\x0c\x43ontentChunk\x12\r\n\x03\x61rg\x18\x01 \x01(\x05H\x00\x12\x0f\n\x05kwarg\x18\x02 \x01(\tH\x00\x12\x0e\n\x06offset\x18\x03 \x01(\x03\x12\x0c\n\x04\x64\x61ta\x18\x04 \x01(\x0c\x42\x08\n\x06target\"\xab\x04\n\x07PacketQ\x12\x0f\n\x07session\x18\x01 \x01(\t\x12\x0e\n\x06method\x18\x02 \x01(\t\x12\x0c\n\x04path\x18\x03 \x01(\t\x12*\n\x06\x63oding\x18\x04 \x01(\x0e\x32\x1a.reccd.proto.daemon.Coding\x12)\n\x04\x61rgs\x18\x05 \x03(\x0b\x32\x1b.reccd.proto.daemon.Content\x12\x37\n\x06kwargs\x18\x06 \x03(\x0b\x32\'.reccd.proto.daemon.PacketQ.KwargsEntry\x12\x10\n\x08sm_names\x18\x07 \x03(\t\x12\x19\n\x11unlinked_sm_names\x18\x08 \x03(\t\x12\x15\n\x08route_id\x18\t \x01(\x05H\x00\x88\x01\x01\x12>\n\nmatch_info\x18\n \x03(\x0b\x32*.reccd.proto.daemon.PacketQ.MatchInfoEntry\x12\x16\n\x0e\x63orrelation_id\x18\x0b \x01(\x04\x12\x12\n\nchunk_size\x18\x0c \x01(\x05\x12\x11\n\tdaemon_sm\x18\r \x01(\x08\x12\x13\n\x0broute_epoch\x18\x0e \x01(\t\x1aJ\n\x0bKwargsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12*\n\x05value\x18\x02 \x01(\x0b\x32\x1b.reccd.proto.daemon.Content:\x02\x38\x01\x1a\x30\n\x0eMatchInfoEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x42\x0b\n\t_route_id\"\xe0\x01\n\x07PacketA\x12)\n\x04\x61rgs\x18\x03 \x03(\x0b\x32\x1b.reccd.proto.daemon.Content\x12\x37\n\x06kwargs\x18\x04 \x03(\x0b\x32\'.reccd.proto.daemon.PacketA.KwargsEntry\x12\x16\n\x0e\x63orrelation_id\x18\x05 \x01(\x04\x12\r\n\x05\x65rror\x18\x06 \x01(\t\x1aJ\n\x0bKwargsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12*\n\x05value\x18\x02 \x01(\x0b\x32\x1b.reccd.proto.daemon.Content:\x02\x38\x01\"P\n\x0cPacketBatchQ\x12,\n\x07packets\x18\x01 \x03(\x0b\x32\x1b.reccd.proto.daemon.PacketQ\x12\x12\n\nconcurrent\x18\x02 \x01(\x08\"<\n\x0cPacketBatchA\x12,\n\x07packets\x18\x01 \x03(\x0b\x32\x1b.reccd.proto.daemon.PacketA\"x\n\x0cPacketChunkQ\x12-\n\x06header\x18\x01 \x01(\x0b\x32\x1b.reccd.proto.daemon.PacketQH\x00\x12\x31\n\x05\x63hunk\x18\x02 \x01(\x0b\x32 .reccd.proto.daemon.ContentChunkH\x00\x42\x06\n\x04\x62ody\"x\n\x0cPacketChunkA\x12-\n\x06header\x18\x01 \x01(\x0b\x32\x1b.reccd.proto.daemon.PacketAH\x00\x12\x31\n\x05\x63hunk\x18\x02 \x01(\x0b\x32 .reccd.proto.daemon.ContentChunkH\x00\x42\x06\n\x04\x62ody*9\n\x0cRegisterCode\x12\x0b\n\x07Success\x10\x00\x12\x1c\n\x18NotFoundRegisterFunction\x10\x01*\x86\x03\n\x06\x43oding\x12\x07\n\x03Raw\x10\x00\x12\x0b\n\x07Pickle5\x10\x01\x12\x08\n\x04Json\x10\x02\x12\x0c\n\x08JsonZlib\x10\x03\x12\x0c\n\x08JsonGzip\x10\x04\x12\x0c\n\x08JsonLzma\x10\x05\x12\x0b\n\x07JsonBz2\x10\x06\x12\n\n\x06Pyjson\x10\x07\x12\x0e\n\nPyjsonZlib\x10\x08\x12\x0e\n\nPyjsonGzip\x10\t\x12\x0e\n\nPyjsonLzma\x10\n\x12\r\n\tPyjsonBz2\x10\x0b\x12\n\n\x06Orjson\x10\x0c\x12\x0e\n\nOrjsonZlib\x10\r\x12\x0e\n\nOrjsonGzip\x10\x0e\x12\x0e\n\nOrjsonLzma\x10\x0f\x12\r\n\tOrjsonBz2\x10\x10\x12\x0b\n\x07Msgpack\x10\x11\x12\x0f\n\x0bMsgpackZlib\x10\x12\x12\x0f\n\x0bMsgpackGzip\x10\x13\x12\x0f\n\x0bMsgpackLzma\x10\x14\x12\x0e\n\nMsgpackBz2\x10\x15\x12\x08\n\x04Yaml\x10\x16\x12\x0c\n\x08YamlZlib\x10\x17\x12\x0c\n\x08YamlGzip\x10\x18\x12\x0c\n\x08YamlLzma\x10\x19\x12\x0b\n\x07YamlBz2\x10\x1a\x32\xb0\x04\n\tDaemonApi\x12?\n\tHeartbeat\x12\x17.reccd.proto.daemon.Pit\x1a\x17.reccd.proto.daemon.Pat\"\x00\x12J\n\x08Register\x12\x1d.reccd.proto.daemon.RegisterQ\x1a\x1d.reccd.proto.daemon.RegisterA\"\x00\x12\x44\n\x06Packet\x12\x1b.reccd.proto.daemon.PacketQ\x1a\x1b.reccd.proto.daemon.PacketA\"\x00\x12N\n\x0cPacketStream\x12\x1b.reccd.proto.daemon.PacketQ\x1a\x1b.reccd.proto.daemon.PacketA\"\x00(\x01\x30\x01\x12S\n\x0bPacketBatch\x12 .reccd.proto.daemon.PacketBatchQ\x1a .reccd.proto.daemon.PacketBatchA\"\x00\x12Y\n\rPacketChunked\x12 .reccd.proto.daemon.PacketChunkQ\x1a .reccd.proto.daemon.PacketChunkA\"\x00(\x01\x30\x01\x12P\n\nFileAccess\x12\x1f.reccd.proto.daemon.FileAccessQ\x1a\x1f.reccd.proto.daemon.FileAccessA\"\x00\x62\x06proto3')
 
 _REGISTERCODE = DESCRIPTOR.enum_types_by_name['RegisterCode']
 RegisterCode = enum_type_wrapper.EnumTypeWrapper(_REGISTERCODE)
@@ -57,13 +57,23 @@ _PIT = DESCRIPTOR.message_types_by_name['Pit']
 _PAT = DESCRIPTOR.message_types_by_name['Pat']
 _REGISTERQ = DESCRIPTOR.message_types_by_name['RegisterQ']
 _REGISTERQ_KWARGSENTRY = _REGISTERQ.nested_types_by_name['KwargsEntry']
+_ROUTEINFO = DESCRIPTOR.message_types_by_name['RouteInfo']
 _REGISTERA = DESCRIPTOR.message_types_by_name['RegisterA']
 _ARRAYINFO = DESCRIPTOR.message_types_by_name['ArrayInfo']
 _CONTENT = DESCRIPTOR.message_types_by_name['Content']
+_FILEREF = DESCRIPTOR.message_types_by_name['FileRef']
+_FILEACCESSQ = DESCRIPTOR.message_types_by_name['FileAccessQ']
+_FILEACCESSA = DESCRIPTOR.message_types_by_name['FileAccessA']
+_CONTENTCHUNK = DESCRIPTOR.message_types_by_name['ContentChunk']
 _PACKETQ = DESCRIPTOR.message_types_by_name['PacketQ']
 _PACKETQ_KWARGSENTRY = _PACKETQ.nested_types_by_name['KwargsEntry']
+_PACKETQ_MATCHINFOENTRY = _PACKETQ.nested_types_by_name['MatchInfoEntry']
 _PACKETA = DESCRIPTOR.message_types_by_name['PacketA']
 _PACKETA_KWARGSENTRY = _PACKETA.nested_types_by_name['KwargsEntry']
+_PACKETBATCHQ = DESCRIPTOR.message_types_by_name['PacketBatchQ']
+_PACKETBATCHA = DESCRIPTOR.message_types_by_name['PacketBatchA']
+_PACKETCHUNKQ = DESCRIPTOR.message_types_by_name['PacketChunkQ']
+_PACKETCHUNKA = DESCRIPTOR.message_types_by_name['PacketChunkA']
 Pit = _reflection.GeneratedProtocolMessageType('Pit', (_message.Message,), {
   'DESCRIPTOR' : _PIT,
   '__module__' : 'daemon_api_pb2'
@@ -93,6 +103,13 @@ RegisterQ = _reflection.GeneratedProtocolMessageType('RegisterQ', (_message.Mess
 _sym_db.RegisterMessage(RegisterQ)
 _sym_db.RegisterMessage(RegisterQ.KwargsEntry)
 
+RouteInfo = _reflection.GeneratedProtocolMessageType('RouteInfo', (_message.Message,), {
+  'DESCRIPTOR' : _ROUTEINFO,
+  '__module__' : 'daemon_api_pb2'
+  # @@protoc_insertion_point(class_scope:reccd.proto.daemon.RouteInfo)
+  })
+_sym_db.RegisterMessage(RouteInfo)
+
 RegisterA = _reflection.GeneratedProtocolMessageType('RegisterA', (_message.Message,), {
   'DESCRIPTOR' : _REGISTERA,
   '__module__' : 'daemon_api_pb2'
@@ -114,6 +131,34 @@ Content = _reflection.GeneratedProtocolMessageType('Content', (_message.Message,
   })
 _sym_db.RegisterMessage(Content)
 
+FileRef = _reflection.GeneratedProtocolMessageType('FileRef', (_message.Message,), {
+  'DESCRIPTOR' : _FILEREF,
+  '__module__' : 'daemon_api_pb2'
+  # @@protoc_insertion_point(class_scope:reccd.proto.daemon.FileRef)
+  })
+_sym_db.RegisterMessage(FileRef)
+
+FileAccessQ = _reflection.GeneratedProtocolMessageType('FileAccessQ', (_message.Message,), {
+  'DESCRIPTOR' : _FILEACCESSQ,
+  '__module__' : 'daemon_api_pb2'
+  # @@protoc_insertion_point(class_scope:reccd.proto.daemon.FileAccessQ)
+  })
+_sym_db.RegisterMessage(FileAccessQ)
+
+FileAccessA = _reflection.GeneratedProtocolMessageType('FileAccessA', (_message.Message,), {
+  'DESCRIPTOR' : _FILEACCESSA,
+  '__module__' : 'daemon_api_pb2'
+  # @@protoc_insertion_point(class_scope:reccd.proto.daemon.FileAccessA)
+  })
+_sym_db.RegisterMessage(FileAccessA)
+
+ContentChunk = _reflection.GeneratedProtocolMessageType('ContentChunk', (_message.Message,), {
+  'DESCRIPTOR' : _CONTENTCHUNK,
+  '__module__' : 'daemon_api_pb2'
+  # @@protoc_insertion_point(class_scope:reccd.proto.daemon.ContentChunk)
+  })
+_sym_db.RegisterMessage(ContentChunk)
+
 PacketQ = _reflection.GeneratedProtocolMessageType('PacketQ', (_message.Message,), {
 
   'KwargsEntry' : _reflection.GeneratedProtocolMessageType('KwargsEntry', (_message.Message,), {
@@ -122,12 +167,20 @@ PacketQ = _reflection.GeneratedProtocolMessageType('PacketQ', (_message.Message,
     # @@protoc_insertion_point(class_scope:reccd.proto.daemon.PacketQ.KwargsEntry)
     })
   ,
+
+  'MatchInfoEntry' : _reflection.GeneratedProtocolMessageType('MatchInfoEntry', (_message.Message,), {
+    'DESCRIPTOR' : _PACKETQ_MATCHINFOENTRY,
+    '__module__' : 'daemon_api_pb2'
+    # @@protoc_insertion_point(class_scope:reccd.proto.daemon.PacketQ.MatchInfoEntry)
+    })
+  ,
   'DESCRIPTOR' : _PACKETQ,
   '__module__' : 'daemon_api_pb2'
   # @@protoc_insertion_point(class_scope:reccd.proto.daemon.PacketQ)
   })
 _sym_db.RegisterMessage(PacketQ)
 _sym_db.RegisterMessage(PacketQ.KwargsEntry)
+_sym_db.RegisterMessage(PacketQ.MatchInfoEntry)
 
 PacketA = _reflection.GeneratedProtocolMessageType('PacketA', (_message.Message,), {
 
@@ -144,6 +197,34 @@ PacketA = _reflection.GeneratedProtocolMessageType('PacketA', (_message.Message,
 _sym_db.RegisterMessage(PacketA)
 _sym_db.RegisterMessage(PacketA.KwargsEntry)
 
+PacketBatchQ = _reflection.GeneratedProtocolMessageType('PacketBatchQ', (_message.Message,), {
+  'DESCRIPTOR' : _PACKETBATCHQ,
+  '__module__' : 'daemon_api_pb2'
+  # @@protoc_insertion_point(class_scope:reccd.proto.daemon.PacketBatchQ)
+  })
+_sym_db.RegisterMessage(PacketBatchQ)
+
+PacketBatchA = _reflection.GeneratedProtocolMessageType('PacketBatchA', (_message.Message,), {
+  'DESCRIPTOR' : _PACKETBATCHA,
+  '__module__' : 'daemon_api_pb2'
+  # @@protoc_insertion_point(class_scope:reccd.proto.daemon.PacketBatchA)
+  })
+_sym_db.RegisterMessage(PacketBatchA)
+
+PacketChunkQ = _reflection.GeneratedProtocolMessageType('PacketChunkQ', (_message.Message,), {
+  'DESCRIPTOR' : _PACKETCHUNKQ,
+  '__module__' : 'daemon_api_pb2'
+  # @@protoc_insertion_point(class_scope:reccd.proto.daemon.PacketChunkQ)
+  })
+_sym_db.RegisterMessage(PacketChunkQ)
+
+PacketChunkA = _reflection.GeneratedProtocolMessageType('PacketChunkA', (_message.Message,), {
+  'DESCRIPTOR' : _PACKETCHUNKA,
+  '__module__' : 'daemon_api_pb2'
+  # @@protoc_insertion_point(class_scope:reccd.proto.daemon.PacketChunkA)
+  })
+_sym_db.RegisterMessage(PacketChunkA)
+
 _DAEMONAPI = DESCRIPTOR.services_by_name['DaemonApi']
 if _descriptor._USE_C_DESCRIPTORS == False:
 
@@ -152,34 +233,56 @@ if _descriptor._USE_C_DESCRIPTORS == False:
   _REGISTERQ_KWARGSENTRY._serialized_options = b'8\001'
   _PACKETQ_KWARGSENTRY._options = None
   _PACKETQ_KWARGSENTRY._serialized_options = b'8\001'
+  _PACKETQ_MATCHINFOENTRY._options = None
+  _PACKETQ_MATCHINFOENTRY._serialized_options = b'8\001'
   _PACKETA_KWARGSENTRY._options = None
   _PACKETA_KWARGSENTRY._serialized_options = b'8\001'
-  _REGISTERCODE._serialized_start=1074
-  _REGISTERCODE._serialized_end=1131
-  _CODING._serialized_start=1134
-  _CODING._serialized_end=1524
+  _REGISTERCODE._serialized_start=2711
+  _REGISTERCODE._serialized_end=2768
+  _CODING._serialized_start=2771
+  _CODING._serialized_end=3161
   _PIT._serialized_start=40
   _PIT._serialized_end=60
   _PAT._serialized_start=62
   _PAT._serialized_end=79
   _REGISTERQ._serialized_start=82
-  _REGISTERQ._serialized_end=274
-  _REGISTERQ_KWARGSENTRY._serialized_start=229
-  _REGISTERQ_KWARGSENTRY._serialized_end=274
-  _REGISTERA._serialized_start=276
-  _REGISTERA._serialized_end=392
-  _ARRAYINFO._serialized_start=394
-  _ARRAYINFO._serialized_end=452
-  _CONTENT._serialized_start=455
-  _CONTENT._serialized_end=587
-  _PACKETQ._serialized_start=590
-  _PACKETQ._serialized_end=884
-  _PACKETQ_KWARGSENTRY._serialized_start=810
-  _PACKETQ_KWARGSENTRY._serialized_end=884
-  _PACKETA._serialized_start=887
-  _PACKETA._serialized_end=1072
-  _PACKETA_KWARGSENTRY._serialized_start=810
-  _PACKETA_KWARGSENTRY._serialized_end=884
-  _DAEMONAPI._serialized_start=1527
-  _DAEMONAPI._serialized_end=1749
+  _REGISTERQ._serialized_end=358
+  _REGISTERQ_KWARGSENTRY._serialized_start=313
+  _REGISTERQ_KWARGSENTRY._serialized_end=358
+  _ROUTEINFO._serialized_start=360
+  _ROUTEINFO._serialized_end=413
+  _REGISTERA._serialized_start=416
+  _REGISTERA._serialized_end=668
+  _ARRAYINFO._serialized_start=670
+  _ARRAYINFO._serialized_end=728
+  _CONTENT._serialized_start=731
+  _CONTENT._serialized_end=1248
+  _FILEREF._serialized_start=1250
+  _FILEREF._serialized_end=1357
+  _FILEACCESSQ._serialized_start=1359
+  _FILEACCESSQ._serialized_end=1416
+  _FILEACCESSA._serialized_start=1418
+  _FILEACCESSA._serialized_end=1448
+  _CONTENTCHUNK._serialized_start=1450
+  _CONTENTCHUNK._serialized_end=1536
+  _PACKETQ._serialized_start=1539
+  _PACKETQ._serialized_end=2094
+  _PACKETQ_KWARGSENTRY._serialized_start=1957
+  _PACKETQ_KWARGSENTRY._serialized_end=2031
+  _PACKETQ_MATCHINFOENTRY._serialized_start=2033
+  _PACKETQ_MATCHINFOENTRY._serialized_end=2081
+  _PACKETA._serialized_start=2097
+  _PACKETA._serialized_end=2321
+  _PACKETA_KWARGSENTRY._serialized_start=1957
+  _PACKETA_KWARGSENTRY._serialized_end=2031
+  _PACKETBATCHQ._serialized_start=2323
+  _PACKETBATCHQ._serialized_end=2403
+  _PACKETBATCHA._serialized_start=2405
+  _PACKETBATCHA._serialized_end=2465
+  _PACKETCHUNKQ._serialized_start=2467
+  _PACKETCHUNKQ._serialized_end=2587
+  _PACKETCHUNKA._serialized_start=2589
+  _PACKETCHUNKA._serialized_end=2709
+  _DAEMONAPI._serialized_start=3164
+  _DAEMONAPI._serialized_end=3724
 # @@protoc_insertion_point(module_scope)
@@ -154,6 +154,10 @@ class RegisterQ(google.protobuf.message.Message):
     KWARGS_FIELD_NUMBER: builtins.int
     TEST_SM_NAME_FIELD_NUMBER: builtins.int
     TEST_SM_PASS_FIELD_NUMBER: builtins.int
+    ROUTE_TABLE_FIELD_NUMBER: builtins.int
+    PID_FIELD_NUMBER: builtins.int
+    TEST_MEMFD_NAME_FIELD_NUMBER: builtins.int
+    TEST_MEMFD_PASS_FIELD_NUMBER: builtins.int
     session: typing.Text
     @property
     def args(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[typing.Text]: ...
@@ -161,6 +165,18 @@ class RegisterQ(google.protobuf.message.Message):
     def kwargs(self) -> google.protobuf.internal.containers.ScalarMap[typing.Text, typing.Text]: ...
     test_sm_name: typing.Text
     test_sm_pass: typing.Text
+    route_table: builtins.bool
+    """Request the route table of the daemon."""
+
+    pid: builtins.int
+    """Process ID of the client, which owns the segments the daemon creates for it."""
+
+    test_memfd_name: typing.Text
+    """Test segment passed over the memfd side channel of the daemon,
+    which is checked independently of `test_sm_name`.
+    """
+
+    test_memfd_pass: typing.Text
     def __init__(self,
         *,
         session: typing.Text = ...,
@@ -168,28 +184,77 @@ class RegisterQ(google.protobuf.message.Message):
         kwargs: typing.Optional[typing.Mapping[typing.Text, typing.Text]] = ...,
         test_sm_name: typing.Text = ...,
         test_sm_pass: typing.Text = ...,
+        route_table: builtins.bool = ...,
+        pid: builtins.int = ...,
+        test_memfd_name: typing.Text = ...,
+        test_memfd_pass: typing.Text = ...,
         ) -> None: ...
-    def ClearField(self, field_name: typing_extensions.Literal["args",b"args","kwargs",b"kwargs","session",b"session","test_sm_name",b"test_sm_name","test_sm_pass",b"test_sm_pass"]) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal["args",b"args","kwargs",b"kwargs","pid",b"pid","route_table",b"route_table","session",b"session","test_memfd_name",b"test_memfd_name","test_memfd_pass",b"test_memfd_pass","test_sm_name",b"test_sm_name","test_sm_pass",b"test_sm_pass"]) -> None: ...
 global___RegisterQ = RegisterQ
 
+class RouteInfo(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    ID_FIELD_NUMBER: builtins.int
+    METHOD_FIELD_NUMBER: builtins.int
+    PATH_FIELD_NUMBER: builtins.int
+    id: builtins.int
+    method: typing.Text
+    path: typing.Text
+    def __init__(self,
+        *,
+        id: builtins.int = ...,
+        method: typing.Text = ...,
+        path: typing.Text = ...,
+        ) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal["id",b"id","method",b"method","path",b"path"]) -> None: ...
+global___RouteInfo = RouteInfo
+
 class RegisterA(google.protobuf.message.Message):
     DESCRIPTOR: google.protobuf.descriptor.Descriptor
     CODE_FIELD_NUMBER: builtins.int
     IS_SM_FIELD_NUMBER: builtins.int
     MIN_SM_SIZE_FIELD_NUMBER: builtins.int
     MIN_SM_BYTE_FIELD_NUMBER: builtins.int
+    ROUTES_FIELD_NUMBER: builtins.int
+    INLINE_THRESHOLD_FIELD_NUMBER: builtins.int
+    DAEMON_SM_FIELD_NUMBER: builtins.int
+    MEMFD_ADDRESS_FIELD_NUMBER: builtins.int
+    ROUTE_EPOCH_FIELD_NUMBER: builtins.int
     code: global___RegisterCode.ValueType
     is_sm: builtins.bool
     min_sm_size: builtins.int
     min_sm_byte: builtins.int
+    @property
+    def routes(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___RouteInfo]:
+        """Only filled in if `RegisterQ.route_table` is set."""
+        pass
+    inline_threshold: builtins.int
+    """Buffers up to this size are placed inline rather than in shared memory."""
+
+    daemon_sm: builtins.bool
+    """The daemon can allocate the segments of large answer contents itself."""
+
+    memfd_address: typing.Text
+    """UDS address of the side channel that receives memfd descriptors.
+    Empty unless the daemon received the test memfd segment of the client.
+    """
+
+    route_epoch: typing.Text
+    """Digest of the route table, which the route IDs of `routes` belong to."""
+
     def __init__(self,
         *,
         code: global___RegisterCode.ValueType = ...,
         is_sm: builtins.bool = ...,
         min_sm_size: builtins.int = ...,
         min_sm_byte: builtins.int = ...,
+        routes: typing.Optional[typing.Iterable[global___RouteInfo]] = ...,
+        inline_threshold: builtins.int = ...,
+        daemon_sm: builtins.bool = ...,
+        memfd_address: typing.Text = ...,
+        route_epoch: typing.Text = ...,
         ) -> None: ...
-    def ClearField(self, field_name: typing_extensions.Literal["code",b"code","is_sm",b"is_sm","min_sm_byte",b"min_sm_byte","min_sm_size",b"min_sm_size"]) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal["code",b"code","daemon_sm",b"daemon_sm","inline_threshold",b"inline_threshold","is_sm",b"is_sm","memfd_address",b"memfd_address","min_sm_byte",b"min_sm_byte","min_sm_size",b"min_sm_size","route_epoch",b"route_epoch","routes",b"routes"]) -> None: ...
 global___RegisterA = RegisterA
 
 class ArrayInfo(google.protobuf.message.Message):
@@ -217,26 +282,169 @@ class Content(google.protobuf.message.Message):
     DATA_FIELD_NUMBER: builtins.int
     SM_NAME_FIELD_NUMBER: builtins.int
     ARRAY_FIELD_NUMBER: builtins.int
+    CHUNKED_FIELD_NUMBER: builtins.int
+    CODING_FIELD_NUMBER: builtins.int
+    OOB_FIELD_NUMBER: builtins.int
+    PICKLED_FIELD_NUMBER: builtins.int
+    NONE_VALUE_FIELD_NUMBER: builtins.int
+    BOOL_VALUE_FIELD_NUMBER: builtins.int
+    INT_VALUE_FIELD_NUMBER: builtins.int
+    FLOAT_VALUE_FIELD_NUMBER: builtins.int
+    STR_VALUE_FIELD_NUMBER: builtins.int
+    BYTES_VALUE_FIELD_NUMBER: builtins.int
+    RAW_FIELD_NUMBER: builtins.int
+    SM_OFFSET_FIELD_NUMBER: builtins.int
+    SM_OWNED_FIELD_NUMBER: builtins.int
+    FILE_FIELD_NUMBER: builtins.int
     size: builtins.int
     data: builtins.bytes
     sm_name: typing.Text
     @property
     def array(self) -> global___ArrayInfo: ...
+    chunked: builtins.bool
+    """The data follows in `ContentChunk` messages."""
+
+    coding: global___Coding.ValueType
+    """Overrides `PacketQ.coding` for this content."""
+
+    @property
+    def oob(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___Content]:
+        """Arrays nested in the encoded object, which refers to them by index.
+        For a pickled content, the out-of-band buffers of the pickle instead.
+        """
+        pass
+    pickled: builtins.bool
+    """The data is the object itself pickled with protocol 5."""
+
+    none_value: builtins.bool
+    bool_value: builtins.bool
+    int_value: builtins.int
+    float_value: builtins.float
+    str_value: typing.Text
+    bytes_value: builtins.bytes
+    raw: builtins.bool
+    """The data is a bytes-like object as-is, without the codec."""
+
+    sm_offset: builtins.int
+    """Offset of the data in the `sm_name` segment."""
+
+    sm_owned: builtins.bool
+    """The `sm_name` segment was created by the sender, and its ownership
+    passes to the receiver, which must unlink it.
+    """
+
+    @property
+    def file(self) -> global___FileRef:
+        """The array is memory-mapped by the receiver from this file."""
+        pass
     def __init__(self,
         *,
         size: builtins.int = ...,
         data: builtins.bytes = ...,
         sm_name: typing.Optional[typing.Text] = ...,
         array: typing.Optional[global___ArrayInfo] = ...,
+        chunked: builtins.bool = ...,
+        coding: typing.Optional[global___Coding.ValueType] = ...,
+        oob: typing.Optional[typing.Iterable[global___Content]] = ...,
+        pickled: builtins.bool = ...,
+        none_value: builtins.bool = ...,
+        bool_value: builtins.bool = ...,
+        int_value: builtins.int = ...,
+        float_value: builtins.float = ...,
+        str_value: typing.Text = ...,
+        bytes_value: builtins.bytes = ...,
+        raw: builtins.bool = ...,
+        sm_offset: builtins.int = ...,
+        sm_owned: builtins.bool = ...,
+        file: typing.Optional[global___FileRef] = ...,
         ) -> None: ...
-    def HasField(self, field_name: typing_extensions.Literal["_array",b"_array","_sm_name",b"_sm_name","array",b"array","sm_name",b"sm_name"]) -> builtins.bool: ...
-    def ClearField(self, field_name: typing_extensions.Literal["_array",b"_array","_sm_name",b"_sm_name","array",b"array","data",b"data","size",b"size","sm_name",b"sm_name"]) -> None: ...
+    def HasField(self, field_name: typing_extensions.Literal["_array",b"_array","_coding",b"_coding","_file",b"_file","_sm_name",b"_sm_name","array",b"array","bool_value",b"bool_value","bytes_value",b"bytes_value","coding",b"coding","file",b"file","float_value",b"float_value","int_value",b"int_value","native",b"native","none_value",b"none_value","sm_name",b"sm_name","str_value",b"str_value"]) -> builtins.bool: ...
+    def ClearField(self, field_name: typing_extensions.Literal["_array",b"_array","_coding",b"_coding","_file",b"_file","_sm_name",b"_sm_name","array",b"array","bool_value",b"bool_value","bytes_value",b"bytes_value","chunked",b"chunked","coding",b"coding","data",b"data","file",b"file","float_value",b"float_value","int_value",b"int_value","native",b"native","none_value",b"none_value","oob",b"oob","pickled",b"pickled","raw",b"raw","size",b"size","sm_name",b"sm_name","sm_offset",b"sm_offset","sm_owned",b"sm_owned","str_value",b"str_value"]) -> None: ...
     @typing.overload
     def WhichOneof(self, oneof_group: typing_extensions.Literal["_array",b"_array"]) -> typing.Optional[typing_extensions.Literal["array"]]: ...
     @typing.overload
+    def WhichOneof(self, oneof_group: typing_extensions.Literal["_coding",b"_coding"]) -> typing.Optional[typing_extensions.Literal["coding"]]: ...
+    @typing.overload
+    def WhichOneof(self, oneof_group: typing_extensions.Literal["_file",b"_file"]) -> typing.Optional[typing_extensions.Literal["file"]]: ...
+    @typing.overload
     def WhichOneof(self, oneof_group: typing_extensions.Literal["_sm_name",b"_sm_name"]) -> typing.Optional[typing_extensions.Literal["sm_name"]]: ...
+    @typing.overload
+    def WhichOneof(self, oneof_group: typing_extensions.Literal["native",b"native"]) -> typing.Optional[typing_extensions.Literal["none_value","bool_value","int_value","float_value","str_value","bytes_value"]]: ...
 global___Content = Content
 
+class FileRef(google.protobuf.message.Message):
+    """A file as identified by the client, and the offset of the data in it."""
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    PATH_FIELD_NUMBER: builtins.int
+    OFFSET_FIELD_NUMBER: builtins.int
+    DEVICE_FIELD_NUMBER: builtins.int
+    INODE_FIELD_NUMBER: builtins.int
+    FILE_SIZE_FIELD_NUMBER: builtins.int
+    MTIME_NS_FIELD_NUMBER: builtins.int
+    path: typing.Text
+    offset: builtins.int
+    device: builtins.int
+    inode: builtins.int
+    file_size: builtins.int
+    mtime_ns: builtins.int
+    def __init__(self,
+        *,
+        path: typing.Text = ...,
+        offset: builtins.int = ...,
+        device: builtins.int = ...,
+        inode: builtins.int = ...,
+        file_size: builtins.int = ...,
+        mtime_ns: builtins.int = ...,
+        ) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal["device",b"device","file_size",b"file_size","inode",b"inode","mtime_ns",b"mtime_ns","offset",b"offset","path",b"path"]) -> None: ...
+global___FileRef = FileRef
+
+class FileAccessQ(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    FILES_FIELD_NUMBER: builtins.int
+    @property
+    def files(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___FileRef]: ...
+    def __init__(self,
+        *,
+        files: typing.Optional[typing.Iterable[global___FileRef]] = ...,
+        ) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal["files",b"files"]) -> None: ...
+global___FileAccessQ = FileAccessQ
+
+class FileAccessA(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    VISIBLE_FIELD_NUMBER: builtins.int
+    @property
+    def visible(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[builtins.bool]: ...
+    def __init__(self,
+        *,
+        visible: typing.Optional[typing.Iterable[builtins.bool]] = ...,
+        ) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal["visible",b"visible"]) -> None: ...
+global___FileAccessA = FileAccessA
+
+class ContentChunk(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    ARG_FIELD_NUMBER: builtins.int
+    KWARG_FIELD_NUMBER: builtins.int
+    OFFSET_FIELD_NUMBER: builtins.int
+    DATA_FIELD_NUMBER: builtins.int
+    arg: builtins.int
+    kwarg: typing.Text
+    offset: builtins.int
+    data: builtins.bytes
+    def __init__(self,
+        *,
+        arg: builtins.int = ...,
+        kwarg: typing.Text = ...,
+        offset: builtins.int = ...,
+        data: builtins.bytes = ...,
+        ) -> None: ...
+    def HasField(self, field_name: typing_extensions.Literal["arg",b"arg","kwarg",b"kwarg","target",b"target"]) -> builtins.bool: ...
+    def ClearField(self, field_name: typing_extensions.Literal["arg",b"arg","data",b"data","kwarg",b"kwarg","offset",b"offset","target",b"target"]) -> None: ...
+    def WhichOneof(self, oneof_group: typing_extensions.Literal["target",b"target"]) -> typing.Optional[typing_extensions.Literal["arg","kwarg"]]: ...
+global___ContentChunk = ContentChunk
+
 class PacketQ(google.protobuf.message.Message):
     DESCRIPTOR: google.protobuf.descriptor.Descriptor
     class KwargsEntry(google.protobuf.message.Message):
@@ -254,6 +462,19 @@ class PacketQ(google.protobuf.message.Message):
         def HasField(self, field_name: typing_extensions.Literal["value",b"value"]) -> builtins.bool: ...
         def ClearField(self, field_name: typing_extensions.Literal["key",b"key","value",b"value"]) -> None: ...
 
+    class MatchInfoEntry(google.protobuf.message.Message):
+        DESCRIPTOR: google.protobuf.descriptor.Descriptor
+        KEY_FIELD_NUMBER: builtins.int
+        VALUE_FIELD_NUMBER: builtins.int
+        key: typing.Text
+        value: typing.Text
+        def __init__(self,
+            *,
+            key: typing.Text = ...,
+            value: typing.Text = ...,
+            ) -> None: ...
+        def ClearField(self, field_name: typing_extensions.Literal["key",b"key","value",b"value"]) -> None: ...
+
     SESSION_FIELD_NUMBER: builtins.int
     METHOD_FIELD_NUMBER: builtins.int
     PATH_FIELD_NUMBER: builtins.int
@@ -261,6 +482,13 @@ class PacketQ(google.protobuf.message.Message):
     ARGS_FIELD_NUMBER: builtins.int
     KWARGS_FIELD_NUMBER: builtins.int
     SM_NAMES_FIELD_NUMBER: builtins.int
+    UNLINKED_SM_NAMES_FIELD_NUMBER: builtins.int
+    ROUTE_ID_FIELD_NUMBER: builtins.int
+    MATCH_INFO_FIELD_NUMBER: builtins.int
+    CORRELATION_ID_FIELD_NUMBER: builtins.int
+    CHUNK_SIZE_FIELD_NUMBER: builtins.int
+    DAEMON_SM_FIELD_NUMBER: builtins.int
+    ROUTE_EPOCH_FIELD_NUMBER: builtins.int
     session: typing.Text
     method: typing.Text
     path: typing.Text
@@ -271,6 +499,31 @@ class PacketQ(google.protobuf.message.Message):
     def kwargs(self) -> google.protobuf.internal.containers.MessageMap[typing.Text, global___Content]: ...
     @property
     def sm_names(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[typing.Text]: ...
+    @property
+    def unlinked_sm_names(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[typing.Text]:
+        """Segments unlinked by the client since the previous packet."""
+        pass
+    route_id: builtins.int
+    """Route matched by the client. If set and `route_epoch` is the epoch of
+    the route table of the daemon, `method` and `path` are ignored.
+    """
+
+    @property
+    def match_info(self) -> google.protobuf.internal.containers.ScalarMap[typing.Text, typing.Text]: ...
+    correlation_id: builtins.int
+    """Pairs the answer with the request in `PacketStream`."""
+
+    chunk_size: builtins.int
+    """Answer contents larger than this are sent in chunks of this size."""
+
+    daemon_sm: builtins.bool
+    """Answer contents that do not fit in `sm_names` may be placed in
+    segments allocated by the daemon.
+    """
+
+    route_epoch: typing.Text
+    """`RegisterA.route_epoch` of the route table that `route_id` came from."""
+
     def __init__(self,
         *,
         session: typing.Text = ...,
@@ -280,8 +533,17 @@ class PacketQ(google.protobuf.message.Message):
         args: typing.Optional[typing.Iterable[global___Content]] = ...,
         kwargs: typing.Optional[typing.Mapping[typing.Text, global___Content]] = ...,
         sm_names: typing.Optional[typing.Iterable[typing.Text]] = ...,
+        unlinked_sm_names: typing.Optional[typing.Iterable[typing.Text]] = ...,
+        route_id: typing.Optional[builtins.int] = ...,
+        match_info: typing.Optional[typing.Mapping[typing.Text, typing.Text]] = ...,
+        correlation_id: builtins.int = ...,
+        chunk_size: builtins.int = ...,
+        daemon_sm: builtins.bool = ...,
+        route_epoch: typing.Text = ...,
         ) -> None: ...
-    def ClearField(self, field_name: typing_extensions.Literal["args",b"args","coding",b"coding","kwargs",b"kwargs","method",b"method","path",b"path","session",b"session","sm_names",b"sm_names"]) -> None: ...
+    def HasField(self, field_name: typing_extensions.Literal["_route_id",b"_route_id","route_id",b"route_id"]) -> builtins.bool: ...
+    def ClearField(self, field_name: typing_extensions.Literal["_route_id",b"_route_id","args",b"args","chunk_size",b"chunk_size","coding",b"coding","correlation_id",b"correlation_id","daemon_sm",b"daemon_sm","kwargs",b"kwargs","match_info",b"match_info","method",b"method","path",b"path","route_epoch",b"route_epoch","route_id",b"route_id","session",b"session","sm_names",b"sm_names","unlinked_sm_names",b"unlinked_sm_names"]) -> None: ...
+    def WhichOneof(self, oneof_group: typing_extensions.Literal["_route_id",b"_route_id"]) -> typing.Optional[typing_extensions.Literal["route_id"]]: ...
 global___PacketQ = PacketQ
 
 class PacketA(google.protobuf.message.Message):
@@ -303,14 +565,87 @@ class PacketA(google.protobuf.message.Message):
 
     ARGS_FIELD_NUMBER: builtins.int
     KWARGS_FIELD_NUMBER: builtins.int
+    CORRELATION_ID_FIELD_NUMBER: builtins.int
+    ERROR_FIELD_NUMBER: builtins.int
     @property
     def args(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___Content]: ...
     @property
     def kwargs(self) -> google.protobuf.internal.containers.MessageMap[typing.Text, global___Content]: ...
+    correlation_id: builtins.int
+    error: typing.Text
+    """Error message of a failed packet in `PacketStream`."""
+
     def __init__(self,
         *,
         args: typing.Optional[typing.Iterable[global___Content]] = ...,
         kwargs: typing.Optional[typing.Mapping[typing.Text, global___Content]] = ...,
+        correlation_id: builtins.int = ...,
+        error: typing.Text = ...,
         ) -> None: ...
-    def ClearField(self, field_name: typing_extensions.Literal["args",b"args","kwargs",b"kwargs"]) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal["args",b"args","correlation_id",b"correlation_id","error",b"error","kwargs",b"kwargs"]) -> None: ...
 global___PacketA = PacketA
+
+class PacketBatchQ(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    PACKETS_FIELD_NUMBER: builtins.int
+    CONCURRENT_FIELD_NUMBER: builtins.int
+    @property
+    def packets(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___PacketQ]: ...
+    concurrent: builtins.bool
+    """Run the packets concurrently instead of in order."""
+
+    def __init__(self,
+        *,
+        packets: typing.Optional[typing.Iterable[global___PacketQ]] = ...,
+        concurrent: builtins.bool = ...,
+        ) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal["concurrent",b"concurrent","packets",b"packets"]) -> None: ...
+global___PacketBatchQ = PacketBatchQ
+
+class PacketBatchA(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    PACKETS_FIELD_NUMBER: builtins.int
+    @property
+    def packets(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___PacketA]: ...
+    def __init__(self,
+        *,
+        packets: typing.Optional[typing.Iterable[global___PacketA]] = ...,
+        ) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal["packets",b"packets"]) -> None: ...
+global___PacketBatchA = PacketBatchA
+
+class PacketChunkQ(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    HEADER_FIELD_NUMBER: builtins.int
+    CHUNK_FIELD_NUMBER: builtins.int
+    @property
+    def header(self) -> global___PacketQ: ...
+    @property
+    def chunk(self) -> global___ContentChunk: ...
+    def __init__(self,
+        *,
+        header: typing.Optional[global___PacketQ] = ...,
+        chunk: typing.Optional[global___ContentChunk] = ...,
+        ) -> None: ...
+    def HasField(self, field_name: typing_extensions.Literal["body",b"body","chunk",b"chunk","header",b"header"]) -> builtins.bool: ...
+    def ClearField(self, field_name: typing_extensions.Literal["body",b"body","chunk",b"chunk","header",b"header"]) -> None: ...
+    def WhichOneof(self, oneof_group: typing_extensions.Literal["body",b"body"]) -> typing.Optional[typing_extensions.Literal["header","chunk"]]: ...
+global___PacketChunkQ = PacketChunkQ
+
+class PacketChunkA(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    HEADER_FIELD_NUMBER: builtins.int
+    CHUNK_FIELD_NUMBER: builtins.int
+    @property
+    def header(self) -> global___PacketA: ...
+    @property
+    def chunk(self) -> global___ContentChunk: ...
+    def __init__(self,
+        *,
+        header: typing.Optional[global___PacketA] = ...,
+        chunk: typing.Optional[global___ContentChunk] = ...,
+        ) -> None: ...
+    def HasField(self, field_name: typing_extensions.Literal["body",b"body","chunk",b"chunk","header",b"header"]) -> builtins.bool: ...
+    def ClearField(self, field_name: typing_extensions.Literal["body",b"body","chunk",b"chunk","header",b"header"]) -> None: ...
+    def WhichOneof(self, oneof_group: typing_extensions.Literal["body",b"body"]) -> typing.Optional[typing_extensions.Literal["header","chunk"]]: ...
+global___PacketChunkA = PacketChunkA
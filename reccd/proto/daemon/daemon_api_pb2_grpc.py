@@ -29,6 +29,26 @@ class DaemonApiStub(object):
                 request_serializer=daemon__api__pb2.PacketQ.SerializeToString,
                 response_deserializer=daemon__api__pb2.PacketA.FromString,
                 )
+        self.PacketStream = channel.stream_stream(
+                '/reccd.proto.daemon.DaemonApi/PacketStream',
+                request_serializer=daemon__api__pb2.PacketQ.SerializeToString,
+                response_deserializer=daemon__api__pb2.PacketA.FromString,
+                )
+        self.PacketBatch = channel.unary_unary(
+                '/reccd.proto.daemon.DaemonApi/PacketBatch',
+                request_serializer=daemon__api__pb2.PacketBatchQ.SerializeToString,
+                response_deserializer=daemon__api__pb2.PacketBatchA.FromString,
+                )
+        self.PacketChunked = channel.stream_stream(
+                '/reccd.proto.daemon.DaemonApi/PacketChunked',
+                request_serializer=daemon__api__pb2.PacketChunkQ.SerializeToString,
+                response_deserializer=daemon__api__pb2.PacketChunkA.FromString,
+                )
+        self.FileAccess = channel.unary_unary(
+                '/reccd.proto.daemon.DaemonApi/FileAccess',
+                request_serializer=daemon__api__pb2.FileAccessQ.SerializeToString,
+                response_deserializer=daemon__api__pb2.FileAccessA.FromString,
+                )
 
 
 class DaemonApiServicer(object):
@@ -52,6 +72,34 @@ class DaemonApiServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def PacketStream(self, request_iterator, context):
+        """Pipelined packets. The answers may arrive out of order.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def PacketBatch(self, request, context):
+        """Many packets in one call. Each answer has its own error.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def PacketChunked(self, request_iterator, context):
+        """One packet whose large contents are sent in chunks after the header.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def FileAccess(self, request, context):
+        """Which of the files the daemon can open as the client sees them.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_DaemonApiServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -70,6 +118,26 @@ def add_DaemonApiServicer_to_server(servicer, server):
                     request_deserializer=daemon__api__pb2.PacketQ.FromString,
                     response_serializer=daemon__api__pb2.PacketA.SerializeToString,
             ),
+            'PacketStream': grpc.stream_stream_rpc_method_handler(
+                    servicer.PacketStream,
+                    request_deserializer=daemon__api__pb2.PacketQ.FromString,
+                    response_serializer=daemon__api__pb2.PacketA.SerializeToString,
+            ),
+            'PacketBatch': grpc.unary_unary_rpc_method_handler(
+                    servicer.PacketBatch,
+                    request_deserializer=daemon__api__pb2.PacketBatchQ.FromString,
+                    response_serializer=daemon__api__pb2.PacketBatchA.SerializeToString,
+            ),
+            'PacketChunked': grpc.stream_stream_rpc_method_handler(
+                    servicer.PacketChunked,
+                    request_deserializer=daemon__api__pb2.PacketChunkQ.FromString,
+                    response_serializer=daemon__api__pb2.PacketChunkA.SerializeToString,
+            ),
+            'FileAccess': grpc.unary_unary_rpc_method_handler(
+                    servicer.FileAccess,
+                    request_deserializer=daemon__api__pb2.FileAccessQ.FromString,
+                    response_serializer=daemon__api__pb2.FileAccessA.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'reccd.proto.daemon.DaemonApi', rpc_method_handlers)
@@ -130,3 +198,71 @@ class DaemonApi(object):
             daemon__api__pb2.PacketA.FromString,
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def PacketStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(request_iterator, target, '/reccd.proto.daemon.DaemonApi/PacketStream',
+            daemon__api__pb2.PacketQ.SerializeToString,
+            daemon__api__pb2.PacketA.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def PacketBatch(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/reccd.proto.daemon.DaemonApi/PacketBatch',
+            daemon__api__pb2.PacketBatchQ.SerializeToString,
+            daemon__api__pb2.PacketBatchA.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def PacketChunked(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(request_iterator, target, '/reccd.proto.daemon.DaemonApi/PacketChunked',
+            daemon__api__pb2.PacketChunkQ.SerializeToString,
+            daemon__api__pb2.PacketChunkA.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def FileAccess(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/reccd.proto.daemon.DaemonApi/FileAccess',
+            daemon__api__pb2.FileAccessQ.SerializeToString,
+            daemon__api__pb2.FileAccessA.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
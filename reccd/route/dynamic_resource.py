@@ -4,7 +4,7 @@ from re import Pattern
 from re import compile as re_compile
 from re import error as re_error
 from re import escape as re_escape
-from typing import Dict, Final, Optional, Tuple
+from typing import Dict, Final, List, NamedTuple, Optional, Tuple
 
 from yarl import URL
 from yarl import __version__ as yarl_version  # type: ignore[attr-defined]
@@ -22,6 +22,10 @@ def unquote_path(value: str) -> str:
     return URL.build(path=value, encoded=True).path
 
 
+def unquote_path_if_needed(value: str) -> str:
+    return unquote_path(value) if "%" in value else value
+
+
 def requote_path(value: str) -> str:
     # Quote non-ascii characters and other characters which must be quoted,
     # but preserve existing %-sequences.
@@ -45,29 +49,63 @@ DYN_WITH_RE: Final[Pattern[str]] = re_compile(DYN_WITH_PATTERN)
 GOOD: Final[str] = r"[^{}/]+"
 
 
+class RoutePart(NamedTuple):
+    """
+    A literal (`var` is empty) or a variable part of the route path.
+    """
+
+    text: str
+    var: str = ""
+
+    @property
+    def is_variable(self) -> bool:
+        return bool(self.var)
+
+
+def split_route_parts(path: str) -> List[RoutePart]:
+    """
+    The literal parts are requoted and the variable parts hold their regex.
+    """
+    result = list()
+    for part in ROUTE_RE.split(path):
+        match = DYN_RE.fullmatch(part)
+        if match:
+            result.append(RoutePart(GOOD, match.group("var")))
+            continue
+
+        match = DYN_WITH_RE.fullmatch(part)
+        if match:
+            result.append(RoutePart(match.group("re"), match.group("var")))
+            continue
+
+        if "{" in part or "}" in part:
+            raise ValueError(f"Invalid path '{path}'['{part}']")
+
+        if part:
+            result.append(RoutePart(requote_path(part)))
+    return result
+
+
+def route_parts_to_pattern(parts: List[RoutePart]) -> str:
+    pattern = ""
+    for part in parts:
+        if part.is_variable:
+            pattern += f"(?P<{part.var}>{part.text})"
+        else:
+            pattern += re_escape(part.text)
+    return pattern
+
+
 class DynamicResource:
     def __init__(self, path: str) -> None:
-        pattern = ""
+        parts = split_route_parts(path)
+        pattern = route_parts_to_pattern(parts)
         formatter = ""
-        for part in ROUTE_RE.split(path):
-            match = DYN_RE.fullmatch(part)
-            if match:
-                pattern += "(?P<{}>{})".format(match.group("var"), GOOD)
-                formatter += "{" + match.group("var") + "}"
-                continue
-
-            match = DYN_WITH_RE.fullmatch(part)
-            if match:
-                pattern += "(?P<{var}>{re})".format(**match.groupdict())
-                formatter += "{" + match.group("var") + "}"
-                continue
-
-            if "{" in part or "}" in part:
-                raise ValueError(f"Invalid path '{path}'['{part}']")
-
-            part = requote_path(part)
-            formatter += part
-            pattern += re_escape(part)
+        for part in parts:
+            if part.is_variable:
+                formatter += "{" + part.var + "}"
+            else:
+                formatter += part.text
 
         try:
             compiled = re_compile(pattern)
@@ -76,11 +114,25 @@ class DynamicResource:
 
         assert compiled.pattern.startswith(PATH_SEP)
         assert formatter.startswith("/")
+        self._parts = parts
         self._pattern = compiled
         self._formatter = formatter
 
+    @property
+    def parts(self) -> List[RoutePart]:
+        return self._parts
+
+    @property
+    def formatter(self) -> str:
+        return self._formatter
+
+    @property
+    def is_static(self) -> bool:
+        return not any(part.is_variable for part in self._parts)
+
     def match(self, path: str) -> Optional[Dict[str, str]]:
         match = self._pattern.fullmatch(path)
         if match is None:
             return None
-        return {key: unquote_path(value) for key, value in match.groupdict().items()}
+        groups = match.groupdict().items()
+        return {key: unquote_path_if_needed(value) for key, value in groups}
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+
+import os
+from asyncio import Semaphore, get_running_loop, wrap_future
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+from time import perf_counter
+from typing import Any, Callable, Dict, NamedTuple, Optional, Sequence
+
+from reccd.route.route_options import DEFAULT_ROUTE_OPTIONS, RouteOptions
+from reccd.variables.rpc import DEFAULT_ROUTE_THREADS
+
+
+class RouteCallStats(NamedTuple):
+    calls: int
+
+    # Calls waiting for the concurrency cap, and calls past it, which include
+    # the calls queued in the thread pool.
+    waiting: int
+    running: int
+
+    # Calls that ran on the thread pool.
+    threaded: int
+
+    # Seconds from the request until the route started, i.e. the wait for the
+    # concurrency cap of the route and for a free thread of the pool.
+    wait_total: float
+    wait_max: float
+
+    @property
+    def wait_mean(self) -> float:
+        return self.wait_total / self.calls if self.calls else 0.0
+
+
+class _RouteSlot:
+
+    __slots__ = (
+        "semaphore",
+        "calls",
+        "waiting",
+        "running",
+        "threaded",
+        "wait_total",
+        "wait_max",
+    )
+
+    def __init__(self, max_concurrency: Optional[int] = None):
+        self.semaphore = Semaphore(max_concurrency) if max_concurrency else None
+        self.calls = 0
+        self.waiting = 0
+        self.running = 0
+        self.threaded = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def release(self) -> None:
+        self.running -= 1
+        if self.semaphore is not None:
+            self.semaphore.release()
+
+    def record(self, wait: float) -> None:
+        self.calls += 1
+        self.wait_total += wait
+        self.wait_max = max(self.wait_max, wait)
+
+    @property
+    def stats(self) -> RouteCallStats:
+        return RouteCallStats(
+            calls=self.calls,
+            waiting=self.waiting,
+            running=self.running,
+            threaded=self.threaded,
+            wait_total=self.wait_total,
+            wait_max=self.wait_max,
+        )
+
+
+class RouteExecutor:
+    """
+    Calls the route functions of the daemon.
+
+    Synchronous routes run on a bounded thread pool, so that a slow call does
+    not block the other RPCs and the heartbeats on the event loop. Each route
+    may also cap its concurrent calls with ``max_concurrency``. By default,
+    there are as many threads as CPUs plus 4, up to ``DEFAULT_ROUTE_THREADS``,
+    and 0 threads run every route on the event loop.
+
+    The time each call waits before it starts is recorded per route name,
+    to size the pool and the caps.
+    """
+
+    _executor: Optional[ThreadPoolExecutor]
+    _slots: Dict[str, _RouteSlot]
+
+    def __init__(self, threads: Optional[int] = None):
+        if threads is None:
+            threads = min(DEFAULT_ROUTE_THREADS, (os.cpu_count() or 1) + 4)
+        self.threads = max(threads, 0)
+        self._executor = None
+        self._slots = dict()
+        self._lock = Lock()
+
+    def __repr__(self) -> str:
+        return f"RouteExecutor<threads={self.threads}>"
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.threads,
+                    thread_name_prefix="reccd-route",
+                )
+            return self._executor
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    def stats(self) -> Dict[str, RouteCallStats]:
+        return {name: slot.stats for name, slot in self._slots.items()}
+
+    def is_threaded(self, is_coroutine: bool, options: RouteOptions) -> bool:
+        if is_coroutine or self.threads == 0:
+            return False
+        return options.run_in_thread is not False
+
+    def _slot(self, name: str, options: RouteOptions) -> _RouteSlot:
+        slot = self._slots.get(name)
+        if slot is None:
+            slot = _RouteSlot(options.max_concurrency)
+            self._slots[name] = slot
+        return slot
+
+    async def call(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        args: Sequence[Any],
+        is_coroutine: bool,
+        options: RouteOptions = DEFAULT_ROUTE_OPTIONS,
+    ) -> Any:
+        slot = self._slot(name, options)
+        begin = perf_counter()
+
+        slot.waiting += 1
+        try:
+            if slot.semaphore is not None:
+                await slot.semaphore.acquire()
+        finally:
+            slot.waiting -= 1
+
+        slot.running += 1
+        if self.is_threaded(is_coroutine, options):
+            return await self._call_in_thread(slot, begin, func, args)
+        try:
+            slot.record(perf_counter() - begin)
+            if is_coroutine:
+                return await func(*args)
+            return func(*args)
+        finally:
+            slot.release()
+
+    async def _call_in_thread(
+        self,
+        slot: _RouteSlot,
+        begin: float,
+        func: Callable[..., Any],
+        args: Sequence[Any],
+    ) -> Any:
+        loop = get_running_loop()
+        started: Optional[float] = None
+
+        def _run() -> Any:
+            nonlocal started
+            started = perf_counter()
+            return func(*args)
+
+        def _done(_: Future) -> None:
+            # A cancelled awaiter does not stop the thread, so the slot is
+            # released only when the thread is done with the call.
+            try:
+                loop.call_soon_threadsafe(slot.release)
+            except RuntimeError:
+                pass  # The event loop is closed.
+
+        slot.threaded += 1
+        future = self._get_executor().submit(_run)
+        future.add_done_callback(_done)
+        try:
+            return await wrap_future(future)
+        finally:
+            # Recorded on the event loop, so that the counters need no lock.
+            slot.record((perf_counter() if started is None else started) - begin)
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+
+from re import Pattern
+from re import compile as re_compile
+from sys import maxsize
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from reccd.route.dynamic_resource import (
+    DynamicResource,
+    RoutePart,
+    route_parts_to_pattern,
+    unquote_path_if_needed,
+)
+
+MatchInfo = Dict[str, str]
+
+_UNSAFE_SEGMENT_TOKENS = (
+    ".",
+    "/",
+    "\\S",
+    "\\W",
+    "\\D",
+    "\\x",
+    "\\u",
+    "\\U",
+    "\\N",
+    "\\0",
+    "(?",
+)
+_CHARACTER_CLASS_RE = re_compile(r"\[(\^?)((?:\\.|[^\]\\])*)\]")
+_CHARACTER_RANGE_RE = re_compile(r"(.)-(.)")
+
+
+def _is_segment_character_class(negate: str, content: str) -> bool:
+    if negate:
+        return "/" in content
+    if any(token in content for token in _UNSAFE_SEGMENT_TOKENS):
+        return False
+    for begin, end in _CHARACTER_RANGE_RE.findall(content):
+        if begin <= "/" <= end:
+            return False
+    return True
+
+
+def is_segment_regex(regex: str) -> bool:
+    """
+    Conservatively check that the regex can never match a ``/``.
+    """
+    for negate, content in _CHARACTER_CLASS_RE.findall(regex):
+        if not _is_segment_character_class(negate, content):
+            return False
+    remainder = _CHARACTER_CLASS_RE.sub("", regex)
+    return not any(token in remainder for token in _UNSAFE_SEGMENT_TOKENS)
+
+
+def split_route_segments(parts: List[RoutePart]) -> Optional[List[List[RoutePart]]]:
+    """
+    Split the route parts at each ``/``.
+    Returns ``None`` if a variable regex can match across segments.
+    """
+    segments: List[List[RoutePart]] = [[]]
+    for part in parts:
+        if part.is_variable:
+            if not is_segment_regex(part.text):
+                return None
+            segments[-1].append(part)
+            continue
+
+        texts = part.text.split("/")
+        for i, text in enumerate(texts):
+            if i >= 1:
+                segments.append([])
+            if text:
+                segments[-1].append(RoutePart(text))
+    return segments
+
+
+class _RouteNode:
+
+    __slots__ = ("statics", "dynamics", "index", "min_index")
+
+    statics: Dict[str, "_RouteNode"]
+    dynamics: Dict[str, Tuple[Pattern, "_RouteNode"]]
+    index: int
+    min_index: int
+
+    def __init__(self):
+        self.statics = dict()
+        self.dynamics = dict()
+        self.index = maxsize
+        self.min_index = maxsize
+
+
+class _RouteCandidate(NamedTuple):
+    route_index: int
+    match_info: MatchInfo
+
+
+class _MethodIndex:
+
+    __slots__ = ("statics", "root", "fallbacks")
+
+    statics: Dict[str, int]
+    root: _RouteNode
+    fallbacks: List[Tuple[int, DynamicResource]]
+
+    def __init__(self):
+        self.statics = dict()
+        self.root = _RouteNode()
+        self.fallbacks = list()
+
+    def add(self, index: int, resource: DynamicResource) -> None:
+        if resource.is_static:
+            # Keep the first route of the same path.
+            self.statics.setdefault(resource.formatter, index)
+            return
+
+        segments = split_route_segments(resource.parts)
+        if segments is None:
+            self.fallbacks.append((index, resource))
+            return
+
+        node = self.root
+        node.min_index = min(node.min_index, index)
+        for segment in segments:
+            if any(part.is_variable for part in segment):
+                pattern = route_parts_to_pattern(segment)
+                if pattern not in node.dynamics:
+                    node.dynamics[pattern] = re_compile(pattern), _RouteNode()
+                node = node.dynamics[pattern][1]
+            else:
+                text = "".join(part.text for part in segment)
+                node = node.statics.setdefault(text, _RouteNode())
+            node.min_index = min(node.min_index, index)
+        node.index = min(node.index, index)
+
+    def _find_tree(
+        self,
+        node: _RouteNode,
+        segments: List[str],
+        depth: int,
+        match_info: MatchInfo,
+        best: Optional[_RouteCandidate],
+    ) -> Optional[_RouteCandidate]:
+        if best is not None and best.route_index <= node.min_index:
+            return best
+
+        if depth == len(segments):
+            if best is None or node.index < best.route_index:
+                if node.index != maxsize:
+                    return _RouteCandidate(node.index, dict(match_info))
+            return best
+
+        segment = segments[depth]
+        static_node = node.statics.get(segment)
+        if static_node is not None:
+            best = self._find_tree(static_node, segments, depth + 1, match_info, best)
+
+        for pattern, dynamic_node in node.dynamics.values():
+            if best is not None and best.route_index <= dynamic_node.min_index:
+                continue
+            match = pattern.fullmatch(segment)
+            if match is None:
+                continue
+            next_match_info = dict(match_info)
+            next_match_info.update(match.groupdict())
+            best = self._find_tree(
+                dynamic_node, segments, depth + 1, next_match_info, best
+            )
+
+        return best
+
+    def find(self, path: str) -> Optional[_RouteCandidate]:
+        best: Optional[_RouteCandidate] = None
+
+        static_index = self.statics.get(path)
+        if static_index is not None:
+            best = _RouteCandidate(static_index, dict())
+
+        best = self._find_tree(self.root, path.split("/"), 0, dict(), best)
+        if best is not None:
+            best = _RouteCandidate(
+                best.route_index,
+                {k: unquote_path_if_needed(v) for k, v in best.match_info.items()},
+            )
+
+        # The fallbacks are sorted by index.
+        for index, resource in self.fallbacks:
+            if best is not None and best.route_index <= index:
+                break
+            match_info = resource.match(path)
+            if match_info is not None:
+                best = _RouteCandidate(index, match_info)
+                break
+
+        return best
+
+
+class RouteIndex:
+    """
+    Method-keyed route lookup with the same first-match-wins semantics
+    as trying each route in the order they were added.
+
+    Static paths are found with a dict, and dynamic paths with a segment tree.
+    Paths whose variable regex can match a ``/`` are tried one by one.
+    """
+
+    _methods: Dict[str, _MethodIndex]
+    _count: int
+
+    def __init__(self):
+        self._methods = dict()
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, method: str, resource: DynamicResource) -> int:
+        index = self._count
+        if method not in self._methods:
+            self._methods[method] = _MethodIndex()
+        self._methods[method].add(index, resource)
+        self._count += 1
+        return index
+
+    def find(self, method: str, path: str) -> Optional[Tuple[int, MatchInfo]]:
+        method_index = self._methods.get(method)
+        if method_index is None:
+            return None
+        candidate = method_index.find(path)
+        if candidate is None:
+            return None
+        return candidate.route_index, candidate.match_info
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+from typing import Any, Mapping, Optional
+
+
+class RouteOptions:
+    """
+    Per-route options given as the optional 4th element of an ``on_routes`` item.
+
+    Example:
+        ("POST", "/infer", post_infer, {"shared_memory_view": True})
+    """
+
+    __slots__ = (
+        "shared_memory_view",
+        "writable_view",
+        "compress",
+        "inline_threshold",
+        "run_in_thread",
+        "max_concurrency",
+    )
+
+    def __init__(
+        self,
+        shared_memory_view=False,
+        writable_view=False,
+        compress: Optional[bool] = None,
+        inline_threshold: Optional[int] = None,
+        run_in_thread: Optional[bool] = None,
+        max_concurrency: Optional[int] = None,
+    ):
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("The max_concurrency must be at least 1")
+
+        # ndarray arguments are views on the client's shared memory.
+        # The views are only valid during the route call.
+        self.shared_memory_view = shared_memory_view
+        self.writable_view = writable_view
+        # Compress the encoded results always (True) or never (False).
+        # If None, the codec policy of the daemon decides per result.
+        self.compress = compress
+        # Results up to this size are sent inline instead of in shared memory.
+        # If None, the placement policy of the daemon decides.
+        self.inline_threshold = inline_threshold
+        # Run a synchronous route on the route thread pool of the daemon (True)
+        # or on the event loop (False). If None, it runs on the thread pool.
+        # Coroutine routes always run on the event loop.
+        self.run_in_thread = run_in_thread
+        # Calls of the route that run at the same time. Further calls wait.
+        # If None, only the thread pool bounds synchronous routes.
+        self.max_concurrency = max_concurrency
+
+    @classmethod
+    def from_mapping(cls, options: Optional[Mapping[str, Any]] = None):
+        if options is None:
+            return cls()
+        return cls(**options)
+
+    def __repr__(self) -> str:
+        items = ",".join(f"{k}={getattr(self, k)}" for k in self.__slots__)
+        return f"RouteOptions<{items}>"
+
+
+DEFAULT_ROUTE_OPTIONS = RouteOptions()
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+from inspect import iscoroutinefunction, signature
+from typing import Any, Callable, List, NamedTuple, Optional, Union
+
+from reccd.conversion.to_boolean import string_to_boolean
+from reccd.inspect.type_origin import get_type_origin
+from reccd.packet.result_allocator import ResultAllocator
+
+PathCaster = Callable[[str], Any]
+
+
+def _is_path_class(obj) -> bool:
+    if not isinstance(obj, type):
+        return False
+    if issubclass(obj, str):
+        return True
+    if issubclass(obj, int):
+        return True
+    if issubclass(obj, float):
+        return True
+    if issubclass(obj, bool):
+        return True
+    return False
+
+
+def _cast_builtin_type_from_string(data: str, cls) -> Any:
+    assert isinstance(cls, type)
+    # [IMPORTANT]
+    # Do not change if-else order (Reason: `issubclass(bool, int) == True`)
+    if issubclass(cls, str):
+        return data
+    elif issubclass(cls, bool):
+        return string_to_boolean(data)
+    elif issubclass(cls, int):
+        return int(data)
+    elif issubclass(cls, float):
+        return float(data)
+    return cls(data)  # type: ignore[call-arg]
+
+
+def _get_path_caster(cls) -> Optional[PathCaster]:
+    if not _is_path_class(cls):
+        return None
+
+    assert isinstance(cls, type)
+    if cls is str:
+        return str
+    elif cls is bool:
+        return string_to_boolean
+    elif cls is int:
+        return int
+    elif cls is float:
+        return float
+    else:
+        return lambda data: _cast_builtin_type_from_string(data, cls)
+
+
+class ParameterBinder(NamedTuple):
+    key: str
+    type_origin: Any
+    path_caster: Optional[PathCaster]
+    is_allocator: bool
+
+
+def compile_parameter_binder(key: str, param) -> ParameterBinder:
+    type_origin = get_type_origin(param)
+    assert type_origin is not None
+    assert isinstance(type_origin, type) or type_origin is Union
+
+    # param.kind
+    #  - POSITIONAL_ONLY
+    #  - POSITIONAL_OR_KEYWORD
+    #  - VAR_POSITIONAL
+    #  - KEYWORD_ONLY
+    #  - VAR_KEYWORD
+
+    is_allocator = isinstance(type_origin, type) and issubclass(
+        type_origin, ResultAllocator
+    )
+    return ParameterBinder(
+        key=key,
+        type_origin=type_origin,
+        path_caster=_get_path_caster(type_origin),
+        is_allocator=is_allocator,
+    )
+
+
+class RoutePlan:
+    """
+    Everything about a route function that can be resolved before the request.
+    """
+
+    __slots__ = ("func", "binders", "is_coroutine")
+
+    func: Any
+    binders: List[ParameterBinder]
+    is_coroutine: bool
+
+    def __init__(self, func):
+        parameters = signature(func).parameters
+        self.func = func
+        self.binders = [compile_parameter_binder(k, p) for k, p in parameters.items()]
+        self.is_coroutine = iscoroutinefunction(func)
@@ -4,10 +4,10 @@
 # isort: off
 
 # noinspection PyPackageRequirements
-from grpc import ChannelCredentials, ssl_channel_credentials
+from grpc import ChannelCredentials, StatusCode, ssl_channel_credentials
 
 # noinspection PyPackageRequirements
-from grpc.aio import insecure_channel, secure_channel
+from grpc.aio import AioRpcError, insecure_channel, secure_channel
 
 # noinspection PyPackageRequirements, PyProtectedMember
 from grpc.aio._channel import Channel
@@ -16,8 +16,10 @@ from grpc.aio._channel import Channel
 # fmt: on
 
 __all__ = [
+    "AioRpcError",
     "Channel",
     "ChannelCredentials",
+    "StatusCode",
     "insecure_channel",
     "secure_channel",
     "ssl_channel_credentials",
@@ -58,6 +58,130 @@ DEFAULT_PACKET_MAX_SIZE = 100 * 1024 * 1024
 DEFAULT_PICKLE_PROTOCOL_VERSION = 5
 DEFAULT_PICKLE_ENCODING = "ASCII"
 
+DEFAULT_PICKLE_OOB_THRESHOLD = 4 * _1KB
+"""Pickle buffers smaller than this are kept in-band.
+"""
+
+DEFAULT_INLINE_BYTES_SIZE = 64 * _1KB
+"""Bytes-like values up to this size are always sent inline in the packet.
+"""
+
+DEFAULT_SM_POOL_MAX_BYTES = _1GB
+"""Idle segments are evicted while the shared memory pool holds more than this.
+"""
+
+DEFAULT_SM_POOL_IDLE_TIMEOUT = 60.0
+"""Seconds after which an idle segment of the shared memory pool is destroyed.
+"""
+
+DEFAULT_SM_POOL_MIN_SIZE = 4 * _1KB
+"""Size of the smallest size class of the shared memory pool.
+"""
+
+HUGE_PAGE_SIZE = 2 * _1MB
+"""Segments of at least this size may be backed by transparent huge pages.
+"""
+
+DEFAULT_PARALLEL_COPY_THRESHOLD = 16 * _1MB
+"""Shared memory copies larger than this are split over the copy threads.
+"""
+
+DEFAULT_PARALLEL_COPY_THREADS = 4
+"""Maximum number of threads of a parallel copy, including the caller.
+"""
+
+DEFAULT_PARALLEL_COPY_MIN_SIZE = _1MB
+DEFAULT_PARALLEL_COPY_MAX_SIZE = 256 * _1MB
+DEFAULT_PARALLEL_COPY_REPEAT = 5
+
+DEFAULT_CODEC_THRESHOLD = _1MB
+"""Payloads larger than this are encoded and decoded off the event loop.
+"""
+
+DEFAULT_CODEC_THREADS = 4
+"""Maximum number of threads that encode and decode large payloads.
+"""
+
+DEFAULT_ROUTE_THREADS = 32
+"""Maximum number of threads that run synchronous route functions.
+"""
+
+DEFAULT_SM_ARENA_SIZE = 64 * _1MB
+"""Size of the segments of a shared memory arena.
+"""
+
+DEFAULT_SM_ARENA_ALIGNMENT = 64
+"""Byte alignment of the allocations in a shared memory arena.
+"""
+
+MEMFD_ADDRESS_SUFFIX = ".memfd"
+"""Suffix of the UDS address of the side channel that passes memfd descriptors.
+"""
+
+MEMFD_MESSAGE_SIZE = 256
+"""Maximum size of a side channel message, which holds one segment name.
+"""
+
+MEMFD_SOCKET_MODE = 0o600
+"""Permissions of the side channel socket file, which only its owner may use.
+"""
+
+SM_NAME_PREFIX = "reccd_"
+"""Prefix of the names of the segments created by reccd, followed by the owner.
+"""
+
+SM_DIRECTORY = "/dev/shm"
+"""Directory where the POSIX shared memory segments of this host are listed.
+"""
+
+DEFAULT_SM_JANITOR_INTERVAL = 0.0
+"""Seconds between the sweeps of orphaned segments in the daemon, 0 to disable.
+
+Disabled by default, because the owners are looked up by PID, and the segments
+of a client in another PID namespace would look orphaned.
+"""
+
+DEFAULT_SM_REPORT_INTERVAL = 60.0
+"""Seconds between the reports of the shared memory mapped for each session
+in the daemon, 0 to disable. Only a changed mapping is reported.
+"""
+
+MAX_FILE_ACCESS_CACHE_SIZE = 1024
+"""Files whose visibility to the daemon is remembered by a client.
+"""
+
+DEFAULT_INLINE_THRESHOLD = 16 * _1KB
+"""With shared memory, buffers up to this size are still sent inline.
+"""
+
+DEFAULT_CALIBRATE_MIN_SIZE = _1KB
+DEFAULT_CALIBRATE_MAX_SIZE = _1MB
+DEFAULT_CALIBRATE_REPEAT = 7
+
+DEFAULT_SM_CACHE_IDLE_TIMEOUT = 60.0
+"""Seconds after which the shared memory mappings of an idle session are evicted.
+"""
+
+DEFAULT_CHUNK_SIZE = _1MB
+"""Size of each chunk of the chunked transfer.
+"""
+
+DEFAULT_CHUNK_THRESHOLD = 64 * _1MB
+"""Without shared memory, contents larger than this are sent in chunks.
+"""
+
+DEFAULT_COMPRESS_THRESHOLD = 4 * _1KB
+"""Encoded objects smaller than this are not compressed.
+"""
+
+DEFAULT_COMPRESS_SAMPLE_SIZE = 4 * _1KB
+"""Size of the prefix compressed to estimate the compression ratio.
+"""
+
+DEFAULT_COMPRESS_MAX_RATIO = 0.9
+"""Objects whose sampled prefix compresses worse than this are not compressed.
+"""
+
 REGISTER_ANSWER_KEY_MIN_SM_SIZE = "min_sm_size"
 REGISTER_ANSWER_KEY_MIN_SM_BYTE = "min_sm_byte"
 
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+import os
+from tempfile import TemporaryDirectory
+from unittest import main, skipUnless
+from unittest.mock import patch
+
+from numpy import uint8
+from numpy.random import randint
+
+from reccd.daemon.daemon_client import DaemonClient
+from reccd.daemon.daemon_servicer import create_daemon_server
+from reccd.memory.memfd import is_memfd_supported
+from tester.unittest.module_test_case import ModuleIsolatedAsyncioTestCase
+
+
+@skipUnless(is_memfd_supported(), "memfd is not supported")
+class DaemonMemfdTestCase(ModuleIsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.temp = TemporaryDirectory()
+        self.address = "unix:" + os.path.join(self.temp.name, "reccd.sock")
+
+        accept_info = create_daemon_server(self.address, self.reccd_test_router)
+        self.servicer = accept_info.servicer
+        self.server = accept_info.server
+        self.client = DaemonClient(self.address, use_memfd=True)
+
+        await self.servicer.open()
+        await self.server.start()
+        await self.client.open()
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.server.stop(None)
+        await self.servicer.close()
+        self.temp.cleanup()
+
+    async def test_memfd(self):
+        self.assertEqual(0, await self.client.register())
+        if not self.client.possible_shared_memory:
+            self.skipTest("Shared memory is not available")
+        self.assertTrue(self.client.is_memfd)
+        self.assertFalse(self.client.use_daemon_sm)
+
+        array = randint(0, 255, size=(256, 256, 3), dtype=uint8)
+        for _ in range(2):
+            result = await self.client.post("/test/numpy/view", array)
+            self.assertEqual(int(array.sum()), result[2])
+
+        stats = self.client.shared_memory_pool.stats
+        self.assertEqual(1, stats.misses)
+        self.assertEqual(1, self.servicer.memfd.size)
+
+        cache = self.servicer.sm_cache.stats
+        self.assertEqual(1, cache.mappings)
+        self.assertEqual(1, cache.hits)
+
+    async def test_memfd_without_posix_shared_memory(self):
+        # e.g. a container with a tiny or missing /dev/shm
+        with patch(
+            "reccd.daemon.daemon_servicer.validate_shared_memory",
+            return_value=False,
+        ):
+            self.assertEqual(0, await self.client.register())
+        self.assertTrue(self.client.possible_shared_memory)
+        self.assertTrue(self.client.is_memfd)
+        self.assertEqual(0, self.servicer.memfd.size)
+
+        array = randint(0, 255, size=(256, 256, 3), dtype=uint8)
+        result = await self.client.post("/test/numpy/view", array)
+        self.assertEqual(int(array.sum()), result[2])
+        self.assertEqual(1, self.servicer.memfd.size)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,57 @@
 # -*- coding: utf-8 -*-
 
+import os
+import pickle
+from asyncio import gather, sleep
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from tempfile import TemporaryDirectory
+from typing import Any, Dict, List, Optional, Set
 from unittest import main
 
 # noinspection PyPackageRequirements
-from grpc.aio import AioRpcError
-from numpy import ndarray, uint8
+from grpc.aio import AioRpcError, insecure_channel
+from numpy import load, ndarray, save, uint8
 from numpy.random import randint
+from type_serialize import ByteCoding
 
 from reccd.daemon.daemon_client import DaemonClient
 from reccd.daemon.daemon_servicer import create_daemon_server
+from reccd.daemon.packet_batch import BatchRequest
+from reccd.logging.logging import reccd_logger
+from reccd.memory.shared_memory_name import parse_shared_memory_name
+from reccd.packet.codec_executor import CodecExecutor
+from reccd.packet.errors import PacketError
+from reccd.packet.packer import Packer
+from reccd.packet.unpacker import content_unpack
+from reccd.proto.daemon.daemon_api_pb2 import PacketQ
+from reccd.proto.daemon.daemon_api_pb2_grpc import DaemonApiStub
+from reccd.variables.rpc import DEFAULT_PICKLE_ENCODING, SM_DIRECTORY
 from tester.unittest.module_test_case import ModuleIsolatedAsyncioTestCase
 
 
+def _own_segments() -> Set[str]:
+    if not os.path.isdir(SM_DIRECTORY):
+        return set()
+    result = set()
+    for name in os.listdir(SM_DIRECTORY):
+        owner = parse_shared_memory_name(name)
+        if owner is not None and owner.pid == os.getpid():
+            result.add(name)
+    return result
+
+
+_UNPICKLED: List[bool] = list()
+
+
+def _unpickled() -> None:
+    _UNPICKLED.append(True)
+
+
+class _Payload:
+    def __reduce__(self):
+        return _unpickled, ()
+
+
 @dataclass
 class _Test1:
     value1: int
@@ -31,16 +69,18 @@ class _Result1:
 
 
 class DaemonRouterTestCase(ModuleIsolatedAsyncioTestCase):
-    async def _start_server(self):
+    async def _start_server(
+        self, client_kwargs: Optional[Dict[str, Any]] = None, **kwargs
+    ):
         module_name = self.reccd_test_router
         self.assertIn(module_name, self.test_module_names)
 
-        accept_info = create_daemon_server("[::]:0", module_name)
+        accept_info = create_daemon_server("[::]:0", module_name, **kwargs)
         self.servicer = accept_info.servicer
         self.server = accept_info.server
         self.port = accept_info.accepted_port_number
         self.address = f"localhost:{self.port}"
-        self.client = DaemonClient(self.address)
+        self.client = DaemonClient(self.address, **(client_kwargs or {}))
 
         await self.servicer.open()
         await self.server.start()
@@ -54,6 +94,10 @@ class DaemonRouterTestCase(ModuleIsolatedAsyncioTestCase):
         await self.server.stop(None)
         self.assertFalse(self.client.is_open())
 
+    async def _restart_server(self, client_kwargs: Dict[str, Any], **kwargs):
+        await self._stop_server()
+        await self._start_server(client_kwargs, **kwargs)
+
     async def asyncSetUp(self):
         try:
             await self._start_server()
@@ -115,6 +159,386 @@ class DaemonRouterTestCase(ModuleIsolatedAsyncioTestCase):
         self.assertEqual(body.value1, data.value1)
         self.assertEqual(body.value2, data.value2)
 
+    async def test_post_test_numpy_zero_copy(self):
+        self.assertTrue(self.client.possible_shared_memory)
+        self.client.zero_copy = True
+        array = randint(0, 255, size=(1270, 1920, 3), dtype=uint8)
+
+        with await self.client.post("/test/numpy", array) as result:
+            self.assertEqual(1, len(result))
+            self.assertIsInstance(result[0], ndarray)
+            self.assertFalse(result[0].flags.owndata)
+            self.assertTrue((result[0] == 0).all())
+            del result.args[0]
+        self.assertFalse(result.leased)
+
+    async def test_post_test_numpy_view(self):
+        self.assertTrue(self.client.possible_shared_memory)
+        array = randint(0, 255, size=(1270, 1920, 3), dtype=uint8)
+
+        result0 = await self.client.post("/test/numpy/view", array)
+        self.assertEqual(3, len(result0))
+        self.assertFalse(result0[0])
+        self.assertFalse(result0[1])
+        self.assertEqual(int(array.sum()), result0[2])
+
+        result1 = await self.client.post("/test/numpy/view/writable", array)
+        self.assertEqual(3, len(result1))
+        self.assertFalse(result1[0])
+        self.assertTrue(result1[1])
+        self.assertEqual(0, result1[2])
+
+    async def test_post_test_numpy_allocator(self):
+        array = randint(0, 255, size=(1270, 1920, 3), dtype=uint8)
+        result = await self.client.post("/test/numpy/allocator", array)
+        self.assertEqual(1, len(result))
+        self.assertIsInstance(result[0], ndarray)
+        self.assertEqual(array.shape, result[0].shape)
+        self.assertTrue((result[0] == 0).all())
+
+    async def test_daemon_sm(self):
+        if not self.client.possible_shared_memory:
+            self.skipTest("Shared memory is not available")
+        self.assertTrue(self.client.use_daemon_sm)
+
+        array = randint(0, 255, size=(256, 256, 3), dtype=uint8)
+        for _ in range(2):
+            result = await self.client.post("/test/numpy/allocator", array)
+            self.assertTrue((result[0] == 0).all())
+
+        stats = self.client.shared_memory_pool.stats
+        self.assertLessEqual(1, stats.adoptions)
+        self.assertEqual(0, stats.working_bytes)
+
+        await self._restart_server(dict(daemon_sm=False))
+        result = await self.client.patch(
+            "/test/numpy/body", array, _Test1(0, "", {}, [])
+        )
+        self.assertTrue((result[0] == 0).all())
+        self.assertEqual(0, self.client.shared_memory_pool.stats.adoptions)
+
+    async def test_daemon_sm_unused(self):
+        if not self.client.possible_shared_memory:
+            self.skipTest("Shared memory is not available")
+
+        segments = _own_segments()
+        array = randint(0, 255, size=(256, 256, 3), dtype=uint8)
+        result = await self.client.post("/test/numpy/allocator/unused", array)
+        self.assertTrue((result[0] == 0).all())
+
+        self.client.timeout = 0.1
+        with self.assertRaises(AioRpcError):
+            await self.client.post("/test/numpy/allocator/slow", array)
+        await sleep(0.5)
+
+        # The allocations that never reached the client are unlinked.
+        self.client.shared_memory_pool.clear()
+        self.assertEqual(segments, _own_segments())
+
+    async def test_daemon_sm_unused_stream(self):
+        if not self.client.possible_shared_memory:
+            self.skipTest("Shared memory is not available")
+
+        segments = _own_segments()
+        array = randint(0, 255, size=(256, 256, 3), dtype=uint8)
+        self.client.timeout = 0.1
+        self.client.use_stream = True
+        with self.assertRaises(TimeoutError):
+            await self.client.post("/test/numpy/allocator/slow", array)
+        await sleep(0.5)
+
+        # The late answer is discarded along with its allocations.
+        self.client.shared_memory_pool.clear()
+        self.assertEqual(segments, _own_segments())
+
+    async def test_sm_janitor(self):
+        # The janitor is opt-in.
+        self.assertEqual(0, self.servicer.janitor.sweeps)
+
+        if not self.client.possible_shared_memory:
+            self.skipTest("Shared memory is not available")
+
+        array = randint(0, 255, size=(256, 256, 3), dtype=uint8)
+        await self.client.post("/test/numpy/allocator", array)
+        sessions = self.servicer.session_bytes()
+        self.assertEqual(1, len(sessions))
+        self.assertLess(0, sum(sessions.values()))
+
+        # Segments and sessions of a live client are never swept.
+        segments = _own_segments()
+        self.servicer.sweep_orphans()
+        self.assertEqual(1, self.servicer.janitor.sweeps)
+        self.assertEqual(sessions, self.servicer.session_bytes())
+        self.assertEqual(segments, _own_segments())
+        result = await self.client.post("/test/numpy/view", array)
+        self.assertEqual(int(array.sum()), result[2])
+
+    async def test_sm_report(self):
+        if not self.client.possible_shared_memory:
+            self.skipTest("Shared memory is not available")
+
+        # Reported without the janitor, once per change.
+        await self._restart_server(dict(), sm_report_interval=0.05)
+        array = randint(0, 255, size=(256, 256, 3), dtype=uint8)
+        with self.assertLogs(reccd_logger, "INFO") as logs:
+            await self.client.post("/test/numpy/allocator", array)
+            await sleep(0.2)
+        reports = [x for x in logs.output if "Shared memory mapped" in x]
+        self.assertEqual(1, len(reports))
+        self.assertEqual(0, self.servicer.janitor.sweeps)
+        self.assertEqual(
+            self.servicer.session_bytes(), self.servicer.report_session_bytes()
+        )
+
+    async def test_codec_executor(self):
+        executor = CodecExecutor(threads=1, threshold=0)
+        try:
+            await self._restart_server(dict(codec_executor=executor), codec_threads=1)
+            body = _Test1(0, "aa", {"k": 100}, [1, "Y"], None, [])
+            result = await self.client.put("/test/body", body)
+            self.assertEqual(body, result.cast(0, _Test1))
+            self.assertLessEqual(2, executor.offloaded)
+
+            # Larger than the default threshold of the daemon.
+            array = randint(0, 255, size=(1024, 1024, 3), dtype=uint8)
+            result = await self.client.patch("/test/numpy/body", array, body)
+            self.assertTrue((result[0] == 0).all())
+            self.assertEqual(_Result1(0, "aa"), result.cast(1, _Result1))
+            self.assertLessEqual(4, executor.offloaded)
+            self.assertLessEqual(1, self.servicer.codec_executor.offloaded)
+        finally:
+            executor.shutdown()
+
+    async def test_sync_route_thread(self):
+        result = await self.client.get("/test/sync/thread")
+        self.assertTrue(result[0].startswith("reccd-route"))
+
+        stats = self.servicer.route_executor.stats()
+        self.assertEqual(1, stats["GET /test/sync/thread"].threaded)
+        self.assertEqual(0, stats["GET /test/sync/thread"].running)
+
+    async def test_file_refs(self):
+        array = randint(0, 255, size=(256, 256, 3), dtype=uint8)
+        with TemporaryDirectory() as temp:
+            path = os.path.join(temp, "array.npy")
+            save(path, array)
+            mapped = load(path, mmap_mode="r")
+
+            self.servicer.file_ref_dirs = [temp]
+            result = await self.client.post("/test/numpy/view", mapped)
+            self.assertEqual(int(array.sum()), result[2])
+            # The array is mapped by the daemon, not copied to a segment.
+            stats = self.client.shared_memory_pool.stats
+            self.assertEqual(0, stats.hits + stats.misses)
+
+            result = await self.client.post("/test/numpy", mapped)
+            self.assertTrue((result[0] == 0).all())
+
+    async def test_file_refs_fallback(self):
+        array = randint(0, 255, size=(256, 256, 3), dtype=uint8)
+        with TemporaryDirectory() as temp:
+            path = os.path.join(temp, "array.npy")
+            save(path, array)
+            mapped = load(path, mmap_mode="r")
+
+            # The daemon maps no files unless their directory is configured.
+            result = await self.client.post("/test/numpy/view", mapped)
+            self.assertEqual(int(array.sum()), result[2])
+            if self.client.possible_shared_memory:
+                stats = self.client.shared_memory_pool.stats
+                self.assertLess(0, stats.hits + stats.misses)
+
+    async def test_placement_policy(self):
+        policy = self.client.effective_placement_policy
+        self.assertIsNotNone(policy)
+        expected = self.servicer.placement_policy.inline_threshold
+        self.assertEqual(expected, policy.inline_threshold)
+
+    async def test_route_ids(self):
+        self.assertTrue(self.client.has_route_table)
+
+        # The test module can only be registered once.
+        client = DaemonClient(self.address, negotiate_routes=False)
+        await client.open()
+        try:
+            self.assertFalse(client.has_route_table)
+
+            result0 = await self.client.post("/test/sample/path")
+            result1 = await client.post("/test/sample/path")
+            self.assertEqual(result0[0], result1[0])
+
+            with self.assertRaises(AioRpcError):
+                await client.get("/test/unknown")
+            with self.assertRaises(AioRpcError):
+                await self.client.get("/test/unknown")
+        finally:
+            await client.close()
+
+    async def test_stale_route_ids(self):
+        # A route ID issued by a daemon with another route table.
+        coding = ByteCoding.MsgpackZlib
+        request = PacketQ(
+            method="POST",
+            path="/test/sample/path",
+            coding=coding.value,
+            route_id=0,
+            route_epoch="stale",
+        )
+        async with insecure_channel(self.address) as channel:
+            answer = await DaemonApiStub(channel).Packet(request)
+        result = content_unpack(coding, DEFAULT_PICKLE_ENCODING, answer.args)
+        self.assertEqual("sample", result[0])
+
+    async def test_packet_stream(self):
+        client = DaemonClient(self.address, use_stream=True)
+        await client.open()
+        try:
+            values = [f"value{i}" for i in range(32)]
+            results = await gather(
+                *[client.get(f"/test/{v}/path") for v in values],
+                client.post("/test/numpy", randint(0, 255, size=(4, 4), dtype=uint8)),
+            )
+            self.assertEqual(values, [r[0] for r in results[:-1]])
+            self.assertIsInstance(results[-1][0], ndarray)
+
+            with self.assertRaises(PacketError):
+                await client.get("/test/exception")
+
+            # The stream stays usable after a failed packet.
+            result = await client.get("/test/after/path")
+            self.assertEqual("after", result[0])
+        finally:
+            await client.close()
+
+    async def test_packet_stream_reopen(self):
+        self.client.use_stream = True
+        result = await self.client.get("/test/before/path")
+        self.assertEqual("before", result[0])
+
+        # The stream RPC ends with the daemon, which restarts on the same port.
+        await self.server.stop(None)
+        await self.servicer.close()
+        accept_info = create_daemon_server(f"[::]:{self.port}", self.reccd_test_router)
+        self.servicer = accept_info.servicer
+        self.server = accept_info.server
+        await self.servicer.open()
+        await self.server.start()
+
+        result = await self.client.get("/test/after/path")
+        self.assertEqual("after", result[0])
+
+    async def test_packet_batch(self):
+        for concurrent in (True, False):
+            results = await self.client.batch(
+                [
+                    ("GET", "/test/value0/path"),
+                    ("GET", "/test/exception"),
+                    ("POST", "/test/numpy", (randint(0, 255, size=(4, 4)),)),
+                    BatchRequest("GET", "/test/value3/path"),
+                ],
+                concurrent=concurrent,
+            )
+            self.assertEqual(4, len(results))
+            self.assertEqual("value0", results[0][0])
+            self.assertIsInstance(results[1], PacketError)
+            self.assertIsInstance(results[2][0], ndarray)
+            self.assertEqual("value3", results[3][0])
+
+        self.assertEqual([], await self.client.batch([]))
+
+    async def test_chunked_transfer(self):
+        client = DaemonClient(
+            self.address,
+            disable_shared_memory=True,
+            chunk_size=64 * 1024,
+            chunk_threshold=1024,
+        )
+        await client.open()
+        try:
+            array = randint(0, 255, size=(1270, 1920, 3), dtype=uint8)
+            body = _Test1(0, "a" * 4096, {"k": 100}, [1, "Y"], None, [])
+            result = await client.patch("/test/numpy/body", array, body)
+            self.assertEqual(array.shape, result[0].shape)
+            self.assertTrue((result[0] == 0).all())
+            self.assertEqual(body.value2, result.cast(1, _Result1).value2)
+
+            self.assertEqual(
+                body, (await client.put("/test/body", body)).cast(0, _Test1)
+            )
+        finally:
+            await client.close()
+
+    async def test_chunked_answer(self):
+        client = DaemonClient(
+            self.address,
+            disable_shared_memory=True,
+            max_receive_message_length=256 * 1024,
+            chunk_size=64 * 1024,
+            chunk_answers=True,
+        )
+        await client.open()
+        try:
+            # The answer is larger than a message, the request is not.
+            result = await client.get("/test/numpy/zeros/1048576")
+            self.assertEqual((1048576,), result[0].shape)
+            self.assertTrue((result[0] == 0).all())
+
+            client.chunk_answers = False
+            with self.assertRaises(AioRpcError):
+                await client.get("/test/numpy/zeros/1048576")
+        finally:
+            await client.close()
+
+    async def test_pickle5(self):
+        client = DaemonClient(self.address, coding=ByteCoding.Pickle5)
+        await client.open()
+        try:
+            array = randint(0, 255, size=(256, 256, 3), dtype=uint8)
+            body = _Test1(0, "pickle", {"k": 100}, [array], None, [])
+            with self.assertRaises(AioRpcError):
+                await client.put("/test/body", body)
+
+            self.servicer.allow_pickle = True
+            result = await client.put("/test/body", body)
+            self.assertEqual(body.value2, result[0].value2)
+            self.assertTrue((array == result[0].value4[0]).all())
+        finally:
+            self.servicer.allow_pickle = False
+            await client.close()
+
+    async def test_pickle5_oob(self):
+        array = randint(0, 255, size=(256, 256, 3), dtype=uint8)
+        body = _Test1(0, "oob", {"k": 100}, [array], None, [])
+        coding = ByteCoding.MsgpackZlib
+        with Packer(coding, 0, [body]) as contents:
+            request = PacketQ(method="PUT", path="/test/body", coding=coding.value)
+            request.args.extend(contents.args)
+
+        # A pickle hidden in the out-of-band contents of a harmless coding.
+        oob = request.args[0].oob[0]
+        oob.Clear()
+        oob.data = pickle.dumps(_Payload())
+        oob.size = len(oob.data)
+        oob.pickled = True
+
+        async with insecure_channel(self.address) as channel:
+            with self.assertRaises(AioRpcError):
+                await DaemonApiStub(channel).Packet(request)
+        self.assertEqual([], _UNPICKLED)
+
+    async def test_shared_memory_arena(self):
+        await self._restart_server(dict(use_arena=True))
+        array = randint(0, 255, size=(128, 128, 3), dtype=uint8)
+        body = _Test1(0, "a" * 32768, {"k": 100}, [1, "Y"], None, [])
+        for _ in range(3):
+            result = await self.client.patch("/test/numpy/body", array, body)
+            self.assertTrue((result[0] == 0).all())
+            self.assertEqual(body.value2, result.cast(1, _Result1).value2)
+
+        # The arguments are sub-allocated from the arena, not rented from the pool.
+        stats = self.client.shared_memory_pool.stats
+        self.assertEqual(0, stats.hits + stats.misses)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+import os
+import socket
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main, skipUnless
+
+from reccd.memory.memfd import (
+    MemfdReceiver,
+    MemfdSegment,
+    MemfdSender,
+    is_memfd_name,
+    is_memfd_supported,
+    memfd_address,
+    peer_uid,
+)
+from reccd.variables.rpc import MEMFD_SOCKET_MODE
+
+
+class MemfdAddressTestCase(TestCase):
+    def test_memfd_address(self):
+        self.assertEqual("/tmp/a.sock.memfd", memfd_address("unix:/tmp/a.sock"))
+        self.assertEqual("/tmp/a.sock.memfd", memfd_address("unix:///tmp/a.sock"))
+        self.assertEqual("\0reccd.memfd", memfd_address("unix-abstract:reccd"))
+        self.assertIsNone(memfd_address("localhost:8080"))
+
+
+@skipUnless(is_memfd_supported(), "memfd is not supported")
+class MemfdTestCase(TestCase):
+    def setUp(self):
+        self.temp = TemporaryDirectory()
+        self.address = os.path.join(self.temp.name, "reccd.sock.memfd")
+        self.receiver = MemfdReceiver(self.address)
+        self.receiver.open()
+        self.sender = MemfdSender(self.address)
+        self.sender.open()
+
+    def tearDown(self):
+        self.sender.close()
+        self.receiver.close()
+        self.assertFalse(os.path.exists(self.address))
+        self.temp.cleanup()
+
+    def test_segment(self):
+        sm = MemfdSegment.create(4096)
+        self.assertTrue(is_memfd_name(sm.name))
+        self.assertEqual(4096, sm.size)
+
+        # The size is sealed.
+        with self.assertRaises(OSError):
+            os.ftruncate(sm.fd, 1024)
+
+        sm.buf[:4] = b"test"
+        other = MemfdSegment.attach(sm.name, sm.fd)
+        self.assertEqual(b"test", bytes(other.buf[:4]))
+        other.close()
+        sm.close()
+
+    def test_side_channel(self):
+        sm = self.sender.create(4096)
+        sm.buf[:4] = b"test"
+
+        other = self.receiver.open_segment(sm.name)
+        self.assertEqual(b"test", bytes(other.buf[:4]))
+        other.close()
+        sm.close()
+
+        self.assertEqual(1, self.receiver.size)
+        self.assertTrue(self.receiver.forget(sm.name))
+        self.assertFalse(self.receiver.forget(sm.name))
+        with self.assertRaises(FileNotFoundError):
+            self.receiver.open_segment(sm.name)
+
+    def test_peer_uid(self):
+        left, right = socket.socketpair(socket.AF_UNIX)
+        with left, right:
+            self.assertEqual(os.geteuid(), peer_uid(left))
+
+    def test_peer_credentials(self):
+        self.assertEqual(MEMFD_SOCKET_MODE, os.stat(self.address).st_mode & 0o777)
+
+        # Refuses the clients of other users.
+        address = os.path.join(self.temp.name, "other.sock.memfd")
+        receiver = MemfdReceiver(address, uid=os.geteuid() + 1)
+        receiver.open()
+        sender = MemfdSender(address)
+        try:
+            sender.open()
+            sender.create(4096).close()
+            receiver.poll()
+            self.assertEqual(0, receiver.size)
+        finally:
+            sender.close()
+            receiver.close()
+
+    def test_disconnect(self):
+        self.sender.create(4096).close()
+        self.receiver.poll()
+        self.assertEqual(1, self.receiver.size)
+
+        # The descriptors of a disconnected client are closed.
+        self.sender.close()
+        self.receiver.poll()
+        self.assertEqual(0, self.receiver.size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+from unittest import TestCase, main, skipIf
+
+from numpy import arange, int32, uint8, zeros
+from numpy.random import randint
+
+from reccd.memory.parallel_copy import (
+    CopyTiming,
+    ParallelCopier,
+    benchmark_parallel_copy,
+    crossover_size,
+)
+
+PARALLEL_COPY_BENCHMARK_SKIP = True
+PARALLEL_COPY_BENCHMARK_SKIP_MESSAGE = "Parallel copy benchmark is off"
+# 4 threads, best of 5. Serial / Parallel seconds on a host with 1 CPU,
+# where the parallel copy never wins and the default copier stays serial:
+# 1MB: 0.0001 / 0.0002, 16MB: 0.0021 / 0.0022, 256MB: 0.0323 / 0.0494
+
+
+class ParallelCopierTestCase(TestCase):
+    def setUp(self):
+        self.copier = ParallelCopier(threads=4, threshold=0)
+
+    def tearDown(self):
+        self.copier.shutdown()
+
+    def test_copy_buffer(self):
+        src = randint(0, 255, size=1000003, dtype=uint8).tobytes()
+        dst = bytearray(len(src))
+        self.copier.copy_buffer(memoryview(dst), src)
+        self.assertEqual(src, bytes(dst))
+
+    def test_copy_array(self):
+        src = arange(7 * 5 * 3, dtype=int32).reshape(7, 5, 3).transpose(1, 0, 2)
+        dst = zeros(src.shape, dtype=int32)
+        self.copier.copy_array(dst, src)
+        self.assertTrue((dst == src).all())
+
+        src = arange(1 * 1000, dtype=int32).reshape(1, 1000)
+        dst = zeros(src.shape, dtype=int32)
+        self.copier.copy_array(dst, src)
+        self.assertTrue((dst == src).all())
+
+        # A broadcast source is not split with the destination.
+        src = arange(5, dtype=int32)
+        dst = zeros((7, 5), dtype=int32)
+        self.copier.copy_array(dst, src)
+        self.assertTrue((dst == src).all())
+
+    def test_read(self):
+        view = memoryview(b"0123456789")
+        self.assertIsInstance(self.copier.read(view), bytearray)
+        self.assertEqual(b"0123456789", self.copier.read(view))
+
+        serial = ParallelCopier(threads=1)
+        self.assertIsInstance(serial.read(view), bytes)
+        self.assertIsInstance(serial.read(view, writable=True), bytearray)
+
+    def test_crossover_size(self):
+        timings = [
+            CopyTiming(1, 1.0, 2.0),
+            CopyTiming(2, 1.0, 0.5),
+            CopyTiming(4, 1.0, 2.0),
+            CopyTiming(8, 1.0, 0.5),
+            CopyTiming(16, 1.0, 0.5),
+        ]
+        self.assertEqual(8, crossover_size(timings))
+        self.assertIsNone(crossover_size(timings[:1]))
+
+    @skipIf(PARALLEL_COPY_BENCHMARK_SKIP, PARALLEL_COPY_BENCHMARK_SKIP_MESSAGE)
+    def test_benchmark(self):
+        timings = benchmark_parallel_copy(threads=4)
+        for timing in timings:
+            print(
+                f"{timing.size // 1024 // 1024}MB: "
+                f"{timing.serial_seconds:.4f} / {timing.parallel_seconds:.4f}"
+            )
+        print(f"Crossover: {crossover_size(timings)}")
+
+    def test_benchmark_range(self):
+        timings = benchmark_parallel_copy(1024, 4096, repeat=1, threads=2)
+        self.assertEqual([1024, 2048, 4096], [t.size for t in timings])
+        with self.assertRaises(ValueError):
+            benchmark_parallel_copy(1024, 512)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+from unittest import TestCase, main
+from unittest.mock import patch
+
+from numpy import arange, int32, ndarray
+
+from reccd.memory.shared_memory_arena import SharedMemoryArena
+
+
+def _fail_copy(dst, src) -> None:
+    raise ValueError
+
+
+class SharedMemoryArenaTestCase(TestCase):
+    def setUp(self):
+        self.arena = SharedMemoryArena(arena_size=4096, alignment=64)
+
+    def tearDown(self):
+        self.arena.clear()
+
+    def test_sub_allocation(self):
+        written0 = self.arena.write(b"aaa")
+        written1 = self.arena.write(b"bbbb")
+        self.assertEqual(written0.sm_name, written1.sm_name)
+        self.assertEqual(0, written0.offset)
+        self.assertEqual(64, written1.offset)
+        self.assertEqual(4, written1.size)
+
+        sm = self.arena.find_working(written1.sm_name)
+        self.assertEqual(b"bbbb", bytes(sm.buf[written1.offset : written1.end]))
+
+        self.arena.release(written0)
+        self.assertEqual(0, self.arena.write(b"c" * 64).offset)
+        self.assertEqual(1, self.arena.stats.segments)
+
+    def test_coalesce(self):
+        writes = [self.arena.write(bytes(1024)) for _ in range(4)]
+        for written in writes:
+            self.arena.release(written)
+        self.assertEqual(0, self.arena.stats.allocated_bytes)
+        self.assertEqual(0, self.arena.write(bytes(4096)).offset)
+
+    def test_extra_segment(self):
+        primary = self.arena.write(bytes(4000))
+        extra = self.arena.write(bytes(8192))
+        self.assertNotEqual(primary.sm_name, extra.sm_name)
+        self.assertEqual(2, self.arena.stats.segments)
+
+        self.arena.release(extra)
+        self.assertEqual(1, self.arena.stats.segments)
+        self.assertEqual([extra.sm_name], self.arena.pop_unlinked())
+
+        # The primary segment is kept even when empty.
+        self.arena.release(primary)
+        self.assertEqual(1, self.arena.stats.segments)
+
+    def test_write_array(self):
+        self.arena.write(b"x")
+        array = arange(24, dtype=int32).reshape(2, 3, 4).transpose()
+        written = self.arena.write_array(array)
+        self.assertEqual(64, written.offset)
+
+        sm = self.arena.find_working(written.sm_name)
+        view = ndarray(
+            shape=array.shape,
+            dtype=array.dtype,
+            buffer=sm.buf,
+            offset=written.offset,
+        )
+        self.assertTrue((view == array).all())
+        del view
+
+    def test_write_error(self):
+        copier = self.arena.copier
+        with patch.object(copier, "copy_buffer", _fail_copy):
+            with self.assertRaises(ValueError):
+                self.arena.write(b"aaa")
+        with patch.object(copier, "copy_array", _fail_copy):
+            with self.assertRaises(ValueError):
+                self.arena.write_array(arange(4))
+        # The allocations of the failed copies are released.
+        self.assertEqual(0, self.arena.stats.allocated_bytes)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            SharedMemoryArena(arena_size=0)
+        with self.assertRaises(ValueError):
+            SharedMemoryArena(alignment=48)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+import os
+from subprocess import Popen
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+
+from reccd.memory.shared_memory_janitor import SharedMemoryJanitor, is_process_alive
+from reccd.memory.shared_memory_name import (
+    SharedMemoryOwner,
+    parse_shared_memory_name,
+    shared_memory_name,
+)
+from reccd.memory.shared_memory_utils import (
+    create_shared_memory,
+    destroy_shared_memory,
+)
+
+
+def _dead_pid() -> int:
+    process = Popen(["true"])
+    process.wait()
+    return process.pid
+
+
+class SharedMemoryNameTestCase(TestCase):
+    def test_name(self):
+        name = shared_memory_name("0123456789abcdef", pid=0x1F2E)
+        self.assertGreaterEqual(31, len(name))
+        owner = parse_shared_memory_name(name)
+        self.assertEqual(SharedMemoryOwner(0x1F2E, "01234567"), owner)
+
+        owner = parse_shared_memory_name(shared_memory_name())
+        self.assertEqual(SharedMemoryOwner(os.getpid(), ""), owner)
+
+    def test_foreign_name(self):
+        self.assertIsNone(parse_shared_memory_name("psm_0123abcd"))
+        self.assertIsNone(parse_shared_memory_name("reccd_xyz_a_b"))
+        self.assertIsNone(parse_shared_memory_name("reccd_0_a_b"))
+        self.assertIsNone(parse_shared_memory_name("reccd_1f_a"))
+
+    def test_create_shared_memory(self):
+        sm = create_shared_memory(16, "session")
+        try:
+            owner = parse_shared_memory_name(sm.name)
+            self.assertEqual(SharedMemoryOwner(os.getpid(), "session"), owner)
+        finally:
+            destroy_shared_memory(sm)
+
+
+class SharedMemoryJanitorTestCase(TestCase):
+    def setUp(self):
+        self.temp = TemporaryDirectory()
+        self.janitor = SharedMemoryJanitor(self.temp.name)
+
+        self.dead = shared_memory_name("dead", pid=_dead_pid())
+        self.alive = shared_memory_name("alive")
+        self.foreign = "psm_0123abcd"
+        for name in (self.dead, self.alive, self.foreign):
+            with open(os.path.join(self.temp.name, name), "wb") as f:
+                f.write(bytes(8))
+
+    def tearDown(self):
+        self.temp.cleanup()
+
+    def test_is_process_alive(self):
+        self.assertTrue(is_process_alive(os.getpid()))
+        self.assertFalse(is_process_alive(_dead_pid()))
+
+    def test_sweep(self):
+        orphans = self.janitor.sweep(dry_run=True)
+        self.assertEqual([self.dead], [x.name for x in orphans])
+        self.assertEqual("dead", orphans[0].session)
+        self.assertEqual(8, orphans[0].size)
+        self.assertEqual(3, len(os.listdir(self.temp.name)))
+
+        self.assertEqual(orphans, self.janitor.sweep())
+        self.assertEqual(
+            sorted([self.alive, self.foreign]),
+            sorted(os.listdir(self.temp.name)),
+        )
+        self.assertEqual(1, self.janitor.unlinked)
+        self.assertEqual(8, self.janitor.unlinked_bytes)
+        self.assertEqual(2, self.janitor.sweeps)
+        self.assertEqual([], self.janitor.sweep())
+
+    def test_unsupported(self):
+        janitor = SharedMemoryJanitor(os.path.join(self.temp.name, "none"))
+        self.assertFalse(janitor.is_supported())
+        self.assertEqual([], janitor.sweep())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,17 @@
 # -*- coding: utf-8 -*-
 
 from multiprocessing.shared_memory import SharedMemory
+from time import monotonic
 from unittest import TestCase, main
+from unittest.mock import patch
 
-from reccd.memory.shared_memory_queue import SharedMemoryQueue
+from numpy import arange, int32, ndarray
+
+from reccd.memory.shared_memory_queue import SharedMemoryQueue, size_class
+
+
+def _fail_copy(dst, src) -> None:
+    raise ValueError
 
 
 class SharedMemoryQueueTestCase(TestCase):
@@ -64,6 +72,113 @@ class SharedMemoryQueueTestCase(TestCase):
         self.assertEqual(1, self.smq.size_waiting())
         self.assertEqual(0, self.smq.size_working())
 
+    def test_write_array(self):
+        array = arange(24, dtype=int32).reshape(2, 3, 4).transpose()
+        self.assertFalse(array.flags.c_contiguous)
+
+        written = self.smq.write_array(array)
+        self.assertEqual(array.nbytes, written.size)
+
+        sm = self.smq.find_working(written.sm_name)
+        view = ndarray(shape=array.shape, dtype=array.dtype, buffer=sm.buf)
+        self.assertTrue((view == array).all())
+        del view
+
+        data = memoryview(array.copy())
+        self.assertEqual("i", data.format)
+        written = self.smq.write(data)
+        self.assertEqual(array.nbytes, written.size)
+
+    def test_write_error(self):
+        copier = self.smq.copier
+        with patch.object(copier, "copy_buffer", _fail_copy):
+            with self.assertRaises(ValueError):
+                self.smq.write(b"aaa")
+        with patch.object(copier, "copy_array", _fail_copy):
+            with self.assertRaises(ValueError):
+                self.smq.write_array(arange(4))
+        # The segments of the failed copies are returned to the pool.
+        self.assertEqual(0, self.smq.size_working())
+        self.assertEqual(1, self.smq.size_waiting())
+
+    def test_size_class(self):
+        self.assertEqual(4096, size_class(1))
+        self.assertEqual(4096, size_class(4096))
+        self.assertEqual(8192, size_class(4097))
+        self.assertEqual(1, size_class(0, min_size=0))
+
+    def test_best_fit(self):
+        with self.smq.rent(100 * 1024) as large, self.smq.rent(1024) as small:
+            large_name = large.name
+            small_name = small.name
+        self.assertEqual(2, self.smq.size_waiting())
+
+        # The small segment fits best, then the large one is the only fit.
+        with self.smq.rent(2048) as sm:
+            self.assertEqual(small_name, sm.name)
+        with self.smq.rent(64 * 1024) as sm:
+            self.assertEqual(large_name, sm.name)
+
+        stats = self.smq.stats
+        self.assertEqual(2, stats.hits)
+        self.assertEqual(2, stats.misses)
+        self.assertEqual(0.5, stats.hit_rate)
+        self.assertEqual(128 * 1024 + 4096, stats.resident_bytes)
+        self.assertEqual(0, stats.working_bytes)
+
+    def test_max_bytes(self):
+        smq = SharedMemoryQueue(max_bytes=16 * 1024)
+        try:
+            with smq.multi_rent(3, 4096) as sms:
+                first = next(iter(sms))
+            self.assertEqual(3, smq.size_waiting())
+
+            # The least recently used idle segment is evicted first.
+            with smq.rent(8192):
+                self.assertEqual(2, smq.size_waiting())
+            self.assertEqual(1, smq.stats.evictions)
+            self.assertIn(first, smq.pop_unlinked())
+            self.assertLessEqual(smq.stats.resident_bytes, 16 * 1024)
+        finally:
+            smq.clear()
+
+    def test_max_queue(self):
+        smq = SharedMemoryQueue(max_queue=1)
+        try:
+            with smq.multi_rent(3, 4096):
+                pass
+            self.assertEqual(1, smq.size_waiting())
+            self.assertEqual(2, len(smq.pop_unlinked()))
+        finally:
+            smq.clear()
+
+    def test_trim_idle(self):
+        smq = SharedMemoryQueue(idle_timeout=10.0)
+        try:
+            with smq.rent(4096):
+                pass
+            self.assertEqual(0, smq.trim_idle())
+            self.assertEqual(1, smq.trim_idle(now=monotonic() + 10.0))
+            self.assertEqual(0, smq.size_waiting())
+            self.assertEqual(0, smq.stats.resident_bytes)
+        finally:
+            smq.clear()
+
+    def test_warm_up(self):
+        smq = SharedMemoryQueue(prefault=True, huge_pages=True)
+        try:
+            self.assertEqual(3, smq.warm_up(3, 4 * 1024 * 1024))
+            self.assertEqual(0, smq.warm_up(3, 4 * 1024 * 1024))
+            self.assertEqual(1, smq.warm_up(4, 1024 * 1024))
+            self.assertEqual(4, smq.size_waiting())
+
+            with smq.multi_rent(3, 4 * 1024 * 1024):
+                pass
+            self.assertEqual(3, smq.stats.hits)
+            self.assertEqual(0, smq.stats.misses)
+        finally:
+            smq.clear()
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+from unittest import TestCase, main
+
+from reccd.memory.shared_memory_utils import (
+    SharedMemoryAttachmentCache,
+    advise_huge_pages,
+    create_shared_memory,
+    destroy_shared_memory,
+    prepare_shared_memory,
+)
+
+
+class SharedMemoryAttachmentCacheTestCase(TestCase):
+    def setUp(self):
+        self.sm = create_shared_memory(16)
+        self.sm.buf[:4] = b"test"
+        self.cache = SharedMemoryAttachmentCache(idle_timeout=10.0)
+
+    def tearDown(self):
+        self.cache.clear()
+        destroy_shared_memory(self.sm)
+
+    def test_attach(self):
+        sm0 = self.cache.attach("session", self.sm.name)
+        self.assertEqual(b"test", bytes(sm0.buf[:4]))
+        sm1 = self.cache.attach("session", self.sm.name)
+        self.assertIs(sm0, sm1)
+
+        stats = self.cache.stats
+        self.assertEqual(1, stats.hits)
+        self.assertEqual(1, stats.remaps)
+        self.assertEqual(1, stats.sessions)
+        self.assertEqual(1, stats.mappings)
+        self.assertEqual(self.sm.size, stats.mapped_bytes)
+        self.assertEqual({"session": self.sm.size}, self.cache.session_bytes())
+
+        self.assertTrue(self.cache.evict("session", self.sm.name))
+        self.assertFalse(self.cache.evict("session", self.sm.name))
+        self.assertEqual(1, self.cache.stats.evictions)
+        self.assertEqual(0, self.cache.stats.mappings)
+
+    def test_evict_idle(self):
+        self.cache.attach("session", self.sm.name)
+        self.cache.release("session")
+        self.assertEqual(0, self.cache.evict_idle())
+        self.assertEqual(1, self.cache.evict_idle(now=float("inf")))
+        self.assertEqual(0, self.cache.stats.sessions)
+
+    def test_evict_idle_in_use(self):
+        self.cache.attach("session", self.sm.name)
+        self.cache.attach("session", self.sm.name)
+        self.cache.release("session")
+
+        # A call still holds the session.
+        self.assertEqual(0, self.cache.evict_idle(now=float("inf")))
+        self.cache.release("session")
+        self.assertEqual(1, self.cache.evict_idle(now=float("inf")))
+
+
+class PrepareSharedMemoryTestCase(TestCase):
+    def test_prepare(self):
+        sm = create_shared_memory(4 * 1024 * 1024)
+        try:
+            prepare_shared_memory(sm, prefault=True, huge_pages=True)
+            self.assertEqual(bytes(16), bytes(sm.buf[:16]))
+        finally:
+            destroy_shared_memory(sm)
+
+    def test_small_segment(self):
+        sm = create_shared_memory(4096)
+        try:
+            self.assertFalse(advise_huge_pages(sm))
+        finally:
+            destroy_shared_memory(sm)
+
+
+if __name__ == "__main__":
+    main()
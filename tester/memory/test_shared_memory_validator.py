@@ -1,10 +1,16 @@
 # -*- coding: utf-8 -*-
 
-from unittest import TestCase, main
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main, skipUnless
+from unittest.mock import patch
 
+from reccd.memory.memfd import MemfdReceiver, MemfdSender, is_memfd_supported
 from reccd.memory.shared_memory_validator import (
     SharedMemoryTestInfo,
+    register_memfd,
     register_shared_memory,
+    validate_memfd,
     validate_shared_memory,
 )
 
@@ -15,6 +21,33 @@ class SharedMemoryValidatorTestCase(TestCase):
             self.assertIsInstance(test, SharedMemoryTestInfo)
             self.assertTrue(validate_shared_memory(test.name, test.data))
 
+    def test_unavailable(self):
+        with patch(
+            "reccd.memory.shared_memory_validator.create_shared_memory",
+            side_effect=OSError,
+        ):
+            with register_shared_memory() as test:
+                self.assertEqual(SharedMemoryTestInfo(str(), str()), test)
+                self.assertFalse(validate_shared_memory(test.name, test.data))
+
+    @skipUnless(is_memfd_supported(), "memfd is not supported")
+    def test_memfd(self):
+        with TemporaryDirectory() as temp:
+            receiver = MemfdReceiver(os.path.join(temp, "memfd.sock"))
+            receiver.open()
+            sender = MemfdSender(receiver.address)
+            sender.open()
+            try:
+                with register_memfd(sender) as test:
+                    self.assertTrue(validate_memfd(receiver, test.name, test.data))
+                    # The test segment is forgotten once it is checked.
+                    self.assertEqual(0, receiver.size)
+                with register_memfd() as test:
+                    self.assertFalse(validate_memfd(receiver, test.name, test.data))
+            finally:
+                sender.close()
+                receiver.close()
+
 
 if __name__ == "__main__":
     main()
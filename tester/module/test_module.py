@@ -55,6 +55,20 @@ class ModuleTestCase(ModuleIsolatedAsyncioTestCase):
         self.assertEqual("0.0.0", module.version)
         self.assertEqual("Documentation", module.doc)
 
+    def test_route_epoch(self):
+        module0 = Module(self.reccd_test_router, isolate=True)
+        module1 = Module(self.reccd_test_router, isolate=True)
+        self.assertEqual(str(), module0.route_epoch)
+
+        module0.update_routes()
+        module1.update_routes()
+        self.assertTrue(module0.route_epoch)
+        self.assertEqual(module0.route_epoch, module1.route_epoch)
+
+        # Any route added to the table changes the epoch.
+        module1.update_routes()
+        self.assertNotEqual(module0.route_epoch, module1.route_epoch)
+
 
 if __name__ == "__main__":
     main()
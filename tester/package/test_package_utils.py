@@ -24,7 +24,7 @@ class PackageUtilsTestCase(TestCase):
     def test_list_submodule_names(self):
         modules = list_submodule_names(reccd_app)
         modules.sort()
-        self.assertListEqual(["client", "modules", "server"], modules)
+        self.assertListEqual(["client", "modules", "server", "shm"], modules)
 
     def test_all_module_names(self):
         self.assertIn("pip", all_module_names())
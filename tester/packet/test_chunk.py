@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+from unittest import TestCase, main
+
+from numpy import ndarray
+from numpy.random import randint
+from type_serialize import ByteCoding
+
+from reccd.packet.chunk import ChunkAssembler, iter_content_chunks
+from reccd.packet.packer import Packer
+from reccd.packet.unpacker import content_unpack
+from reccd.proto.daemon.daemon_api_pb2 import ContentChunk
+from reccd.variables.rpc import DEFAULT_PICKLE_ENCODING
+
+
+class ChunkTestCase(TestCase):
+    def test_round_trip(self):
+        array = randint(0, 255, size=(30, 20, 3)).astype("uint8")[:, ::2]
+        body = {"key": "x" * 1000}
+        small = [1, 2, 3]
+        coding = ByteCoding.Msgpack
+
+        packer = Packer(coding, 0, [array, small], {"body": body}, chunk_threshold=100)
+        with packer as contents:
+            self.assertTrue(contents.args[0].chunked)
+            self.assertFalse(contents.args[1].chunked)
+            self.assertTrue(contents.kwargs["body"].chunked)
+            self.assertEqual({0, "body"}, set(contents.buffers.keys()))
+
+            assembler = ChunkAssembler(contents.args, contents.kwargs)
+            self.assertFalse(assembler.complete)
+            for chunk in iter_content_chunks(contents.buffers, 64):
+                self.assertLessEqual(len(chunk.data), 64)
+                assembler.write(chunk)
+            assembler.validate()
+
+            self.assertIsInstance(assembler.buffers[0], ndarray)
+            result = content_unpack(
+                coding=coding,
+                encoding=DEFAULT_PICKLE_ENCODING,
+                args=contents.args,
+                kwargs=contents.kwargs,
+                buffers=assembler.buffers,
+            )
+
+        self.assertTrue((array == result[0]).all())
+        self.assertEqual(small, result[1])
+        self.assertEqual(body, result["body"])
+
+    def test_invalid_chunks(self):
+        packer = Packer(ByteCoding.Msgpack, 0, [["0" * 200]], chunk_threshold=100)
+        with packer as contents:
+            assembler = ChunkAssembler(contents.args, contents.kwargs)
+            size = contents.args[0].size
+            with self.assertRaises(ValueError):
+                assembler.write(ContentChunk(arg=0, offset=size, data=b"0"))
+            with self.assertRaises(KeyError):
+                assembler.write(ContentChunk(arg=1, offset=0, data=b"0"))
+            assembler.write(ContentChunk(arg=0, offset=0, data=b"0"))
+            with self.assertRaises(ValueError):
+                assembler.validate()
+
+            # Duplicate and overlapping chunks would leave a hole.
+            with self.assertRaises(ValueError):
+                assembler.write(ContentChunk(arg=0, offset=0, data=b"0"))
+            with self.assertRaises(ValueError):
+                assembler.write(ContentChunk(arg=0, offset=2, data=b"0"))
+            assembler.write(ContentChunk(arg=0, offset=1, data=bytes(size - 1)))
+            assembler.validate()
+
+
+if __name__ == "__main__":
+    main()
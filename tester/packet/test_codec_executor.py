@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+from dataclasses import dataclass
+from threading import current_thread
+from typing import List
+from unittest import IsolatedAsyncioTestCase, TestCase, main
+
+from numpy import zeros
+from type_serialize import ByteCoding
+
+from reccd.packet.codec_executor import CodecExecutor, payload_size
+from reccd.packet.packer import Packer
+
+
+@dataclass
+class _Body:
+    name: str
+    values: List[int]
+
+
+def _thread_name() -> str:
+    return current_thread().name
+
+
+class PayloadSizeTestCase(TestCase):
+    def test_payload_size(self):
+        self.assertEqual(800, payload_size(zeros(100)))
+        self.assertEqual(3, payload_size(b"abc"))
+        self.assertEqual(8, payload_size(None))
+        self.assertEqual(4 + 8 * 1000, payload_size(_Body("name", [0] * 1000)))
+        self.assertEqual(1 + 800, payload_size({"a": zeros(100)}))
+        self.assertEqual(0, payload_size(object()))
+
+
+class CodecExecutorTestCase(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.executor = CodecExecutor(threads=1, threshold=16)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    async def test_run(self):
+        self.assertEqual(_thread_name(), await self.executor.run(16, _thread_name))
+        self.assertEqual(0, self.executor.offloaded)
+
+        name = await self.executor.run(17, _thread_name)
+        self.assertTrue(name.startswith("reccd-codec"))
+        self.assertEqual(1, self.executor.offloaded)
+
+    async def test_disabled(self):
+        executor = CodecExecutor(threads=0, threshold=0)
+        self.assertFalse(executor.is_offloaded(1 << 30))
+        self.assertEqual(_thread_name(), await executor.run(1 << 30, _thread_name))
+
+    async def test_packer_encode(self):
+        body = _Body("name", list(range(100)))
+        coding = ByteCoding.MsgpackZlib
+
+        with Packer(coding, 9, args=[body, 1], kwargs={"k": body}) as expected:
+            pass
+
+        packer = Packer(coding, 9, args=[body, 1], kwargs={"k": body})
+        await packer.encode(self.executor)
+        self.assertEqual(2, self.executor.offloaded)
+        with packer as contents:
+            self.assertEqual(expected.args, contents.args)
+            self.assertEqual(expected.kwargs, contents.kwargs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+from os import urandom
+from unittest import TestCase, main
+
+from type_serialize import ByteCoding
+
+from reccd.packet.codec_policy import CodecPolicy
+from reccd.packet.packer import Packer
+from reccd.packet.unpacker import content_unpack
+from reccd.variables.rpc import DEFAULT_PICKLE_ENCODING
+
+
+class CodecPolicyTestCase(TestCase):
+    def setUp(self):
+        self.policy = CodecPolicy(compress_threshold=1024)
+        self.small = {"a": 1}
+        self.text = {"a": "x" * 4096}
+        self.noise = {"a": urandom(4096)}
+
+    def test_encode(self):
+        coding = ByteCoding.MsgpackZlib
+        self.assertEqual(
+            ByteCoding.Msgpack, self.policy.encode(self.small, coding).coding
+        )
+        self.assertEqual(coding, self.policy.encode(self.text, coding).coding)
+        self.assertEqual(
+            ByteCoding.Msgpack, self.policy.encode(self.noise, coding).coding
+        )
+
+    def test_local_and_override(self):
+        coding = ByteCoding.MsgpackZlib
+        local = self.policy.encode(self.text, coding, local=True)
+        self.assertEqual(ByteCoding.Msgpack, local.coding)
+        always = self.policy.encode(self.small, coding, local=True, compress=True)
+        self.assertEqual(coding, always.coding)
+        never = self.policy.encode(self.text, coding, compress=False)
+        self.assertEqual(ByteCoding.Msgpack, never.coding)
+
+    def test_no_zlib_variant(self):
+        encoded = self.policy.encode(self.text, ByteCoding.Pickle5)
+        self.assertEqual(ByteCoding.Pickle5, encoded.coding)
+
+    def test_mixed_contents(self):
+        coding = ByteCoding.MsgpackZlib
+        args = [self.small, self.text, self.noise]
+        with Packer(coding, 0, args, codec_policy=self.policy) as contents:
+            codings = [ByteCoding(c.coding) for c in contents.args]
+            self.assertEqual(
+                [ByteCoding.Msgpack, coding, ByteCoding.Msgpack],
+                codings,
+            )
+            result = content_unpack(coding, DEFAULT_PICKLE_ENCODING, contents.args)
+        self.assertEqual(args, list(result))
+
+
+if __name__ == "__main__":
+    main()
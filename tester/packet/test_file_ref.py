@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+
+from numpy import arange, float32, load, memmap, save, uint8
+from type_serialize import ByteCoding
+
+from reccd.packet.file_ref import (
+    is_file_allowed,
+    is_file_visible,
+    memmap_file_ref,
+    open_file_ref,
+)
+from reccd.packet.packer import Packer
+
+
+class FileRefTestCase(TestCase):
+    def setUp(self):
+        self.temp = TemporaryDirectory()
+        self.path = os.path.join(self.temp.name, "array.npy")
+        self.array = arange(1000 * 100, dtype=float32).reshape(1000, 100)
+        save(self.path, self.array)
+
+    def tearDown(self):
+        self.temp.cleanup()
+
+    def test_memmap_file_ref(self):
+        mapped = load(self.path, mmap_mode="r")
+        ref = memmap_file_ref(mapped)
+        self.assertIsNotNone(ref)
+        self.assertEqual(os.path.abspath(self.path), ref.path)
+        self.assertEqual(mapped.offset, ref.offset)
+        self.assertTrue(is_file_visible(ref, [self.temp.name]))
+
+        view = mapped[10:20, 5::2]
+        view_ref = memmap_file_ref(view)
+        self.assertEqual(ref.offset + 10 * 400 + 5 * 4, view_ref.offset)
+
+        self.assertIsNone(memmap_file_ref(self.array))
+        self.assertIsNone(memmap_file_ref(load(self.path, mmap_mode="c")))
+        self.assertIsNone(memmap_file_ref(mapped[::-1]))
+
+    def test_changed_file(self):
+        ref = memmap_file_ref(load(self.path, mmap_mode="r"))
+        ref.inode += 1
+        self.assertFalse(is_file_visible(ref, [self.temp.name]))
+
+    def test_file_ref_dirs(self):
+        ref = memmap_file_ref(load(self.path, mmap_mode="r"))
+        self.assertFalse(is_file_visible(ref, list()))
+        self.assertTrue(is_file_allowed(self.path, [self.temp.name]))
+        self.assertFalse(is_file_allowed(self.path, [self.path + "x"]))
+
+        # Symbolic links are resolved before the check.
+        with TemporaryDirectory() as other:
+            link = os.path.join(other, "link.npy")
+            os.symlink(self.path, link)
+            self.assertFalse(is_file_allowed(link, [other]))
+            self.assertTrue(is_file_allowed(link, [self.temp.name]))
+
+    def test_open_file_ref(self):
+        mapped = memmap(self.path, dtype=uint8, mode="r")
+        view = load(self.path, mmap_mode="r")[10:20, 5::2]
+        packer = Packer(
+            ByteCoding.MsgpackZlib,
+            0,
+            [view, mapped],
+            file_refs={id(view): memmap_file_ref(view)},
+        )
+        with packer as contents:
+            content = contents.args[0]
+            self.assertTrue(content.HasField("file"))
+            self.assertFalse(content.data)
+            self.assertFalse(contents.args[1].HasField("file"))
+        self.assertEqual(1, packer.file_count)
+
+        array = open_file_ref(content, [self.temp.name])
+        self.assertFalse(array.flags.writeable)
+        self.assertTrue((self.array[10:20, 5::2] == array).all())
+
+        with self.assertRaises(PermissionError):
+            open_file_ref(content, list())
+
+
+if __name__ == "__main__":
+    main()
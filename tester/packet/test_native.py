@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+from unittest import IsolatedAsyncioTestCase, main
+
+from type_serialize import ByteCoding
+from type_serialize.variables import COMPRESS_LEVEL_BEST
+
+from reccd.memory.shared_memory_queue import SharedMemoryQueue
+from reccd.packet.native import has_native, native_to_content
+from reccd.packet.packer import Packer
+from reccd.packet.parameter_matcher import call_router
+from reccd.packet.unpacker import content_unpack
+from reccd.variables.rpc import DEFAULT_INLINE_BYTES_SIZE, DEFAULT_PICKLE_ENCODING
+
+
+class NativeTestCase(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.smq = SharedMemoryQueue()
+        self.coding = ByteCoding.MsgpackZlib
+
+    def tearDown(self):
+        self.smq.clear()
+
+    def test_native_to_content(self):
+        self.assertIsNone(native_to_content(2**64))
+        self.assertIsNone(native_to_content("\udc80"))
+        self.assertIsNone(native_to_content([1]))
+        self.assertIsNone(native_to_content(bytes(DEFAULT_INLINE_BYTES_SIZE + 1)))
+        self.assertEqual("int_value", native_to_content(1).WhichOneof("native"))
+        self.assertEqual("bool_value", native_to_content(True).WhichOneof("native"))
+
+    def test_inline_with_shared_memory(self):
+        args = [None, True, -7, 1.5, "text", b"bytes", memoryview(b"view")]
+        with Packer(self.coding, 0, args, smq=self.smq) as contents:
+            self.assertTrue(all(has_native(c) for c in contents.args))
+            self.assertFalse(any(c.sm_name for c in contents.args))
+            self.assertEqual(0, self.smq.size_working())
+            result = content_unpack(self.coding, DEFAULT_PICKLE_ENCODING, contents.args)
+
+        expected = [None, True, -7, 1.5, "text", b"bytes", b"view"]
+        self.assertEqual(expected, list(result))
+
+    def test_raw_bytes(self):
+        large = bytes(range(256)) * 1024
+        with Packer(self.coding, 0, [large], smq=self.smq) as contents:
+            content = contents.args[0]
+            self.assertTrue(content.raw)
+            self.assertTrue(content.sm_name)
+            sms = {content.sm_name: self.smq.find_working(content.sm_name)}
+            result = content_unpack(
+                self.coding, DEFAULT_PICKLE_ENCODING, contents.args, sms=sms
+            )
+        self.assertEqual(large, result[0])
+
+    async def test_call_router(self):
+        async def _route(value: float, name: str, data: bytearray):
+            self.assertIsInstance(value, float)
+            self.assertIsInstance(data, bytearray)
+            return [value * 2, name.upper(), bytes(data)]
+
+        args = [2, "name", b"data"]
+        with Packer(self.coding, 0, args) as contents:
+            result = await call_router(
+                func=_route,
+                match_info=dict(),
+                coding=self.coding,
+                encoding=DEFAULT_PICKLE_ENCODING,
+                compress_level=COMPRESS_LEVEL_BEST,
+                args=contents.args,
+                kwargs=contents.kwargs,
+                sm_names=list(),
+            )
+
+        self.assertTrue(all(has_native(c) for c in result.args))
+        answer = content_unpack(self.coding, DEFAULT_PICKLE_ENCODING, result.args)
+        self.assertEqual([4.0, "NAME", b"data"], list(answer))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+from dataclasses import dataclass, field
+from typing import Dict
+from unittest import IsolatedAsyncioTestCase, main
+
+from numpy import arange, ndarray, uint8, zeros
+from numpy.testing import assert_array_equal
+from type_serialize import ByteCoding, deserialize, serialize
+from type_serialize.variables import COMPRESS_LEVEL_BEST
+
+from reccd.memory.shared_memory_queue import SharedMemoryQueue
+from reccd.packet.oob import (
+    OOB_KEY,
+    extract_arrays,
+    pickle_object,
+    proto_to_array,
+    restore_arrays,
+)
+from reccd.packet.packer import Packer
+from reccd.packet.parameter_matcher import call_router
+from reccd.packet.unpacker import content_unpack
+from reccd.variables.rpc import DEFAULT_PICKLE_ENCODING
+
+
+@dataclass
+class _Frame:
+    name: str = ""
+    image: ndarray = field(default_factory=lambda: arange(0))
+    extra: Dict[str, int] = field(default_factory=dict)
+
+
+class OobTestCase(IsolatedAsyncioTestCase):
+    def setUp(self):
+        image = arange(4 * 5 * 3, dtype=uint8).reshape(4, 5, 3)
+        self.frame = _Frame("frame", image, {"a": 1})
+
+    def test_extract_arrays(self):
+        tree, arrays = extract_arrays(serialize({"x": [self.frame.image, 1]}))
+        self.assertEqual(1, len(arrays))
+        self.assertEqual({"x": [{OOB_KEY: 0}, 1]}, tree)
+
+    def test_escaped_dicts(self):
+        user = [{OOB_KEY: 0}, {OOB_KEY: {OOB_KEY: 1}, "a": 2}, self.frame.image]
+        tree, arrays = extract_arrays(serialize(user))
+        self.assertEqual(1, len(arrays))
+
+        result = restore_arrays(tree, [proto_to_array(x) for x in arrays])
+        self.assertEqual(user[:2], result[:2])
+        assert_array_equal(self.frame.image, deserialize(result[2], ndarray))
+        self.assertEqual(user[:1], restore_arrays(extract_arrays(user[:1])[0], []))
+
+    def test_pickle_object(self):
+        large = zeros(8192, dtype=uint8)
+        _, buffers = pickle_object([self.frame, large])
+        self.assertEqual(1, len(buffers))
+        self.assertEqual(large.nbytes, buffers[0].nbytes)
+
+    def test_pickle5_shared_memory(self):
+        large = arange(256 * 256, dtype=uint8).reshape(256, 256)
+        frame = _Frame("large", large, {"b": 2})
+        coding = ByteCoding.Pickle5
+        smq = SharedMemoryQueue()
+        try:
+            with Packer(coding, 0, [frame], smq=smq) as contents:
+                content = contents.args[0]
+                self.assertTrue(content.pickled)
+                self.assertEqual(1, len(content.oob))
+                self.assertTrue(content.oob[0].sm_name)
+                # The pickle itself is small enough to stay inline.
+                self.assertFalse(content.sm_name)
+                self.assertLess(len(content.data), large.nbytes)
+                sm_name = content.oob[0].sm_name
+                sms = {sm_name: smq.find_working(sm_name)}
+                result = content_unpack(
+                    coding, DEFAULT_PICKLE_ENCODING, contents.args, sms=sms
+                )
+        finally:
+            smq.clear()
+
+        self.assertIsInstance(result[0], _Frame)
+        self.assertEqual(frame.extra, result[0].extra)
+        assert_array_equal(large, result[0].image)
+        self.assertTrue(result[0].image.flags.writeable)
+
+    def test_packer_round_trip(self):
+        coding = ByteCoding.MsgpackZlib
+        with Packer(coding, 0, [self.frame]) as contents:
+            content = contents.args[0]
+            self.assertEqual(1, len(content.oob))
+            self.assertGreater(content.oob[0].size, len(content.data))
+            result = content_unpack(coding, DEFAULT_PICKLE_ENCODING, contents.args)
+
+        frame = deserialize(result[0], _Frame)
+        self.assertEqual(self.frame.name, frame.name)
+        self.assertEqual(self.frame.extra, frame.extra)
+        assert_array_equal(self.frame.image, frame.image)
+
+    async def test_call_router_pickle5(self):
+        large = zeros((64, 128), dtype=uint8)
+
+        async def _route(frame: _Frame) -> _Frame:
+            self.assertIsInstance(frame, _Frame)
+            frame.image = frame.image + 1
+            return frame
+
+        coding = ByteCoding.Pickle5
+        with Packer(coding, 0, [_Frame("large", large)]) as contents:
+            result = await call_router(
+                func=_route,
+                match_info=dict(),
+                coding=coding,
+                encoding=DEFAULT_PICKLE_ENCODING,
+                compress_level=COMPRESS_LEVEL_BEST,
+                args=contents.args,
+                kwargs=contents.kwargs,
+                sm_names=list(),
+            )
+
+        self.assertTrue(result.args[0].pickled)
+        answer = content_unpack(coding, DEFAULT_PICKLE_ENCODING, result.args)
+        self.assertTrue((answer[0].image == 1).all())
+
+    async def test_call_router(self):
+        async def _route(frame: _Frame) -> _Frame:
+            self.assertIsInstance(frame, _Frame)
+            assert_array_equal(self.frame.image, frame.image)
+            return frame
+
+        coding = ByteCoding.MsgpackZlib
+        with Packer(coding, 0, [self.frame]) as contents:
+            result = await call_router(
+                func=_route,
+                match_info=dict(),
+                coding=coding,
+                encoding=DEFAULT_PICKLE_ENCODING,
+                compress_level=COMPRESS_LEVEL_BEST,
+                args=contents.args,
+                kwargs=contents.kwargs,
+                sm_names=list(),
+            )
+
+        self.assertEqual(1, len(result.args))
+        self.assertEqual(1, len(result.args[0].oob))
+        answer = content_unpack(coding, DEFAULT_PICKLE_ENCODING, result.args)
+        assert_array_equal(self.frame.image, deserialize(answer[0], _Frame).image)
+
+
+if __name__ == "__main__":
+    main()
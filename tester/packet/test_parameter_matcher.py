@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+
+from multiprocessing.shared_memory import SharedMemory
+from unittest import IsolatedAsyncioTestCase, main
+
+from numpy import ndarray, uint8, zeros
+from type_serialize import ByteCoding
+from type_serialize.variables import COMPRESS_LEVEL_BEST
+
+from reccd.memory.shared_memory_queue import SharedMemoryQueue
+from reccd.memory.shared_memory_utils import SharedMemoryAttachmentCache
+from reccd.packet.parameter_matcher import call_router
+from reccd.packet.result_allocator import ResultAllocator
+from reccd.variables.rpc import DEFAULT_PICKLE_ENCODING
+
+
+class ParameterMatcherTestCase(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.smq = SharedMemoryQueue()
+
+    def tearDown(self):
+        self.smq.clear()
+
+    async def _call(self, func, sm_names, daemon_sm=False, sm_cache=None):
+        return await call_router(
+            func=func,
+            match_info=dict(),
+            coding=ByteCoding.MsgpackZlib,
+            encoding=DEFAULT_PICKLE_ENCODING,
+            compress_level=COMPRESS_LEVEL_BEST,
+            args=list(),
+            kwargs=dict(),
+            sm_names=sm_names,
+            daemon_sm=daemon_sm,
+            session="session",
+            sm_cache=sm_cache,
+        )
+
+    async def test_result_allocator(self):
+        shape = (4, 5, 3)
+
+        async def _route(out: ResultAllocator):
+            result = out.empty(shape, uint8)
+            result.fill(7)
+            return result
+
+        with self.smq.multi_rent(1, 4 * 5 * 3) as sms:
+            result = await self._call(_route, sms.keys())
+            self.assertEqual(1, len(result.args))
+
+            content = result.args[0]
+            self.assertIn(content.sm_name, sms)
+            self.assertEqual(4 * 5 * 3, content.size)
+            self.assertFalse(content.data)
+            self.assertEqual(list(shape), list(content.array.shape))
+
+            sm = sms[content.sm_name]
+            array = ndarray(shape=shape, dtype=uint8, buffer=sm.buf)
+            self.assertTrue((array == 7).all())
+            del array
+
+    async def test_result_allocator_fallback(self):
+        async def _route(out: ResultAllocator):
+            result = out.empty(10, uint8)
+            result.fill(1)
+            return result
+
+        result = await self._call(_route, list())
+        self.assertEqual(1, len(result.args))
+        self.assertFalse(result.args[0].sm_name)
+        self.assertEqual(10, len(result.args[0].data))
+
+    async def test_daemon_sm(self):
+        async def _route():
+            return zeros(1024 * 1024, dtype=uint8)
+
+        # The rented segment is too small for the result.
+        with self.smq.multi_rent(1, 1024) as sms:
+            result = await self._call(_route, sms.keys(), daemon_sm=True)
+            content = result.args[0]
+            self.assertNotIn(content.sm_name, sms)
+            self.assertTrue(content.sm_owned)
+
+        # The segment outlives the daemon side and is adopted by the client.
+        sm = self.smq.adopt(content.sm_name)
+        self.assertLessEqual(content.size, sm.size)
+        self.assertEqual(1, self.smq.stats.adoptions)
+        self.smq.restore(sm.name)
+        self.assertEqual(sm.name, self.smq.secure_worker(content.size).name)
+
+    async def test_daemon_sm_error(self):
+        names = list()
+
+        async def _route(out: ResultAllocator):
+            array = out.empty(1024 * 1024, uint8)
+            names.append(out.find(array))
+            raise ValueError
+
+        with self.assertRaises(RuntimeError):
+            await self._call(_route, list(), daemon_sm=True)
+
+        # A failed call unlinks the segments it created.
+        self.assertTrue(names[0])
+        with self.assertRaises(FileNotFoundError):
+            SharedMemory(name=names[0])
+
+    async def test_daemon_sm_unused(self):
+        names = list()
+
+        async def _route(out: ResultAllocator):
+            array = out.empty(1024 * 1024, uint8)
+            names.append(out.find(array))
+            return zeros(10, dtype=uint8)
+
+        result = await self._call(_route, list(), daemon_sm=True)
+        self.assertFalse(result.args[0].sm_owned)
+
+        # Only the segments in the result are handed over.
+        self.assertTrue(names[0])
+        with self.assertRaises(FileNotFoundError):
+            SharedMemory(name=names[0])
+
+    async def test_sm_cache_in_use(self):
+        cache = SharedMemoryAttachmentCache()
+        evicted = list()
+
+        async def _route(out: ResultAllocator):
+            out.empty(10, uint8)
+            evicted.append(cache.evict_idle(now=float("inf")))
+
+        try:
+            with self.smq.multi_rent(1, 10) as sms:
+                await self._call(_route, sms.keys(), sm_cache=cache)
+            self.assertEqual([0], evicted)
+            self.assertEqual(1, cache.evict_idle(now=float("inf")))
+        finally:
+            cache.clear()
+
+
+if __name__ == "__main__":
+    main()
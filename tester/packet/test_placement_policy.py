@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+from unittest import IsolatedAsyncioTestCase, main
+
+from numpy import uint8, zeros
+from type_serialize import ByteCoding
+from type_serialize.variables import COMPRESS_LEVEL_BEST
+
+from reccd.memory.shared_memory_queue import SharedMemoryQueue
+from reccd.packet.packer import Packer
+from reccd.packet.parameter_matcher import call_router
+from reccd.packet.placement_policy import PlacementPolicy, calibrate_inline_threshold
+from reccd.route.route_options import RouteOptions
+from reccd.variables.rpc import DEFAULT_PICKLE_ENCODING
+
+
+class PlacementPolicyTestCase(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.smq = SharedMemoryQueue()
+        self.coding = ByteCoding.MsgpackZlib
+
+    def tearDown(self):
+        self.smq.clear()
+
+    def test_calibrate(self):
+        threshold = calibrate_inline_threshold(1024, 64 * 1024, repeat=1)
+        self.assertLessEqual(512, threshold)
+        self.assertLessEqual(threshold, 64 * 1024)
+        with self.assertRaises(ValueError):
+            calibrate_inline_threshold(1024, 512)
+
+    def test_packer(self):
+        small = zeros(1024, dtype=uint8)
+        large = zeros(1024 * 1024, dtype=uint8)
+        placement = PlacementPolicy(4096)
+        packer = Packer(
+            self.coding, 0, [small, large], smq=self.smq, placement=placement
+        )
+        with packer as contents:
+            self.assertFalse(contents.args[0].sm_name)
+            self.assertEqual(small.nbytes, len(contents.args[0].data))
+            self.assertTrue(contents.args[1].sm_name)
+        self.assertEqual(1, packer.inline_count)
+        self.assertEqual(1, packer.sm_count)
+
+    async def test_route_option(self):
+        async def _route():
+            return zeros(1024, dtype=uint8)
+
+        with self.smq.multi_rent(1, 1024) as sms:
+            for threshold, inline in ((None, True), (0, False)):
+                result = await call_router(
+                    func=_route,
+                    match_info=dict(),
+                    coding=self.coding,
+                    encoding=DEFAULT_PICKLE_ENCODING,
+                    compress_level=COMPRESS_LEVEL_BEST,
+                    args=list(),
+                    kwargs=dict(),
+                    sm_names=sms.keys(),
+                    options=RouteOptions(inline_threshold=threshold),
+                )
+                self.assertEqual(inline, not result.args[0].sm_name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+from asyncio import gather, wait_for
+from threading import current_thread
+from time import sleep
+from unittest import IsolatedAsyncioTestCase, main
+
+from reccd.route.route_executor import RouteExecutor
+from reccd.route.route_options import RouteOptions
+
+
+def _sync_route(value: int) -> str:
+    return f"{current_thread().name}:{value}"
+
+
+def _slow_route() -> None:
+    sleep(0.05)
+
+
+async def _async_route() -> str:
+    return current_thread().name
+
+
+class RouteExecutorTestCase(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.executor = RouteExecutor(threads=2)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    async def _call(self, func, *args, options=RouteOptions(), is_coroutine=False):
+        return await self.executor.call(
+            func.__name__, func, args, is_coroutine, options
+        )
+
+    async def test_sync_route(self):
+        result = await self._call(_sync_route, 1)
+        self.assertRegex(result, r"^reccd-route.*:1$")
+
+        result = await self._call(
+            _sync_route, 2, options=RouteOptions(run_in_thread=False)
+        )
+        self.assertEqual(f"{current_thread().name}:2", result)
+
+        stats = self.executor.stats()["_sync_route"]
+        self.assertEqual(2, stats.calls)
+        self.assertEqual(1, stats.threaded)
+        self.assertEqual(0, stats.running)
+
+    async def test_async_route(self):
+        result = await self._call(_async_route, is_coroutine=True)
+        self.assertEqual(current_thread().name, result)
+        self.assertEqual(0, self.executor.stats()["_async_route"].threaded)
+
+    async def test_max_concurrency(self):
+        options = RouteOptions(max_concurrency=1)
+        await gather(*[self._call(_slow_route, options=options) for _ in range(3)])
+
+        stats = self.executor.stats()["_slow_route"]
+        self.assertEqual(3, stats.calls)
+        self.assertEqual(0, stats.waiting)
+        # The last call waits for the two before it.
+        self.assertLessEqual(0.09, stats.wait_max)
+        self.assertLess(0.0, stats.wait_mean)
+
+    async def test_cancelled_thread(self):
+        options = RouteOptions(max_concurrency=1)
+        with self.assertRaises(TimeoutError):
+            await wait_for(self._call(_slow_route, options=options), 0.01)
+
+        # The thread keeps the slot until the cancelled call is done.
+        stats = self.executor.stats()["_slow_route"]
+        self.assertEqual(1, stats.running)
+        await self._call(_slow_route, options=options)
+
+        stats = self.executor.stats()["_slow_route"]
+        self.assertEqual(0, stats.running)
+        self.assertLessEqual(0.03, stats.wait_max)
+
+    async def test_disabled(self):
+        executor = RouteExecutor(threads=0)
+        self.assertFalse(executor.is_threaded(False, RouteOptions()))
+        result = await executor.call("route", _sync_route, (3,), False)
+        self.assertEqual(f"{current_thread().name}:3", result)
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            RouteOptions(max_concurrency=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+from timeit import timeit
+from typing import List, Tuple
+from unittest import TestCase, main
+
+from reccd.route.dynamic_resource import DynamicResource
+from reccd.route.route_index import RouteIndex, is_segment_regex
+
+
+def _linear_find(routes: List[Tuple[str, DynamicResource]], method: str, path: str):
+    for index, route in enumerate(routes):
+        if route[0] != method:
+            continue
+        match_info = route[1].match(path)
+        if match_info is not None:
+            return index, match_info
+    return None
+
+
+class RouteIndexTestCase(TestCase):
+    def setUp(self):
+        self.routes: List[Tuple[str, DynamicResource]] = list()
+        self.index = RouteIndex()
+
+    def add(self, method: str, path: str) -> None:
+        resource = DynamicResource(path)
+        self.routes.append((method, resource))
+        self.index.add(method, resource)
+
+    def assertSameFind(self, method: str, path: str) -> None:
+        expected = _linear_find(self.routes, method, path)
+        self.assertEqual(expected, self.index.find(method, path))
+
+    def test_is_segment_regex(self):
+        self.assertTrue(is_segment_regex(r"[1-9]+"))
+        self.assertTrue(is_segment_regex(r"\d+"))
+        self.assertFalse(is_segment_regex(r".*"))
+        self.assertFalse(is_segment_regex(r"[^a]+"))
+        self.assertFalse(is_segment_regex(r"[!-z]+"))
+
+    def test_first_match_wins(self):
+        self.add("GET", "/v1/{name}")
+        self.add("GET", "/v1/static")
+        self.add("GET", "/files/{path:.+}")
+        self.add("POST", "/v1/static")
+        self.add("GET", "/v1/{value:[0-9]+}/test")
+        self.add("GET", "/v1/{name}/test")
+        self.add("GET", "/v1/1/test")
+
+        self.assertEqual((0, {"name": "static"}), self.index.find("GET", "/v1/static"))
+        self.assertEqual((3, {}), self.index.find("POST", "/v1/static"))
+        self.assertEqual((2, {"path": "a/b"}), self.index.find("GET", "/files/a/b"))
+        self.assertEqual((4, {"value": "1"}), self.index.find("GET", "/v1/1/test"))
+        self.assertIsNone(self.index.find("PUT", "/v1/static"))
+        self.assertIsNone(self.index.find("POST", "/v1/static/"))
+
+        for path in ("/v1/static", "/files/a/b", "/v1/1/test", "/v1/a/test", "/v1"):
+            self.assertSameFind("GET", path)
+
+    def test_quoted_path(self):
+        self.add("GET", "/a b/{name}")
+        self.assertEqual((0, {"name": "c d"}), self.index.find("GET", "/a%20b/c%20d"))
+        self.assertEqual((0, {"name": "c"}), self.index.find("GET", "/a%20b/c"))
+        self.assertIsNone(self.index.find("GET", "/a b/c"))
+
+    def test_mixed_segment(self):
+        self.add("GET", "/v1/file{num:[0-9]+}.{ext}")
+        self.add("GET", "/v1/item-{id}/detail")
+        self.assertSameFind("GET", "/v1/file10.txt")
+        self.assertSameFind("GET", "/v1/item-3/detail")
+        self.assertSameFind("GET", "/v1/item-/detail")
+
+    def test_benchmark_1k_routes(self):
+        count = 1000
+        for i in range(count):
+            if i % 2 == 0:
+                self.add("GET", f"/v1/static{i}/items")
+            else:
+                self.add("GET", f"/v1/dynamic{i}/{{id}}/items/{{item:[0-9]+}}")
+
+        paths = [
+            "/v1/static0/items",
+            f"/v1/static{count - 2}/items",
+            f"/v1/dynamic{count - 1}/abc/items/100",
+            "/v1/unknown/items",
+        ]
+        for path in paths:
+            self.assertSameFind("GET", path)
+
+        number = 100
+        linear_seconds = timeit(
+            lambda: [_linear_find(self.routes, "GET", p) for p in paths],
+            number=number,
+        )
+        index_seconds = timeit(
+            lambda: [self.index.find("GET", p) for p in paths],
+            number=number,
+        )
+
+        avg_linear = linear_seconds / (number * len(paths))
+        avg_index = index_seconds / (number * len(paths))
+        print(f"1k routes - Average seconds: {avg_linear}s (Linear scan)")
+        print(f"1k routes - Average seconds: {avg_index}s (Route index)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+from unittest import TestCase, main
+
+from numpy import ndarray
+
+from reccd.packet.result_allocator import ResultAllocator
+from reccd.route.route_plan import RoutePlan
+
+
+async def _route(
+    value: int, flag: bool, name: str, array: ndarray, out: ResultAllocator
+):
+    pass
+
+
+def _sync_route(value: float):
+    pass
+
+
+class RoutePlanTestCase(TestCase):
+    def test_binders(self):
+        plan = RoutePlan(_route)
+        self.assertIs(_route, plan.func)
+        self.assertTrue(plan.is_coroutine)
+        self.assertEqual(5, len(plan.binders))
+
+        value, flag, name, array, out = plan.binders
+        self.assertEqual("value", value.key)
+        self.assertEqual(10, value.path_caster("10"))
+        self.assertIs(True, flag.path_caster("true"))
+        self.assertEqual("kkk", name.path_caster("kkk"))
+
+        self.assertIs(ndarray, array.type_origin)
+        self.assertIsNone(array.path_caster)
+        self.assertFalse(array.is_allocator)
+
+        self.assertIsNone(out.path_caster)
+        self.assertTrue(out.is_allocator)
+
+    def test_sync_route(self):
+        plan = RoutePlan(_sync_route)
+        self.assertFalse(plan.is_coroutine)
+        self.assertEqual(1, len(plan.binders))
+        self.assertEqual(1.5, plan.binders[0].path_caster("1.5"))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 
 from contextlib import redirect_stdout
 from io import StringIO
+from tempfile import TemporaryDirectory
 from typing import Optional
 from unittest import TestCase, main
 
@@ -21,6 +22,13 @@ class EntrypointTestCase(TestCase):
         self.assertEqual(0, code)
         self.assertEqual(version(), buffer.getvalue().strip())
 
+    def test_shm_gc(self):
+        lines = list()
+        with TemporaryDirectory() as temp:
+            code = entrypoint_main(["shm", "gc", "--directory", temp], lines.append)
+        self.assertEqual(0, code)
+        self.assertEqual(["Unlinked 0 segments (0 bytes)"], lines)
+
 
 if __name__ == "__main__":
     main()
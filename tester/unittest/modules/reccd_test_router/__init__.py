@@ -1,9 +1,13 @@
 # -*- coding: utf-8 -*-
 
+from asyncio import sleep
 from dataclasses import dataclass
+from threading import current_thread
 from typing import Any, Dict, List, Optional, Tuple
 
-from numpy import ndarray
+from numpy import ndarray, uint8, zeros, zeros_like
+
+from reccd.packet.result_allocator import ResultAllocator
 
 __version__ = "0.0.0"
 __doc__ = "Documentation"
@@ -83,6 +87,44 @@ async def patch_test_numpy_body(
     return result, _Result1(body.value1, body.value2)
 
 
+async def post_test_numpy_view(array: ndarray) -> Tuple[bool, bool, int]:
+    return array.flags.owndata, array.flags.writeable, int(array.sum())
+
+
+async def post_test_numpy_view_writable(array: ndarray) -> Tuple[bool, bool, int]:
+    array.fill(0)
+    return array.flags.owndata, array.flags.writeable, int(array.sum())
+
+
+async def post_test_numpy_allocator(array: ndarray, out: ResultAllocator) -> ndarray:
+    result = out.empty(array.shape, array.dtype)
+    result.fill(0)
+    return result
+
+
+async def post_test_numpy_allocator_unused(
+    array: ndarray, out: ResultAllocator
+) -> ndarray:
+    out.empty(array.shape, array.dtype)
+    return zeros_like(array)
+
+
+async def post_test_numpy_allocator_slow(
+    array: ndarray, out: ResultAllocator
+) -> ndarray:
+    result = out.empty(array.shape, array.dtype)
+    await sleep(0.5)
+    return result
+
+
+async def get_test_numpy_zeros(size: str) -> ndarray:
+    return zeros(int(size), dtype=uint8)
+
+
+def get_test_sync_thread() -> str:
+    return current_thread().name
+
+
 def on_routes():
     return [
         ("GET", "/test", get_test),
@@ -92,4 +134,21 @@ def on_routes():
         ("GET", "/test/exception", get_exception),
         ("POST", "/test/numpy", post_test_numpy),
         ("PATCH", "/test/numpy/body", patch_test_numpy_body),
+        (
+            "POST",
+            "/test/numpy/view",
+            post_test_numpy_view,
+            {"shared_memory_view": True},
+        ),
+        (
+            "POST",
+            "/test/numpy/view/writable",
+            post_test_numpy_view_writable,
+            {"shared_memory_view": True, "writable_view": True},
+        ),
+        ("POST", "/test/numpy/allocator", post_test_numpy_allocator),
+        ("POST", "/test/numpy/allocator/unused", post_test_numpy_allocator_unused),
+        ("POST", "/test/numpy/allocator/slow", post_test_numpy_allocator_slow),
+        ("GET", "/test/sync/thread", get_test_sync_thread),
+        ("GET", "/test/numpy/zeros/{size}", get_test_numpy_zeros),
     ]